@@ -12,7 +12,8 @@ from typing import NamedTuple
 
 from pfsrd2.ability_identity import ability_to_raw_json, compute_identity_hash
 from pfsrd2.ability_placement import deterministic_ability_category
-from pfsrd2.enrichment.regex_extractor import ENRICHMENT_VERSION, extract_all
+from pfsrd2.enrichment.extractor_cache import extract_all
+from pfsrd2.enrichment.regex_extractor import ENRICHMENT_VERSION, LLM_DERIVED, field_versions
 from pfsrd2.sql import get_db_connection, get_db_path
 from pfsrd2.sql.enrichment import (
     add_review_reason,
@@ -25,6 +26,7 @@ from pfsrd2.sql.enrichment import (
     update_enriched_json,
 )
 from pfsrd2.sql.monster_abilities import fetch_monster_abilities_by_name
+from universal.log_sink import ENRICHMENT, log
 from universal.universal import DEGREE_FIELDS
 
 # Fields that enrichment can add to an ability object.
@@ -52,12 +54,15 @@ def _try_inline_enrich(curs, ability_id, raw_json):
     if not _inline_enrich:
         return None
 
-    # Phase 1: Regex extraction
+    # Phase 1: Regex extraction, from the extractor cache when this raw
+    # ability has been through it before
     result, missed = extract_all(raw_json)
+    versions = field_versions(raw_json)
 
     # Phase 2: LLM extraction for missed keywords (cached, so fast after first run)
     if missed:
         from pfsrd2.enrichment.llm_extractor import (
+            OllamaUnavailable,
             extract_area_llm,
             extract_damage_llm,
             extract_dc_llm,
@@ -90,17 +95,23 @@ def _try_inline_enrich(curs, ability_id, raw_json):
             if keyword in _LLM_EXTRACTORS and combined:
                 extractor_fn, field_name = _LLM_EXTRACTORS[keyword]
                 if not result.get(field_name):
-                    llm_result = extractor_fn(name, combined)
+                    try:
+                        llm_result = extractor_fn(name, combined)
+                    except OllamaUnavailable:
+                        # Same as a missing answer, which is what this got
+                        # before the breaker -- one timeout later.
+                        break
                     rejected = reject_if_ungrounded(
                         llm_result, combined, field_name, FlagTarget(curs, ability_id, name)
                     )
                     if not rejected and llm_result:
                         result[field_name] = llm_result
+                        versions[field_name] = LLM_DERIVED
 
     if result is None:
         return None
     enriched_json = json.dumps(result, sort_keys=True, ensure_ascii=False)
-    update_enriched_json(curs, ability_id, enriched_json, ENRICHMENT_VERSION, "inline")
+    update_enriched_json(curs, ability_id, enriched_json, ENRICHMENT_VERSION, "inline", versions)
     return enriched_json
 
 
@@ -196,10 +207,12 @@ def reject_if_ungrounded(
     ungrounded = a_number_the_source_never_published(llm_result, source)
     if not ungrounded:
         return False
-    sys.stderr.write(
+    line = (
         f"REJECTED ungrounded {field} for {name!r}: {ungrounded!r} does "
-        f"not occur in the ability text. {llm_result!r}\n"
+        f"not occur in the ability text. {llm_result!r}"
     )
+    sys.stderr.write(f"{line}\n")
+    log(ENRICHMENT, line)
     if mark:
         add_review_reason(
             curs,
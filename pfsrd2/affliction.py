@@ -32,7 +32,7 @@ from pfsrd2.license import license_consolidation_pass, license_pass
 from pfsrd2.schema import validate_against_schema
 from pfsrd2.sql.traits import trait_db_pass
 from universal.creatures import parse_save_dc
-from universal.files import char_replace, disambiguated_filename, makedirs
+from universal.files import char_replace, disambiguated_filename, makedirs, write_json
 from universal.markdown import markdown_pass as universal_markdown_pass
 from universal.universal import (
     aon_pass,
@@ -179,8 +179,7 @@ def find_affliction(struct):
 def write_affliction(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = disambiguated_filename(jsondir, struct, "affliction")
-    with open(filename, "w") as fp:
-        json.dump(struct, fp, indent=2, sort_keys=True)
+    write_json(filename, struct)
 
 
 def restructure_affliction_pass(details, subtype):
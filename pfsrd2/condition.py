@@ -8,7 +8,8 @@ from bs4 import BeautifulSoup
 from pfsrd2.license import license_pass
 from pfsrd2.schema import validate_against_schema
 from pfsrd2.sql.sources import set_edition_from_db_pass
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
+from universal.log_sink import MARKDOWN, log
 from universal.markdown import md
 from universal.universal import (
     aon_pass,
@@ -28,7 +29,6 @@ from universal.utils import (
     content_filter,
     get_text,
     get_unique_tag_set,
-    log_element,
     sidebar_filter,
 )
 
@@ -230,9 +230,7 @@ def condition_cleanup_pass(struct):
 def write_condition(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_condition_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_condition_filename(jsondir, struct):
@@ -282,7 +280,7 @@ def markdown_pass(struct, name, path):
                 struct[k] = v
             _validate_acceptable_tags(v)
             struct[k] = md(v).strip()
-            log_element("markdown.log")("{} : {}".format(f"{path}/{k}", name))
+            log(MARKDOWN, "{} : {}".format(f"{path}/{k}", name))
 
 
 def extract_starting_traits(description):
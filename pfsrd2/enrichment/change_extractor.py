@@ -203,6 +203,11 @@ def enrich_change(raw_json_str, source_name):
     return json.dumps(enriched, sort_keys=True, ensure_ascii=False), "regex"
 
 
+_AC_WORD = re.compile(r"\bac\b")
+_SPELL_STAT = re.compile(r"spell (?:dcs?|attack)")
+_POSSESSIVE_LEVEL = re.compile(r"['\u2019]s level by \d")
+
+
 def _categorize_change_text(text):
     """Auto-categorize a change based on its text content."""
     t = text.lower()
@@ -233,7 +238,7 @@ def _categorize_change_text(text):
         return "languages"
     # Check combat_stats before hit_points since some changes mention both
     if (
-        (re.search(r"\bac\b", t) or "attack" in t or "saving throw" in t)
+        (_AC_WORD.search(t) or "attack" in t or "saving throw" in t)
         and ("increase" in t or "decrease" in t)
         and ("hp" in t or "hit point" in t)
     ):
@@ -255,14 +260,14 @@ def _categorize_change_text(text):
         return "speed"
     # \bac\b: substring matching routed "reACh" texts here, hiding their
     # real category (Primeval Cryptid's size increase).
-    if (re.search(r"\bac\b", t) and ("increase" in t or "decrease" in t)) or (
+    if (_AC_WORD.search(t) and ("increase" in t or "decrease" in t)) or (
         "attack modifier" in t and ("increase" in t or "decrease" in t)
     ):
         return "combat_stats"
     # spell stat adjustments are combat_stats, not the "spells" category
     # ("Increase spell DCs and spell attack rolls by 2" — previously only
     # reached combat_stats via the "ac"-in-"attack" substring accident)
-    if re.search(r"spell (?:dcs?|attack)", t) and ("increase" in t or "decrease" in t):
+    if _SPELL_STAT.search(t) and ("increase" in t or "decrease" in t):
         return "combat_stats"
     if "damage" in t and (
         "strike" in t or "change" in t or "physical" in t or "increase" in t or "decrease" in t
@@ -277,7 +282,7 @@ def _categorize_change_text(text):
         or "smaller" in t
     ):
         return "size"
-    if re.search(r"['\u2019]s level by \d", t) and ("increase" in t or "decrease" in t):
+    if _POSSESSIVE_LEVEL.search(t) and ("increase" in t or "decrease" in t):
         # any possessive subject: creature's, spellcaster's, dragon's, ...
         return "level"
     if (
@@ -310,6 +315,11 @@ def _categorize_change_text(text):
     return "unknown"
 
 
+_CHOOSE_SKILL_ABILITY = re.compile(
+    r"choose an? [^.;]*?skill.+?gains the (\w[\w\s]*?) ability for that skill"
+)
+
+
 def _build_choose_skill_selection(text):
     """'Choose an Intelligence-, Wisdom-, or Charisma-based skill... The
     creature gains the official bully ability for that skill.' — the skill
@@ -317,7 +327,7 @@ def _build_choose_skill_selection(text):
     into the granted ability (Corrupt). Checked before category dispatch:
     these texts categorize as ability grants."""
     t = text.lower()
-    m = re.search(r"choose an? [^.;]*?skill.+?gains the (\w[\w\s]*?) ability for that skill", t)
+    m = _CHOOSE_SKILL_ABILITY.search(t)
     if not m:
         return None
     ability = m.group(1).strip().title()
@@ -511,10 +521,13 @@ def _extract_names_from_text(text, after_marker):
     return [n.strip().strip("*") for n in rest.split(",") if n.strip()]
 
 
+_IMMUNITY_TO = re.compile(r"immunity to (\w[\w\s]*?)[\.,]", re.IGNORECASE)
+
+
 def _build_immunity_effects(text):
     names = _extract_names_from_text(text, "immunities:")
     if not names:
-        m = re.search(r"immunity to (\w[\w\s]*?)[\.,]", text, re.IGNORECASE)
+        m = _IMMUNITY_TO.search(text)
         if m:
             names = [m.group(1).strip()]
     effects = []
@@ -529,13 +542,18 @@ def _build_immunity_effects(text):
     return effects
 
 
+_ADD_LANGUAGE = re.compile(r"add (?:the )?(.+?)(?:\s+language)")
+_AND_OR_COMMA = re.compile(r"\s+and\s+|,\s*")
+_ADD_WORD = re.compile(r"add (\w+)\.")
+
+
 def _build_language_effects(text):
     t = text.lower()
     effects = []
-    m = re.search(r"add (?:the )?(.+?)(?:\s+language)", t)
+    m = _ADD_LANGUAGE.search(t)
     if m:
         lang_text = m.group(1)
-        langs = re.split(r"\s+and\s+|,\s*", lang_text)
+        langs = _AND_OR_COMMA.split(lang_text)
         for lang in langs:
             lang = lang.strip().title()
             if lang:
@@ -547,7 +565,7 @@ def _build_language_effects(text):
                     }
                 )
     if not effects:
-        m = re.search(r"add (\w+)\.", t)
+        m = _ADD_WORD.search(t)
         if m:
             cond = None
             if "if it has any languages" in t:
@@ -567,6 +585,10 @@ def _build_language_effects(text):
     return effects
 
 
+_ADD_TRAITS = re.compile(r"(?:add|gains?) the (.+?) traits?[,.\s]")
+_TRAIT_LIST_SEP = re.compile(r",\s*(?:and\s+)?|\s+and\s+|\s+or\s+")
+
+
 def _extract_trait_names_regex(t):
     """Extract single-word trait names from text using regex.
 
@@ -576,11 +598,11 @@ def _extract_trait_names_regex(t):
     """
     names = []
     # "add the X and Y traits" or "gains the X and Y traits"
-    m = re.search(r"(?:add|gains?) the (.+?) traits?[,.\s]", t)
+    m = _ADD_TRAITS.search(t)
     if m:
         trait_text = m.group(1)
         # Split on connectors, then validate each word
-        parts = re.split(r",\s*(?:and\s+)?|\s+and\s+|\s+or\s+", trait_text)
+        parts = _TRAIT_LIST_SEP.split(trait_text)
         for part in parts:
             # Extract only the last word (the actual trait name)
             # e.g. "optionally the mindless" → "mindless"
@@ -603,6 +625,10 @@ def _extract_trait_names_regex(t):
     return names
 
 
+_OPTIONAL_TRAIT = re.compile(r"optional(?:ly)?[,]?\s+(?:the\s+)?(\w+)")
+_EITHER_TRAIT = re.compile(r"either\s+(?:the\s+)?(\w+)\s+or\s+(\w+)")
+
+
 def _classify_optional_traits(text, trait_names):
     """Identify which traits are optional or part of a choice group.
 
@@ -615,7 +641,7 @@ def _classify_optional_traits(text, trait_names):
     choice = set()
 
     # "optionally, the X trait" or "optionally the X trait"
-    for m in re.finditer(r"optional(?:ly)?[,]?\s+(?:the\s+)?(\w+)", t):
+    for m in _OPTIONAL_TRAIT.finditer(t):
         candidate = m.group(1).title()
         if candidate.lower() in {n.lower() for n in trait_names}:
             optional.add(candidate.lower())
@@ -623,7 +649,7 @@ def _classify_optional_traits(text, trait_names):
     # "either the X or Y trait"
     # NOTE: only handles exactly 2 choices. A 3-way "either X, Y, or Z"
     # pattern would need a more complex regex. No current templates use 3-way.
-    m = re.search(r"either\s+(?:the\s+)?(\w+)\s+or\s+(\w+)", t)
+    m = _EITHER_TRAIT.search(t)
     if m:
         for g in (m.group(1), m.group(2)):
             candidate = g.title()
@@ -637,6 +663,11 @@ _STRIKE_TRAIT_TARGET = "$.offense.offensive_actions[*].attack.traits"
 _MELEE_TRAIT_TARGET = "$.offense.offensive_actions[?(@.attack.attack_type=='melee')].attack.traits"
 
 
+_MELEE_STRIKES_PAREN = re.compile(r"\([^)]*for melee strikes?[^)]*\)")
+_THE_TRAITS = re.compile(r"the ((?:[a-z'-]+)(?:(?:, | and |, and )[a-z'-]+)*?) traits?\b")
+_COMMA_OR_AND = re.compile(r",| and ")
+
+
 def _build_strike_trait_effects(text):
     """Effects for 'Strikes gain the X trait' sentences: the traits belong on
     the attacks, not the creature badge row (Phantom: 'Their Strikes gain the
@@ -644,7 +675,7 @@ def _build_strike_trait_effects(text):
     a parenthetical qualified 'for melee Strikes' only lands on melee attacks.
     """
     t = text.lower()
-    melee_spans = [m.span() for m in re.finditer(r"\([^)]*for melee strikes?[^)]*\)", t)]
+    melee_spans = [m.span() for m in _MELEE_STRIKES_PAREN.finditer(t)]
 
     def in_melee(pos):
         return any(a <= pos < b for a, b in melee_spans)
@@ -653,8 +684,8 @@ def _build_strike_trait_effects(text):
     # list items must be joined by explicit separators (", ", " and ",
     # ", and ") so the lazy repetition cannot swallow sentence words
     # ("the creature's strikes gain the magical")
-    for m in re.finditer(r"the ((?:[a-z'-]+)(?:(?:, | and |, and )[a-z'-]+)*?) traits?\b", t):
-        for name in re.split(r",| and ", m.group(1)):
+    for m in _THE_TRAITS.finditer(t):
+        for name in _COMMA_OR_AND.split(m.group(1)):
             name = name.strip()
             if not name or name == "the":
                 continue
@@ -672,12 +703,22 @@ def _build_strike_trait_effects(text):
     return effects
 
 
+_STRIKES_GAIN = re.compile(r"\bstrikes? gains?\b")
+_REPLACE_TRAIT = re.compile(r"replace the (\w+) trait with the (\w+) trait")
+_AND_ADDS_TRAIT = re.compile(r"and adds? the (\w+) trait")
+_ADD_TRAIT = re.compile(r"add the (\w+) trait")
+_REMOVE_TRAIT = re.compile(r"(?:if .+?has the|remove the) (\w+) trait,?\s*remove")
+_REPLACE_TRAITS_WITH = re.compile(r"replace the (.+?) traits? with the$")
+_TRAIT_LIST_LINE = re.compile(r"^-?\s*([\w\s,]+(?:\s+and\s+[\w\s]+)+)\s+traits?\.")
+_LOSES_GAINS_TRAIT = re.compile(r"loses the (\w+) trait.+?gains the (\w+) trait")
+
+
 def _build_trait_effects(text, links=None):
     effects = []
     t = text.lower()
 
     # Strike-subject grants route to attack traits, never the badge row.
-    if re.search(r"\bstrikes? gains?\b", t):
+    if _STRIKES_GAIN.search(t):
         return _build_strike_trait_effects(text)
 
     # Use links with game-obj="Traits" when available — these are authoritative
@@ -698,7 +739,7 @@ def _build_trait_effects(text, links=None):
                 file=sys.stderr,
             )
 
-    m = re.search(r"replace the (\w+) trait with the (\w+) trait", t)
+    m = _REPLACE_TRAIT.search(t)
     if m:
         old_name = m.group(1).title()
         new_name = m.group(2).title()
@@ -713,7 +754,7 @@ def _build_trait_effects(text, links=None):
         # "...and add the amphibious trait" tail (Athamaru) — every extra
         # trait added in the same sentence
         seen_tail = {new_name, old_name}
-        for extra in re.findall(r"and adds? the (\w+) trait", t):
+        for extra in _AND_ADDS_TRAIT.findall(t):
             name = extra.title()
             if name not in seen_tail:
                 seen_tail.add(name)
@@ -781,11 +822,11 @@ def _build_trait_effects(text, links=None):
             )
 
     if not effects:
-        m = re.search(r"add the (\w+) trait", t)
+        m = _ADD_TRAIT.search(t)
         if m:
             effects.append(_trait_effect(m.group(1).title(), "add_item"))
 
-    m = re.search(r"(?:if .+?has the|remove the) (\w+) trait,?\s*remove", t)
+    m = _REMOVE_TRAIT.search(t)
     if m:
         tname = m.group(1).title()
         effects.append(
@@ -815,9 +856,9 @@ def _build_trait_effects(text, links=None):
             }
         )
 
-    m = re.search(r"replace the (.+?) traits? with the$", t)
+    m = _REPLACE_TRAITS_WITH.search(t)
     if m and not effects:
-        for trait in re.split(r"\s+and\s+|,\s*", m.group(1)):
+        for trait in _AND_OR_COMMA.split(m.group(1)):
             tname = trait.strip().title()
             effects.append(
                 {
@@ -827,9 +868,9 @@ def _build_trait_effects(text, links=None):
                 }
             )
 
-    m = re.match(r"^-?\s*([\w\s,]+(?:\s+and\s+[\w\s]+)+)\s+traits?\.", t)
+    m = _TRAIT_LIST_LINE.match(t)
     if m and "replace" not in t and "add" not in t and not effects:
-        for trait in re.split(r"\s+and\s+|,\s*", m.group(1)):
+        for trait in _AND_OR_COMMA.split(m.group(1)):
             tname = trait.strip().title()
             effects.append(
                 {
@@ -839,7 +880,7 @@ def _build_trait_effects(text, links=None):
                 }
             )
 
-    m = re.search(r"loses the (\w+) trait.+?gains the (\w+) trait", t)
+    m = _LOSES_GAINS_TRAIT.search(t)
     if m and not effects:
         old_name = m.group(1).title()
         new_name = m.group(2).title()
@@ -946,9 +987,12 @@ def _mirror_creature_type_removals(effects):
     return mirrored
 
 
+_SIZE_TO = re.compile(r"(?:change size to|reduce .+ size to|becomes?) (\w+)")
+
+
 def _build_size_effects(text):
     t = text.lower()
-    m = re.search(r"(?:change size to|reduce .+ size to|becomes?) (\w+)", t)
+    m = _SIZE_TO.search(t)
     if m:
         return [
             {"target": "$.creature_type.size", "operation": "replace", "value": m.group(1).title()}
@@ -958,11 +1002,14 @@ def _build_size_effects(text):
     return []
 
 
+_TREMORSENSE = re.compile(r"tremorsense (\d+) feet")
+
+
 def _build_sense_effects(text):
     effects = []
     t = text.lower()
     if "tremorsense" in t:
-        m = re.search(r"tremorsense (\d+) feet", t)
+        m = _TREMORSENSE.search(t)
         if m:
             effects.append(
                 {
@@ -1009,9 +1056,15 @@ def _build_sense_effects(text):
     return effects
 
 
+_ATTRIBUTE_FLOOR = re.compile(
+    r"(\w+) modifier is [–-]?(\d+) or lower.+?(?:increase|set) it to [–-]?(\d+)"
+)
+_ATTRIBUTE_MODIFIER = re.compile(r"(\w+) modifier of [+–-]?(\d+)")
+
+
 def _build_attribute_effects(text):
     t = text.lower()
-    m = re.search(r"(\w+) modifier is [–-]?(\d+) or lower.+?(?:increase|set) it to [–-]?(\d+)", t)
+    m = _ATTRIBUTE_FLOOR.search(t)
     if m:
         # Attribute modifiers live at $.statistics.{str,dex,con,int,wis,cha}
         # as plain numbers — $.creature_type.{attr}_modifier exists on no
@@ -1041,7 +1094,7 @@ def _build_attribute_effects(text):
             }
         ]
     effects = []
-    for m in re.finditer(r"(\w+) modifier of [+–-]?(\d+)", t):
+    for m in _ATTRIBUTE_MODIFIER.finditer(t):
         attr = m.group(1).lower()
         # This branch SCANS mixed prose, so non-attribute modifiers
         # ("Perception modifier of +10") are expected — skip them rather
@@ -1064,9 +1117,12 @@ def _build_attribute_effects(text):
     return effects
 
 
+_LEVEL_CHANGE = re.compile(r"(increase|decrease) (?:the |its )?[a-z]+['\u2019]s level by (\d+)")
+
+
 def _build_level_effects(text):
     t = text.lower()
-    m = re.search(r"(increase|decrease) (?:the |its )?[a-z]+['\u2019]s level by (\d+)", t)
+    m = _LEVEL_CHANGE.search(t)
     if m:
         direction = 1 if m.group(1) == "increase" else -1
         value = int(m.group(2)) * direction
@@ -1074,12 +1130,19 @@ def _build_level_effects(text):
     return []
 
 
+_STAT_CHANGE = re.compile(r"(increase|decrease)[^.;]*?by (\d+)")
+_SPELL_ATTACK = re.compile(r"spell attack(?: rolls?| modifiers?| bonus(?:es)?)?")
+_SPELL_DC = re.compile(r"spell dcs?")
+_DC_WORD = re.compile(r"\bdcs?\b")
+_SAVE_WORDS = {name: re.compile(rf"\b{name}\b") for name in ("will", "fort", "ref")}
+
+
 def _build_combat_stat_effects(text):
     t = text.lower()
     effects = []
     # clause-bounded: crossing a clause boundary paired Herexen's
     # "increase ... die" with the "by 2" of its decrease clause
-    m = re.search(r"(increase|decrease)[^.;]*?by (\d+)", t)
+    m = _STAT_CHANGE.search(t)
     if not m:
         return []
     direction = 1 if m.group(1) == "increase" else -1
@@ -1088,10 +1151,10 @@ def _build_combat_stat_effects(text):
     # must not fan out to melee attack bonuses or non-spell ability DCs
     # (Lich: "Increase spell DCs and spell attack roll by 2"). Strip the
     # spell-scoped phrases, then let the generic gates run on the rest.
-    spell_attack = re.search(r"spell attack(?: rolls?| modifiers?| bonus(?:es)?)?", t)
-    spell_dc = re.search(r"spell dcs?", t)
-    t_generic = re.sub(r"spell attack(?: rolls?| modifiers?| bonus(?:es)?)?", "", t)
-    t_generic = re.sub(r"spell dcs?", "", t_generic)
+    spell_attack = _SPELL_ATTACK.search(t)
+    spell_dc = _SPELL_DC.search(t)
+    t_generic = _SPELL_ATTACK.sub("", t)
+    t_generic = _SPELL_DC.sub("", t_generic)
     if spell_attack:
         effects.append(
             {
@@ -1109,7 +1172,7 @@ def _build_combat_stat_effects(text):
             }
         )
     # \bac\b: substring matching would fire on "attACk"
-    if re.search(r"\bac\b", t_generic):
+    if _AC_WORD.search(t_generic):
         effects.append({"target": "$.defense.ac.value", "operation": "adjustment", "value": val})
     if "attack" in t_generic:
         effects.append(
@@ -1127,7 +1190,7 @@ def _build_combat_stat_effects(text):
                     "value": val,
                 }
             )
-    if re.search(r"\bdcs?\b", t_generic):
+    if _DC_WORD.search(t_generic):
         if not spell_dc:
             effects.append(
                 {
@@ -1167,10 +1230,10 @@ def _build_combat_stat_effects(text):
             {"target": "$.senses.perception.value", "operation": "adjustment", "value": val}
         )
     if not effects:
-        for save_name in ("will", "fort", "ref"):
-            # word-bounded: "ref" substring-matched "reflection" (vampire
-            # Sunlight), minting a bogus Reflex adjustment
-            if re.search(rf"\b{save_name}\b", t_generic):
+        # word-bounded: "ref" substring-matched "reflection" (vampire
+        # Sunlight), minting a bogus Reflex adjustment
+        for save_name, word in _SAVE_WORDS.items():
+            if word.search(t_generic):
                 effects.append(
                     {
                         "target": f"$.defense.saves.{save_name}.value",
@@ -1185,6 +1248,17 @@ def _build_combat_stat_effects(text):
     return effects
 
 
+_DAMAGE_CHANGE = re.compile(r"(increase|decrease) (?:the |its )?damage[^.;]*?by (\d+)")
+_DAMAGE_INSTEAD = re.compile(r"(?:increase|decrease) the damage by (\d+) instead")
+_DAMAGE_CHANGES_TO = re.compile(r"damage.+?changes? to (\w+) damage")
+_MAGICAL_STRIKES = re.compile(r"strikes? are magical")
+_ADD_STRIKE = re.compile(r"(?:add|gains?) a (\w[\w\s]*?) (?:ranged |melee )?strike")
+_REDUCE_STRIKE_DAMAGE = re.compile(r"reduce the damage.+?strikes? by (\d+)")
+_ADDITIONAL_DAMAGE = re.compile(r"deal an additional (\d+d\d+) (\w+) damage")
+_CHANGE_ONE_DIE = re.compile(r"change one die to (\w+) damage")
+_ADD_STRIKE_DAMAGE = re.compile(r"add (\d+) (\w+) damage to its strikes")
+
+
 def _build_damage_effects(text, source_name=""):
     t = text.lower()
     effects = []
@@ -1192,7 +1266,7 @@ def _build_damage_effects(text, source_name=""):
     # "Increase/Decrease damage of Strikes by N"
     # clause-bounded: Herexen's "increase the damage die by one step; ...
     # decrease the herexen's attack bonus ... by 2" paired across clauses
-    m = re.search(r"(increase|decrease) (?:the |its )?damage[^.;]*?by (\d+)", t)
+    m = _DAMAGE_CHANGE.search(t)
     if m:
         direction = 1 if m.group(1) == "increase" else -1
         base_val = int(m.group(2)) * direction
@@ -1213,7 +1287,7 @@ def _build_damage_effects(text, source_name=""):
                 "item": base_item,
             }
         )
-        m2 = re.search(r"(?:increase|decrease) the damage by (\d+) instead", t)
+        m2 = _DAMAGE_INSTEAD.search(t)
         if m2:
             limited_val = int(m2.group(1)) * direction
             limited_notes = f"{source_name}, limited use" if source_name else "limited use"
@@ -1246,7 +1320,7 @@ def _build_damage_effects(text, source_name=""):
             }
         ]
 
-    m = re.search(r"damage.+?changes? to (\w+) damage", t)
+    m = _DAMAGE_CHANGES_TO.search(t)
     if m:
         effects = [
             {
@@ -1256,7 +1330,7 @@ def _build_damage_effects(text, source_name=""):
             },
         ]
         # "those Strikes are magical" — add magical trait to attacks
-        if re.search(r"strikes? are magical", t):
+        if _MAGICAL_STRIKES.search(t):
             effects.append(
                 {
                     "target": "$.offense.offensive_actions[*].attack.traits",
@@ -1270,7 +1344,7 @@ def _build_damage_effects(text, source_name=""):
             )
         return effects
 
-    m = re.search(r"(?:add|gains?) a (\w[\w\s]*?) (?:ranged |melee )?strike", t)
+    m = _ADD_STRIKE.search(t)
     if m:
         return [
             {
@@ -1286,7 +1360,7 @@ def _build_damage_effects(text, source_name=""):
         ]
 
     # "Reduce the damage of Strikes by N"
-    m = re.search(r"reduce the damage.+?strikes? by (\d+)", t)
+    m = _REDUCE_STRIKE_DAMAGE.search(t)
     if m:
         return [
             {
@@ -1297,7 +1371,7 @@ def _build_damage_effects(text, source_name=""):
         ]
 
     # "deal an additional 2d6 negative damage"
-    m = re.search(r"deal an additional (\d+d\d+) (\w+) damage", t)
+    m = _ADDITIONAL_DAMAGE.search(t)
     if m:
         item = {
             "type": "stat_block_section",
@@ -1316,7 +1390,7 @@ def _build_damage_effects(text, source_name=""):
         ]
 
     # "change one die to fire damage"
-    m = re.search(r"change one die to (\w+) damage", t)
+    m = _CHANGE_ONE_DIE.search(t)
     if m:
         effects.append(
             {
@@ -1327,7 +1401,7 @@ def _build_damage_effects(text, source_name=""):
         )
 
     # "add 1 fire damage to its strikes"
-    m = re.search(r"add (\d+) (\w+) damage to its strikes", t)
+    m = _ADD_STRIKE_DAMAGE.search(t)
     if m:
         effects.append(
             {
@@ -1365,13 +1439,25 @@ def _normalize_movement_type(mt):
     return _MOVEMENT_TYPE_NORMALIZE.get(mt, mt)
 
 
+_ADD_SPEED = re.compile(r"add a (\w+) speed (?:of |equal to )?(\d+) feet")
+_CHANGE_SPEED = re.compile(r"change speed to (\d+) feet")
+_SPEED_EQUAL = re.compile(r"speed equ\s*al to")
+_NAMED_SPEED_EQUAL = re.compile(r"(\w+) speed equ?\s*a?\s*l to")
+_HALF_SPEED = re.compile(r"half its (\w+) speed")
+_MINIMUM_FEET = re.compile(r"minimum (\d+) feet")
+_INCREASE_SPEED_OR_TO = re.compile(r"increase speed by (\d+) feet or to (\d+) feet")
+_REDUCE_SPEED = re.compile(r"reduce.+?speed by (\d+) feet")
+_MINIMUM_OF_FEET = re.compile(r"minimum (?:of )?(\d+) feet")
+_LEVEL_SPEED = re.compile(r"(\d+)\w* level or higher.+?(\w+) speed of (\d+) feet")
+
+
 def _build_speed_effects(text):
     t = text.lower()
     effects = []
 
     # "Add a swim Speed of 25 feet"
     # "Add a swim Speed of 25 feet"
-    m = re.search(r"add a (\w+) speed (?:of |equal to )?(\d+) feet", t)
+    m = _ADD_SPEED.search(t)
     if m:
         move_type = _normalize_movement_type(m.group(1))
         return [
@@ -1391,7 +1477,7 @@ def _build_speed_effects(text):
     # "Change Speed to 20 feet if higher" / "Optionally change Speed to 30
     # feet if lower" — an "Optionally" grant surfaces as a min-0 selection
     # instead of auto-applying (Elf).
-    m = re.search(r"change speed to (\d+) feet", t)
+    m = _CHANGE_SPEED.search(t)
     if m:
         cond = None
         if "if higher" in t:
@@ -1430,12 +1516,12 @@ def _build_speed_effects(text):
         return effects
 
     # "Add a fly Speed equal to its highest Speed"
-    if re.search(r"speed equ\s*al to", t):
-        m2 = re.search(r"(\w+) speed equ?\s*a?\s*l to", t)
+    if _SPEED_EQUAL.search(t):
+        m2 = _NAMED_SPEED_EQUAL.search(t)
         if m2:
             move_type = _normalize_movement_type(m2.group(1))
             if "half" in t:
-                m3 = re.search(r"half its (\w+) speed", t)
+                m3 = _HALF_SPEED.search(t)
                 source_type = _normalize_movement_type(m3.group(1)) if m3 else "walk"
                 eff = {
                     "target": "$.offense.speed.movement",
@@ -1449,7 +1535,7 @@ def _build_speed_effects(text):
                     "value_from": f"$.offense.speed.movement[?(@.movement_type=='{source_type}')].value / 2",
                 }
                 if "minimum" in t:
-                    m4 = re.search(r"minimum (\d+) feet", t)
+                    m4 = _MINIMUM_FEET.search(t)
                     if m4:
                         eff["minimum"] = int(m4.group(1))
             elif "highest" in t or "fastest" in t:
@@ -1508,7 +1594,7 @@ def _build_speed_effects(text):
         return effects
 
     # "Increase Speed by 10 feet or to 40 feet"
-    m = re.search(r"increase speed by (\d+) feet or to (\d+) feet", t)
+    m = _INCREASE_SPEED_OR_TO.search(t)
     if m:
         return [
             {
@@ -1520,7 +1606,7 @@ def _build_speed_effects(text):
         ]
 
     # "Reduce the creature's Speed by N feet"
-    m = re.search(r"reduce.+?speed by (\d+) feet", t)
+    m = _REDUCE_SPEED.search(t)
     if m:
         eff = {
             "target": "$.offense.speed.movement[?(@.movement_type=='walk')].value",
@@ -1528,13 +1614,13 @@ def _build_speed_effects(text):
             "value": -int(m.group(1)),
         }
         if "minimum" in t:
-            m2 = re.search(r"minimum (?:of )?(\d+) feet", t)
+            m2 = _MINIMUM_OF_FEET.search(t)
             if m2:
                 eff["minimum"] = int(m2.group(1))
         return [eff]
 
     # Level-conditional speed
-    m = re.search(r"(\d+)\w* level or higher.+?(\w+) speed of (\d+) feet", t)
+    m = _LEVEL_SPEED.search(t)
     if m:
         move_type = _normalize_movement_type(m.group(2))
         return [
@@ -1598,12 +1684,15 @@ def _hp_effects_from_adjustments(adjustments, sign):
     return effects
 
 
+_NUMBER = re.compile(r"(\d+)")
+
+
 def _level_text_to_conditional(text):
     """Convert table level text like '2-4' or '20+' to a jsonpath conditional."""
     # Normalize en-dash/em-dash to ASCII hyphen for range detection
     text = _normalize_dashes(text.strip())
     if "or lower" in text or "or less" in text:
-        num = re.search(r"(\d+)", text)
+        num = _NUMBER.search(text)
         if num:
             return f"$.creature_type.level <= {num.group(1)}"
     if text.endswith("+"):
@@ -1613,17 +1702,29 @@ def _level_text_to_conditional(text):
         parts = text.split("-")
         return f"$.creature_type.level >= {parts[0].strip()} && $.creature_type.level <= {parts[1].strip()}"
     # Single number
-    num = re.search(r"(\d+)", text)
+    num = _NUMBER.search(text)
     if num:
         return f"$.creature_type.level == {num.group(1)}"
     return text
 
 
+_ADD_HIGHEST_SKILL = re.compile(r"add (\w[\w\s]*?) with a modifier equal to.+?highest skill")
+_ADD_SKILL_MODIFIER = re.compile(r"add (.+?) with a modifier")
+_SKILL_LIST_SEP = re.compile(r",\s*(?:and\s+)?|\s+and\s+")
+_REDUCE_MODIFIER = re.compile(r"reduce.+?(\w+).+?modifier by (\d+)")
+_SET_HIGH_SKILL = re.compile(r"(?:increase|set) the creature.s (\w+) modifier to.+?high skill")
+_GIVE_HIGH_SKILL = re.compile(
+    r"give the creature a ([\w\s]+?) modifier.+?equal to.+?high skill value"
+)
+_AND = re.compile(r"\s+and\s+")
+_GAINS_SKILL = re.compile(r"gains the (\w[\w\s]*?) skill")
+
+
 def _build_skill_effects(text):
     t = text.lower()
     effects = []
 
-    m = re.search(r"add (\w[\w\s]*?) with a modifier equal to.+?highest skill", t)
+    m = _ADD_HIGHEST_SKILL.search(t)
     if m:
         return [
             {
@@ -1638,10 +1739,10 @@ def _build_skill_effects(text):
             }
         ]
 
-    m = re.search(r"add (.+?) with a modifier", t)
+    m = _ADD_SKILL_MODIFIER.search(t)
     if m:
         skill_text = m.group(1)
-        skills = re.split(r",\s*(?:and\s+)?|\s+and\s+", skill_text)
+        skills = _SKILL_LIST_SEP.split(skill_text)
         for skill in skills:
             effects.append(
                 {
@@ -1657,7 +1758,7 @@ def _build_skill_effects(text):
             )
         return effects
 
-    m = re.search(r"reduce.+?(\w+).+?modifier by (\d+)", t)
+    m = _REDUCE_MODIFIER.search(t)
     if m and m.group(1).lower() not in ("its", "the", "a", "an", "each", "all"):
         effects.append(
             {
@@ -1667,7 +1768,7 @@ def _build_skill_effects(text):
             }
         )
 
-    m = re.search(r"(?:increase|set) the creature.s (\w+) modifier to.+?high skill", t)
+    m = _SET_HIGH_SKILL.search(t)
     if m and not effects:
         # "unless it was already higher": add_item carries raise-only dedup
         # semantics (raise an existing lower value, keep a higher one, add
@@ -1685,10 +1786,10 @@ def _build_skill_effects(text):
             }
         )
 
-    m = re.search(r"give the creature a ([\w\s]+?) modifier.+?equal to.+?high skill value", t)
+    m = _GIVE_HIGH_SKILL.search(t)
     if m and not effects:
         skill_text = m.group(1).strip()
-        skills = re.split(r"\s+and\s+", skill_text)
+        skills = _AND.split(skill_text)
         for skill in skills:
             effects.append(
                 {
@@ -1703,7 +1804,7 @@ def _build_skill_effects(text):
                 }
             )
 
-    m = re.search(r"gains the (\w[\w\s]*?) skill", t)
+    m = _GAINS_SKILL.search(t)
     if m and not effects:
         effects.append(
             {
@@ -1744,9 +1845,13 @@ def _build_skill_effects(text):
     return effects
 
 
+_INNATE_SPELL = re.compile(r"add \*?(\w[\w\s]*?)\*? as an innate (\w+) spell")
+_REPLACE_SPELLS = re.compile(r"replace spells with (\w+) spells")
+
+
 def _build_spell_effects(text):
     t = text.lower()
-    m = re.search(r"add \*?(\w[\w\s]*?)\*? as an innate (\w+) spell", t)
+    m = _INNATE_SPELL.search(t)
     if m:
         return [
             {
@@ -1768,7 +1873,7 @@ def _build_spell_effects(text):
                 "selection": {"type": "select", "action": "replace", "description": text},
             }
         ]
-    m = re.search(r"replace spells with (\w+) spells", t)
+    m = _REPLACE_SPELLS.search(t)
     if m:
         return [
             {
@@ -1785,10 +1890,15 @@ def _build_spell_effects(text):
     return []
 
 
+_REPLACE_ATTACKS = re.compile(r"replace.+?(\w+) attacks? with (\w+) attacks?")
+_DAMAGE_INSTEAD_OF = re.compile(r"deal (\w+) damage instead of (\w+)")
+_REDUCE_REACH = re.compile(r"reduce the reach.+?to (\d+) feet")
+
+
 def _build_strike_effects(text):
     t = text.lower()
 
-    m = re.search(r"replace.+?(\w+) attacks? with (\w+) attacks?", t)
+    m = _REPLACE_ATTACKS.search(t)
     if m:
         old_weapon = m.group(1)
         new_weapon = m.group(2)
@@ -1809,7 +1919,7 @@ def _build_strike_effects(text):
                 "value": new_weapon,
             },
         ]
-        m2 = re.search(r"deal (\w+) damage instead of (\w+)", t)
+        m2 = _DAMAGE_INSTEAD_OF.search(t)
         if m2:
             effects.append(
                 {
@@ -1820,7 +1930,7 @@ def _build_strike_effects(text):
             )
         return effects
 
-    m = re.search(r"reduce the reach.+?to (\d+) feet", t)
+    m = _REDUCE_REACH.search(t)
     if m:
         return [
             {
@@ -1870,14 +1980,18 @@ def _build_strike_effects(text):
     return []
 
 
+_WEAKNESS_TO = re.compile(r"weakness to (\w[\w\s]*?)[\.,]")
+_WEAKNESS_TO_DAMAGE = re.compile(r"weakness to (\w+) damage")
+
+
 def _build_weakness_effects(text, adjustments=None):
     t = text.lower()
     names = _extract_names_from_text(text, "weaknesses")
     if not names:
-        m = re.search(r"weakness to (\w[\w\s]*?)[\.,]", t)
+        m = _WEAKNESS_TO.search(t)
         if m:
             names = [m.group(1).strip()]
-    m = re.search(r"weakness to (\w+) damage", t)
+    m = _WEAKNESS_TO_DAMAGE.search(t)
     if m and not names:
         names = [m.group(1).strip()]
 
@@ -1926,15 +2040,25 @@ def _build_weakness_effects(text, adjustments=None):
     return effects
 
 
+_RESISTANCE_TO = re.compile(r"resistance to ([\w\s]+?)(?:,|\.|depending|with)")
+_TRAILING_DAMAGE = re.compile(r"\s+damage$")
+_PHYSICAL_EXCEPT = re.compile(
+    r"resistance to (?:all )?physical damage (?:\()?except (?:from )?(\w[\w\s]*?)[\),]"
+)
+_CHOOSE_MATERIAL = re.compile(r"choose one type of material.+?bypasses")
+_MATERIAL_OPTION = re.compile(r"(\w[\w\s]*?)\s*\(")
+_LEADING_CONJUNCTION = re.compile(r"^(?:or|and)\s+")
+
+
 def _build_resistance_effects(text, adjustments=None):
     t = text.lower()
     effects = []
 
-    m = re.search(r"resistance to ([\w\s]+?)(?:,|\.|depending|with)", t)
+    m = _RESISTANCE_TO.search(t)
     if m:
         # Clean up name — "physical damage" → "physical"
         name = m.group(1).strip()
-        name = re.sub(r"\s+damage$", "", name)
+        name = _TRAILING_DAMAGE.sub("", name)
         if ("depending on" in t or "based on" in t) and adjustments:
             for adj in adjustments:
                 level_text = adj.get("level", adj.get("starting_level", ""))
@@ -1989,9 +2113,7 @@ def _build_resistance_effects(text, adjustments=None):
                 }
             )
 
-    m = re.search(
-        r"resistance to (?:all )?physical damage (?:\()?except (?:from )?(\w[\w\s]*?)[\),]", t
-    )
+    m = _PHYSICAL_EXCEPT.search(t)
     if m and not effects:
         bypass = m.group(1).strip()
         effects.append(
@@ -2029,12 +2151,12 @@ def _build_resistance_effects(text, adjustments=None):
 
     # "Choose one type of material that bypasses this resistance"
     # The bypass material is a modifier on the resistance object
-    m_choose = re.search(r"choose one type of material.+?bypasses", t)
+    m_choose = _CHOOSE_MATERIAL.search(t)
     if m_choose:
         # Extract material options from text like "cold iron (vetalarana), silver (moroi), or wood (jiang-shi)"
-        options = re.findall(r"(\w[\w\s]*?)\s*\(", t[m_choose.end() :])
+        options = _MATERIAL_OPTION.findall(t[m_choose.end() :])
         # Clean up: strip leading "or ", "and "
-        options = [re.sub(r"^(?:or|and)\s+", "", o.strip()) for o in options]
+        options = [_LEADING_CONJUNCTION.sub("", o.strip()) for o in options]
         options = [o for o in options if o]
         effects.append(
             {
@@ -0,0 +1,171 @@
+"""Persistent cache of the regex extractors' results — survives enrichment DB rebuilds.
+
+Stores at ~/.pfsrd2/extractor_cache.db, beside llm_cache.db. The enrichment
+DB is working state; after a wipe every ability goes back through
+regex_extractor.extract_all and every change record through
+change_extractor.enrich_change. Both depend only on their input and the
+extractor's ENRICHMENT_VERSION, so their results are kept here and a
+rebuild costs one lookup per record.
+
+Keyed on (input_hash, extractor, version). The input hash is a SHA-256 of
+the full raw_json (plus the source name for changes), not the record's
+identity hash: extract_all returns a copy of the whole ability, including
+fields the identity hash leaves out, such as links. Bumping an extractor's
+ENRICHMENT_VERSION bypasses its old entries, as does bumping any of
+regex_extractor's EXTRACTOR_VERSIONS, which are hashed with the input.
+
+Change results also read the traits and creature_types tables; a change
+there that should re-categorize cached records needs a version bump, the
+same as a change to the extractor's code.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import UTC, datetime
+
+from pfsrd2.enrichment import change_extractor, regex_extractor
+
+DB_NAME = "extractor_cache.db"
+COMMIT_EVERY = 500
+
+
+def _get_db_path():
+    path = os.path.expanduser("~/.pfsrd2")
+    if not os.path.exists(path):
+        os.makedirs(path)
+    return os.path.join(path, DB_NAME)
+
+
+def _ensure_table(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS extractor_cache (
+            input_hash TEXT NOT NULL,
+            extractor TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            result TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (input_hash, extractor, version)
+        )
+    """
+    )
+    conn.commit()
+
+
+_conn = None
+_pending = 0
+_hits = 0
+_misses = 0
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(_get_db_path(), timeout=30)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA busy_timeout=30000")
+        _ensure_table(_conn)
+    return _conn
+
+
+def compute_input_hash(*parts):
+    """SHA-256 of the extractor's inputs."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def cache_get(input_hash, extractor, version):
+    """The cached result (decoded JSON), or None."""
+    global _hits, _misses
+    row = (
+        _get_conn()
+        .execute(
+            "SELECT result FROM extractor_cache"
+            " WHERE input_hash = ? AND extractor = ? AND version = ?",
+            (input_hash, extractor, version),
+        )
+        .fetchone()
+    )
+    if row is None:
+        _misses += 1
+        return None
+    _hits += 1
+    return json.loads(row[0])
+
+
+def cache_put(input_hash, extractor, version, result):
+    """Store a JSON-serializable result. Committed in batches; see cache_flush."""
+    global _pending
+    conn = _get_conn()
+    conn.execute(
+        "INSERT OR REPLACE INTO extractor_cache"
+        " (input_hash, extractor, version, result, created_at) VALUES (?, ?, ?, ?, ?)",
+        (
+            input_hash,
+            extractor,
+            version,
+            json.dumps(result, sort_keys=True, ensure_ascii=False),
+            datetime.now(UTC).isoformat(),
+        ),
+    )
+    _pending += 1
+    if _pending >= COMMIT_EVERY:
+        cache_flush()
+
+
+def cache_flush():
+    """Commit puts not yet committed."""
+    global _pending
+    if _conn is not None and _pending:
+        _conn.commit()
+        _pending = 0
+
+
+atexit.register(cache_flush)
+
+
+def cache_stats():
+    """Entries per extractor, and this process's hits and misses."""
+    rows = (
+        _get_conn()
+        .execute("SELECT extractor, COUNT(*) FROM extractor_cache GROUP BY extractor")
+        .fetchall()
+    )
+    return {"entries": dict(rows), "hits": _hits, "misses": _misses}
+
+
+# --- Cached extractors ---
+
+
+def extract_all(raw_json):
+    """regex_extractor.extract_all on a raw_json string, through the cache."""
+    version = regex_extractor.ENRICHMENT_VERSION
+    key = compute_input_hash(
+        raw_json, json.dumps(regex_extractor.EXTRACTOR_VERSIONS, sort_keys=True)
+    )
+    cached = cache_get(key, "extract_all", version)
+    if cached is not None:
+        result, missed = cached
+        # JSON has no tuples; callers compare and unpack (detected, extracted).
+        return result, {kw: tuple(counts) for kw, counts in missed.items()}
+    result, missed = regex_extractor.extract_all(raw_json)
+    cache_put(key, "extract_all", version, [result, missed])
+    return result, missed
+
+
+def enrich_change(raw_json, source_name):
+    """change_extractor.enrich_change through the cache.
+
+    TraitLookupError is not cached: it propagates on every call, as it does
+    uncached.
+    """
+    version = change_extractor.ENRICHMENT_VERSION
+    key = compute_input_hash(raw_json, source_name)
+    cached = cache_get(key, "enrich_change", version)
+    if cached is not None:
+        return tuple(cached)
+    enriched_json, method = change_extractor.enrich_change(raw_json, source_name)
+    cache_put(key, "enrich_change", version, [enriched_json, method])
+    return enriched_json, method
@@ -4,15 +4,35 @@ Stores at ~/.pfsrd2/llm_cache.db. Keyed on (identity_hash, prompt_hash, model)
 so identical abilities with the same prompt always return cached results.
 
 The prompt_hash is a SHA-256 of the full prompt text, so if we change the
-prompt template, old cache entries are automatically bypassed.
+prompt template, old cache entries are automatically bypassed. They are
+not removed: compact() drops every entry outside a set of live hashes.
+get_meta()/set_meta() keep a few values beside the entries, such as the
+record count the last compaction ran against.
+
+Puts are committed every COMMIT_EVERY entries or COMMIT_SECONDS, not one
+by one; cache_flush() commits the rest and runs at exit.
+
+export_cache()/import_cache() move answers between machines as a gzipped
+JSON-lines file (bin/pf2_llm_cache), so a build host starts with the GPU
+hours another machine already spent.
 """
 
+import atexit
+import gzip
 import hashlib
+import json
 import os
 import sqlite3
+import threading
+import time
 from datetime import UTC, datetime
 
 DB_NAME = "llm_cache.db"
+COMMIT_EVERY = 50
+COMMIT_SECONDS = 10
+# SQLite's default limit on ? parameters in one statement is 999 before
+# 3.32; stay under it.
+_LOOKUP_CHUNK = 500
 
 
 def _get_db_path():
@@ -34,16 +54,31 @@ def _ensure_table(conn):
         )
     """
     )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_cache_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """
+    )
     conn.commit()
 
 
 _conn = None
+# The LLM client queries from a thread pool; every use of _conn and of the
+# counters below holds this.
+_lock = threading.RLock()
+_pending = 0
+_last_commit = time.monotonic()
+_hits = 0
+_misses = 0
 
 
 def _get_conn():
     global _conn
     if _conn is None:
-        _conn = sqlite3.connect(_get_db_path(), timeout=30)
+        _conn = sqlite3.connect(_get_db_path(), timeout=30, check_same_thread=False)
         _conn.execute("PRAGMA journal_mode=WAL")
         _conn.execute("PRAGMA busy_timeout=30000")
         _ensure_table(_conn)
@@ -55,34 +90,213 @@ def compute_prompt_hash(prompt):
     return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
 
 
+def _count(found, asked):
+    global _hits, _misses
+    _hits += found
+    _misses += asked - found
+
+
 def cache_get(prompt_hash, model):
     """Look up a cached LLM response. Returns the response string or None."""
-    conn = _get_conn()
-    cur = conn.execute(
-        "SELECT response FROM llm_cache WHERE prompt_hash = ? AND model = ?",
-        (prompt_hash, model),
-    )
-    row = cur.fetchone()
-    return row[0] if row else None
+    with _lock:
+        conn = _get_conn()
+        cur = conn.execute(
+            "SELECT response FROM llm_cache WHERE prompt_hash = ? AND model = ?",
+            (prompt_hash, model),
+        )
+        row = cur.fetchone()
+        response = row[0] if row else None
+        _count(response is not None, 1)
+    return response
+
+
+def cache_get_many(prompt_hashes, model):
+    """{prompt_hash: response} for those of prompt_hashes that are cached.
+
+    One query per _LOOKUP_CHUNK hashes instead of one per prompt.
+    """
+    prompt_hashes = list(dict.fromkeys(prompt_hashes))
+    found = {}
+    with _lock:
+        conn = _get_conn()
+        for start in range(0, len(prompt_hashes), _LOOKUP_CHUNK):
+            chunk = prompt_hashes[start : start + _LOOKUP_CHUNK]
+            cur = conn.execute(
+                "SELECT prompt_hash, response FROM llm_cache"
+                f" WHERE model = ? AND prompt_hash IN ({', '.join('?' * len(chunk))})",
+                (model, *chunk),
+            )
+            found.update((h, response) for h, response in cur if response is not None)
+        _count(len(found), len(prompt_hashes))
+    return found
+
+
+def _commit():
+    global _pending, _last_commit
+    _conn.commit()
+    _pending = 0
+    _last_commit = time.monotonic()
 
 
 def cache_put(prompt_hash, model, response):
-    """Store an LLM response in the cache."""
-    conn = _get_conn()
+    """Store an LLM response in the cache. Committed in batches; see cache_flush."""
+    global _pending
     now = datetime.now(UTC).isoformat()
-    conn.execute(
-        "INSERT OR REPLACE INTO llm_cache (prompt_hash, model, response, created_at)"
-        " VALUES (?, ?, ?, ?)",
-        (prompt_hash, model, response, now),
-    )
-    conn.commit()
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (prompt_hash, model, response, created_at)"
+            " VALUES (?, ?, ?, ?)",
+            (prompt_hash, model, response, now),
+        )
+        _pending += 1
+        if _pending >= COMMIT_EVERY or time.monotonic() - _last_commit >= COMMIT_SECONDS:
+            _commit()
+
+
+def cache_flush():
+    """Commit puts not yet committed."""
+    with _lock:
+        if _conn is not None and _pending:
+            _commit()
+
+
+atexit.register(cache_flush)
+
+
+def cache_counters():
+    """This process's lookups so far: {"hits": n, "misses": n}. No DB access."""
+    with _lock:
+        return {"hits": _hits, "misses": _misses}
 
 
 def cache_stats():
-    """Return cache statistics."""
-    conn = _get_conn()
-    cur = conn.execute("SELECT COUNT(*) FROM llm_cache")
-    total = cur.fetchone()[0]
-    cur = conn.execute("SELECT COUNT(DISTINCT model) FROM llm_cache")
-    models = cur.fetchone()[0]
-    return {"total": total, "models": models}
+    """Return cache statistics: entries, models, and this process's hits and misses."""
+    with _lock:
+        conn = _get_conn()
+        cur = conn.execute("SELECT COUNT(*) FROM llm_cache")
+        total = cur.fetchone()[0]
+        cur = conn.execute("SELECT COUNT(DISTINCT model) FROM llm_cache")
+        models = cur.fetchone()[0]
+        return {"total": total, "models": models, **cache_counters()}
+
+
+def get_meta(key):
+    """A value set_meta stored beside the cache, or None."""
+    with _lock:
+        row = (
+            _get_conn().execute("SELECT value FROM llm_cache_meta WHERE key = ?", (key,)).fetchone()
+        )
+    return row[0] if row else None
+
+
+def set_meta(key, value):
+    """Store a string beside the cache (e.g. what the last compaction saw)."""
+    with _lock:
+        conn = _get_conn()
+        conn.execute("INSERT OR REPLACE INTO llm_cache_meta VALUES (?, ?)", (key, value))
+        _commit()
+
+
+def compact(live_hashes, dry_run=False):
+    """Drop entries whose prompt_hash is not in live_hashes, then VACUUM.
+
+    live_hashes is every prompt the current templates produce for the
+    current abilities; anything else was made by a template or an ability
+    text that no longer exists. Returns the number of entries dropped (or,
+    for a dry run, that would be).
+    """
+    with _lock:
+        conn = _get_conn()
+        if _pending:
+            _commit()
+        conn.execute("CREATE TEMP TABLE live_hashes (prompt_hash TEXT PRIMARY KEY)")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO live_hashes VALUES (?)", ((h,) for h in live_hashes)
+            )
+            cur = conn.execute(
+                "DELETE FROM llm_cache"
+                " WHERE prompt_hash NOT IN (SELECT prompt_hash FROM live_hashes)"
+            )
+            dropped = cur.rowcount
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+        finally:
+            conn.execute("DROP TABLE live_hashes")
+        if not dry_run:
+            conn.execute("VACUUM")
+    return dropped
+
+
+# --- Export / import ---
+
+EXPORT_FORMAT = {"format": "pfsrd2-llm-cache", "version": 1}
+
+
+def export_cache(path, model=None):
+    """Write the cache (or one model's entries) to path. Returns the entry count.
+
+    Byte-for-byte deterministic for the same entries: sorted rows, no
+    timestamps in the rows or the gzip header, so a checked-in export only
+    changes when the answers do.
+    """
+    sql = "SELECT model, prompt_hash, response FROM llm_cache"
+    params = ()
+    if model is not None:
+        sql += " WHERE model = ?"
+        params = (model,)
+    sql += " ORDER BY model, prompt_hash"
+    with _lock:
+        if _pending:
+            _commit()
+        rows = _get_conn().execute(sql, params).fetchall()
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as f:
+        f.write((json.dumps(EXPORT_FORMAT, sort_keys=True) + "\n").encode("utf-8"))
+        for model_name, prompt_hash, response in rows:
+            entry = {"model": model_name, "prompt_hash": prompt_hash, "response": response}
+            f.write((json.dumps(entry, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8"))
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def import_cache(path):
+    """Merge an export into the cache. Entries already here are kept.
+
+    Returns {"read": n, "added": n, "differing": n}, where differing counts
+    entries this cache already had with a different answer.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "null")
+        if header != EXPORT_FORMAT:
+            raise ValueError(f"{path} is not an LLM cache export: {header!r}")
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    now = datetime.now(UTC).isoformat()
+    with _lock:
+        conn = _get_conn()
+        if _pending:
+            _commit()
+        conn.execute("CREATE TEMP TABLE imported (prompt_hash TEXT, model TEXT, response TEXT)")
+        try:
+            conn.executemany(
+                "INSERT INTO imported VALUES (?, ?, ?)",
+                ((e["prompt_hash"], e["model"], e["response"]) for e in entries),
+            )
+            differing = conn.execute(
+                "SELECT COUNT(*) FROM imported i JOIN llm_cache c USING (prompt_hash, model)"
+                " WHERE c.response IS NOT i.response"
+            ).fetchone()[0]
+            added = conn.execute(
+                "INSERT OR IGNORE INTO llm_cache (prompt_hash, model, response, created_at)"
+                " SELECT prompt_hash, model, response, ? FROM imported",
+                (now,),
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.execute("DROP TABLE imported")
+    return {"read": len(entries), "added": added, "differing": differing}
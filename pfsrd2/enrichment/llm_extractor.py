@@ -5,15 +5,245 @@ has its own prompt template optimized through iteration against known
 test cases.
 """
 
+import collections
+import http.client
+import itertools
 import json
 import re
-import subprocess
-
-from pfsrd2.enrichment.llm_cache import cache_get, cache_put, compute_prompt_hash
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from pfsrd2.enrichment.llm_cache import (
+    cache_get,
+    cache_get_many,
+    cache_put,
+    compute_prompt_hash,
+)
 from pfsrd2.enrichment.regex_extractor import _SHAPE_MAP, _resolve_damage_type
 
 DEFAULT_MODEL = "qwen2.5:7b"
 OLLAMA_URL = "http://localhost:11434/api/generate"
+REQUEST_TIMEOUT = 60
+# Requests in flight at once. Ollama answers as many in parallel as its
+# OLLAMA_NUM_PARALLEL allows and queues the rest.
+DEFAULT_WORKERS = 4
+PROBE_TIMEOUT = 5
+# Consecutive failed requests before the backend is probed. A failed probe,
+# or a second run of failures with no answer in between, aborts the run.
+BREAKER_THRESHOLD = 5
+# Once LATENCY_SAMPLES answers are in, a request gets TIMEOUT_FACTOR times the
+# p95 of the last LATENCY_WINDOW latencies, within [MIN_TIMEOUT, REQUEST_TIMEOUT].
+LATENCY_WINDOW = 50
+LATENCY_SAMPLES = 10
+TIMEOUT_FACTOR = 3
+MIN_TIMEOUT = 10
+
+
+class OllamaUnavailable(Exception):
+    """Ollama is down, lacks the model, or has stopped answering."""
+
+
+# --- HTTP client ---
+
+# One keep-alive connection per thread and server: http.client connections
+# are not thread-safe, and reusing one saves a TCP handshake per prompt.
+_local = threading.local()
+
+
+def _connection(netloc):
+    conns = _local.__dict__.setdefault("conns", {})
+    conn = conns.get(netloc)
+    if conn is None:
+        conn = conns[netloc] = http.client.HTTPConnection(netloc, timeout=REQUEST_TIMEOUT)
+    return conn
+
+
+def _drop_connection(netloc):
+    conn = _local.__dict__.get("conns", {}).pop(netloc, None)
+    if conn is not None:
+        conn.close()
+
+
+def probe(model=None):
+    """Raise OllamaUnavailable unless Ollama answers and has the model pulled.
+
+    Asks /api/tags, which answers at once, so a run against a stopped server
+    fails in PROBE_TIMEOUT seconds instead of a timeout per record.
+    """
+    model = model or DEFAULT_MODEL
+    netloc = urlsplit(OLLAMA_URL).netloc
+    conn = http.client.HTTPConnection(netloc, timeout=PROBE_TIMEOUT)
+    try:
+        conn.request("GET", "/api/tags")
+        response = conn.getresponse()
+        data = response.read()
+    except (OSError, http.client.HTTPException) as e:
+        raise OllamaUnavailable(f"no answer from {netloc}: {e}") from e
+    finally:
+        conn.close()
+    if response.status != 200:
+        raise OllamaUnavailable(f"{netloc}/api/tags returned HTTP {response.status}")
+    try:
+        names = {entry["name"] for entry in json.loads(data)["models"]}
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise OllamaUnavailable(f"unexpected /api/tags response from {netloc}") from e
+    if model not in names and f"{model}:latest" not in names:
+        raise OllamaUnavailable(f"model {model} is not pulled on {netloc}")
+
+
+class _Health:
+    """Circuit breaker and latency record shared by every request thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.failures = 0
+        self.probed = False
+        self.broken = None
+
+    def check(self):
+        if self.broken:
+            raise OllamaUnavailable(self.broken)
+
+    def timeout(self):
+        with self.lock:
+            if len(self.latencies) < LATENCY_SAMPLES:
+                return REQUEST_TIMEOUT
+            ordered = sorted(self.latencies)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return min(REQUEST_TIMEOUT, max(MIN_TIMEOUT, TIMEOUT_FACTOR * p95))
+
+    def succeeded(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.failures = 0
+            self.probed = False
+
+    def failed(self, model):
+        """Count a failed request; raise OllamaUnavailable once the breaker opens."""
+        with self.lock:
+            self.failures += 1
+            if self.failures < BREAKER_THRESHOLD or self.broken:
+                return
+            if self.probed:
+                self.broken = f"{BREAKER_THRESHOLD} requests in a row failed after a good probe"
+            self.probed = True
+            self.failures = 0
+        self.check()
+        # The server may only be slow -- loading the model, say. If it still
+        # answers, give it one more run of requests before giving up.
+        try:
+            probe(model)
+        except OllamaUnavailable as e:
+            self.broken = str(e)
+            raise
+
+
+_health = _Health()
+
+
+def _generate(prompt, model):
+    """POST one prompt to Ollama's /api/generate. The response text, or None.
+
+    Raises OllamaUnavailable once the breaker has opened.
+    """
+    _health.check()
+    url = urlsplit(OLLAMA_URL)
+    body = json.dumps({"model": model, "prompt": prompt, "stream": False}).encode("utf-8")
+    for attempt in range(2):
+        conn = _connection(url.netloc)
+        timeout = _health.timeout()
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        start = time.monotonic()
+        try:
+            conn.request("POST", url.path, body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server closed an idle keep-alive connection; retry once on
+            # a fresh one.
+            _drop_connection(url.netloc)
+            if attempt:
+                _health.failed(model)
+                return None
+            continue
+        except (OSError, http.client.HTTPException):
+            _drop_connection(url.netloc)
+            _health.failed(model)
+            return None
+        if response.status != 200:
+            _health.failed(model)
+            return None
+        _health.succeeded(time.monotonic() - start)
+        try:
+            return json.loads(data)["response"].strip()
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+            return None
+    return None
+
+
+# (prompt_hash, model) -> response, or _MISS, looked up by prefetch() ahead of
+# the _query_ollama call that sends the prompt. Each entry is taken once.
+_MISS = object()
+_prefetched = {}
+_prefetch_lock = threading.Lock()
+
+
+PREFETCH_CHUNK = 500
+
+
+def prefetch(prompts, model=None):
+    """Look up a batch of prompts in the cache at once; returns their keys.
+
+    Call before handing the prompts to _query_ollama callers: each then
+    takes its prefetched answer (or known miss) instead of asking the cache
+    one prompt at a time.
+    """
+    model = model or DEFAULT_MODEL
+    hashes = [compute_prompt_hash(prompt) for prompt in prompts]
+    found = cache_get_many(hashes, model)
+    keys = [(prompt_hash, model) for prompt_hash in hashes]
+    with _prefetch_lock:
+        for key in keys:
+            _prefetched[key] = found.get(key[0], _MISS)
+    return keys
+
+
+def prefetching(items, prompt_of, model=None, chunk=PREFETCH_CHUNK):
+    """Yield items, prefetch()ing each chunk's prompts before the first of them.
+
+    prompt_of(item) is the prompt the item's call will send, or None for
+    one that sends nothing. For map_ordered: its pool runs a few items
+    behind the generator, so a chunk's untaken lookups are dropped only
+    once the chunk after it is done, or when the caller stops early.
+    """
+    it = iter(items)
+    held = collections.deque()
+    try:
+        while batch := list(itertools.islice(it, chunk)):
+            if len(held) == 2:
+                _drop_prefetched(held.popleft())
+            held.append(prefetch([p for p in map(prompt_of, batch) if p is not None], model))
+            yield from batch
+    except GeneratorExit:
+        for keys in held:
+            _drop_prefetched(keys)
+        raise
+
+
+def _drop_prefetched(keys):
+    with _prefetch_lock:
+        for key in keys:
+            _prefetched.pop(key, None)
+
+
+def _take_prefetched(prompt_hash, model):
+    with _prefetch_lock:
+        return _prefetched.pop((prompt_hash, model), None)
 
 
 def _query_ollama(prompt, model=None):
@@ -21,34 +251,23 @@ def _query_ollama(prompt, model=None):
 
     Results are cached in ~/.pfsrd2/llm_cache.db keyed on (prompt_hash, model).
     If the prompt template changes, the hash changes and the LLM is re-queried.
+    Safe to call from several threads at once. Raises OllamaUnavailable when
+    the backend has stopped answering (see _Health).
     """
     model = model or DEFAULT_MODEL
     prompt_hash = compute_prompt_hash(prompt)
 
-    # Check cache first
-    cached = cache_get(prompt_hash, model)
+    # Check cache first, unless prefetch() already did
+    cached = _take_prefetched(prompt_hash, model)
+    if cached is None:
+        cached = cache_get(prompt_hash, model)
+    elif cached is _MISS:
+        cached = None
     if cached is not None:
         return cached
 
-    payload = json.dumps(
-        {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,
-        }
-    )
-    try:
-        result = subprocess.run(
-            ["curl", "-s", OLLAMA_URL, "-d", payload],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        if result.returncode != 0:
-            return None
-        response = json.loads(result.stdout)
-        response_text = response.get("response", "").strip()
-    except (subprocess.TimeoutExpired, json.JSONDecodeError, KeyError):
+    response_text = _generate(prompt, model)
+    if response_text is None:
         return None
 
     # Cache the result (even empty responses, to avoid re-querying)
@@ -56,6 +275,34 @@ def _query_ollama(prompt, model=None):
     return response_text
 
 
+def map_ordered(fn, items, workers=DEFAULT_WORKERS):
+    """Yield (item, fn(item)) for each item, in order.
+
+    Up to `workers` calls run at once on a thread pool, so a caller applying
+    results one by one overlaps its own work with the requests still in
+    flight. Nothing runs more than `workers` items ahead of the caller. An
+    exception from fn is raised when its item comes up.
+    """
+    if workers <= 1:
+        for item in items:
+            yield item, fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        try:
+            for item in items:
+                pending.append((item, pool.submit(fn, item)))
+                if len(pending) >= workers:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+        finally:
+            for _item, future in pending:
+                future.cancel()
+
+
 # --- Per-type prompt templates ---
 
 FREQUENCY_PROMPT = """You are extracting frequency constraints from Pathfinder 2E ability text. A frequency constraint is any phrase that limits how often something can be done.
@@ -404,6 +651,104 @@ def extract_area_llm(name, text, model=None):
     return _parse_area_response(parts)
 
 
+# --- Batched extraction ---
+
+# Abilities per batched prompt. For short ability texts a 7B model spends
+# most of a request on prefill and scheduling, so one prompt for several
+# abilities costs little more than one for a single ability.
+BATCH_SIZE = 8
+
+BATCH_INSTRUCTIONS = """Below are {count} abilities, numbered. Answer each one on its own line as
+"<number>. <answer>", in order, with the answer in the format above, or "none".
+
+{abilities}
+
+Answers:"""
+
+# llm_type -> (single-ability prompt, parse(cleaned parts, source text)), as
+# the extract_*_llm functions above use them.
+_EXTRACTIONS = {
+    "frequency": (FREQUENCY_PROMPT, lambda parts, text: "; ".join(parts)),
+    "dc": (DC_PROMPT, lambda parts, text: _parse_dc_response(parts, original_text=text)),
+    "area": (AREA_PROMPT, lambda parts, text: _parse_area_response(parts)),
+    "damage": (DAMAGE_PROMPT, lambda parts, text: _parse_damage_response(parts)),
+}
+
+
+def extraction_prompt(llm_type, name, text):
+    """The single-ability prompt extract_<llm_type>_llm sends."""
+    return _EXTRACTIONS[llm_type][0].format(name=name, text=text)
+
+
+_ANSWER_LINE = re.compile(r"\s*(\d+)[.):]\s*(.*?)\s*")
+
+
+def _batch_prompt(template, items):
+    """The template's instructions, then the (name, text) items numbered from 1."""
+    head = template[: template.index("Ability: {name}")].rstrip()
+    head = head.removesuffix("Now extract from:").rstrip()
+    abilities = "\n\n".join(
+        f"{i}. Ability: {name}\nText: {text}" for i, (name, text) in enumerate(items, 1)
+    )
+    return f"{head}\n\n" + BATCH_INSTRUCTIONS.format(count=len(items), abilities=abilities)
+
+
+def _parse_batch_answers(response, count):
+    """{number: answer} from a numbered answer, or None if the numbering is off.
+
+    A number out of range or given twice means the lines cannot be trusted
+    to belong to the abilities they name.
+    """
+    answers = {}
+    for line in response.splitlines():
+        m = _ANSWER_LINE.fullmatch(line)
+        if not m:
+            continue
+        number = int(m.group(1))
+        if not 1 <= number <= count or number in answers:
+            return None
+        if m.group(2):
+            answers[number] = m.group(2)
+    return answers
+
+
+def extract_batch_llm(llm_type, items, model=None):
+    """Extract one type from several (name, text) abilities in one prompt.
+
+    Returns a list lined up with items, each what extract_<llm_type>_llm
+    would return. Each answer is cached under the single-ability prompt it
+    stands for, so batched and single runs share the cache and cached
+    abilities are not sent. Abilities the batched answer leaves out -- all
+    of them, if its numbering is off -- are asked one at a time.
+    """
+    model = model or DEFAULT_MODEL
+    template, parse = _EXTRACTIONS[llm_type]
+    prompts = [template.format(name=name, text=text) for name, text in items]
+    hashes = [compute_prompt_hash(prompt) for prompt in prompts]
+    cached = cache_get_many([h for h, (_, text) in zip(hashes, items, strict=True) if text], model)
+    responses = [cached.get(h) for h in hashes]
+    todo = [i for i, (_, text) in enumerate(items) if text and responses[i] is None]
+
+    if len(todo) > 1:
+        response = _generate(_batch_prompt(template, [items[i] for i in todo]), model)
+        answers = _parse_batch_answers(response, len(todo)) if response else None
+        for number, i in enumerate(todo, 1):
+            answer = (answers or {}).get(number)
+            if answer:
+                responses[i] = answer
+                cache_put(hashes[i], model, answer)
+
+    for i in todo:
+        if responses[i] is None:
+            responses[i] = _query_ollama(prompts[i], model)
+
+    results = []
+    for (_, text), response in zip(items, responses, strict=True):
+        parts = _clean_llm_response(response)
+        results.append(parse(parts, text) if parts else None)
+    return results
+
+
 # --- Ability category classification ---
 
 # Valid categories matching creature stat block sections
@@ -453,18 +798,22 @@ Text: {text}
 Category:"""
 
 
-def classify_ability_category_llm(name, text, action="", traits="", model=None):
-    """Classify an ability into a creature stat block category using LLM.
-
-    Returns one of the VALID_CATEGORIES strings, or None if classification fails.
-    """
-    prompt = CATEGORY_PROMPT.format(
+def category_prompt(name, text, action="", traits=""):
+    """The prompt classify_ability_category_llm sends."""
+    return CATEGORY_PROMPT.format(
         name=name,
         text=text[:500],  # Truncate long text
         action=action or "none",
         traits=traits or "none",
     )
-    response = _query_ollama(prompt, model)
+
+
+def classify_ability_category_llm(name, text, action="", traits="", model=None):
+    """Classify an ability into a creature stat block category using LLM.
+
+    Returns one of the VALID_CATEGORIES strings, or None if classification fails.
+    """
+    response = _query_ollama(category_prompt(name, text, action, traits), model)
     if not response:
         return None
 
@@ -4,13 +4,39 @@ Conservative patterns — better to miss an extraction than get it wrong.
 Each extractor returns a structured object or None.
 """
 
+import functools
 import json
 import re
 
+# CPython's private regex parser, for the literal gates below. It moved once
+# (sre_parse -> re._parser) and can again; without it nothing is gated.
+try:
+    from re import _constants as _sre
+    from re import _parser as _sre_parse
+except ImportError:
+    _sre = _sre_parse = None
+
 # Version number for tracking which enrichment logic produced the data.
-# Bump when extract_all behavior changes.
+# Bump when extract_all behavior changes; --force-version then re-extracts
+# every record.
 ENRICHMENT_VERSION = 2
 
+# Per-field versions of the extractors extract_all runs. Bump a field's entry
+# when its extractor changes: run_regex recomputes that field alone, on the
+# records whose stored field_versions are behind, and leaves every other
+# field as it is.
+EXTRACTOR_VERSIONS = {
+    "saving_throw": 1,
+    "area": 1,
+    "range": 1,
+    "damage": 1,
+    "frequency": 1,
+}
+
+# field_versions value for a field the LLM filled. Never outdated: the regex
+# extractors did not produce it and do not replace it.
+LLM_DERIVED = "llm"
+
 # --- Damage type mapping ---
 
 # Single-word damage types that appear in "XdY <type> damage" patterns
@@ -61,6 +87,124 @@ MULTI_DAMAGE_TYPES = [
 ]
 
 
+# --- Literal gates ---
+#
+# Every pattern below needs some literal text to match: "DC", "damage",
+# "once per", one of "foot"/"mile". Those literals are read off each
+# compiled pattern once, and a scan only runs when one of them occurs in
+# the ability text. An ability's text is lowered once and shared by the
+# keyword detectors, the false alarm counters and every extractor, so the
+# hundred-odd patterns cost a substring check each and only the few that
+# can match are run. Gating is exact: a skipped pattern could not have
+# matched.
+
+# Characters IGNORECASE matches to an ASCII letter that str.lower() does
+# not lower to it (the Kelvin sign does lower to "k").
+_IGNORECASE_EXTRAS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+@functools.lru_cache(maxsize=4)
+def _folded(text):
+    """text lowered the way an IGNORECASE pattern compares ASCII letters."""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_IGNORECASE_EXTRAS).lower()
+
+
+def _requirements(items, ignorecase):
+    """What must occur in the text for a parsed pattern to match.
+
+    A list of tuples of strings: every match contains at least one string
+    from each tuple. Groups are inlined, and a branch adds a tuple when each
+    of its alternatives requires something.
+    """
+    flat = []
+    for op, av in items:
+        if op is _sre.SUBPATTERN and not av[1] and not av[2]:
+            flat.extend(av[3])
+        else:
+            flat.append((op, av))
+    found, run = [], []
+    for op, av in flat + [(None, None)]:
+        if op is _sre.LITERAL and not (ignorecase and av > 0x7F):
+            run.append(chr(av))
+            continue
+        if run:
+            found.append(("".join(run),))
+            run = []
+        if op is _sre.BRANCH:
+            alternatives = [_requirements(branch, ignorecase) for branch in av[1]]
+            if all(alternatives):
+                # Each alternative's most selective requirement stands in for it.
+                found.append(tuple(lit for alt in alternatives for lit in alt[0]))
+    if ignorecase:
+        found = [tuple(lit.lower() for lit in alternatives) for alternatives in found]
+    # A lone string inside another required one adds nothing.
+    singles = [alternatives[0] for alternatives in found if len(alternatives) == 1]
+    found = [
+        alternatives
+        for alternatives in dict.fromkeys(found)
+        if len(alternatives) > 1
+        or not any(alternatives[0] != other and alternatives[0] in other for other in singles)
+    ]
+    # Rarest first: long strings are the least likely to occur.
+    return sorted(found, key=lambda alternatives: -min(map(len, alternatives)))
+
+
+def _gate(pattern):
+    """(requirements, ignorecase) for pattern.
+
+    No requirements, so the pattern always runs, when the private parser is
+    missing or its output is not what _requirements reads.
+    """
+    ignorecase = bool(pattern.flags & re.IGNORECASE)
+    if _sre_parse is None:
+        return [], ignorecase
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+        return _requirements(parsed, ignorecase), ignorecase
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return [], ignorecase
+
+
+# id(pattern) -> _gate(pattern) for this module's patterns, filled in once
+# they are all defined (see the end of the module). Keyed by id because
+# hashing a compiled pattern rehashes its whole program; the patterns live
+# as long as the module, so the ids stay theirs.
+_GATES = {}
+
+
+def _satisfied(requirements, haystack):
+    for alternatives in requirements:
+        for literal in alternatives:
+            if literal in haystack:
+                break
+        else:
+            return False
+    return True
+
+
+def _may_match(pattern, text):
+    """False when pattern cannot match text because something it needs is absent."""
+    gate = _GATES.get(id(pattern))
+    if gate is None:
+        return True
+    requirements, ignorecase = gate
+    return _satisfied(requirements, _folded(text) if ignorecase else text)
+
+
+def _finditer(pattern, text):
+    return pattern.finditer(text) if _may_match(pattern, text) else ()
+
+
+def _search(pattern, text):
+    return pattern.search(text) if _may_match(pattern, text) else None
+
+
+def _count(pattern, text):
+    return len(pattern.findall(text)) if _may_match(pattern, text) else 0
+
+
 # --- Save DC extraction ---
 
 _SAVE_DC_PATTERNS = [
@@ -101,8 +245,7 @@ def _extract_trailing_modifier(text, match_end):
 
     Returns (modifier_list, full_text_including_modifier) or ([], match_text).
     """
-    remaining = text[match_end:]
-    m = _PAREN_MODIFIER.match(remaining)
+    m = _PAREN_MODIFIER.match(text, match_end)
     if m:
         mod_text = m.group(1).strip()
         modifier = {
@@ -145,7 +288,7 @@ def extract_save_dc(text):
     seen_dcs = set()  # track (dc, save_type) to avoid duplicates
 
     # Pass 1: DC <num> [basic] <save_type> — most specific
-    for m in _SAVE_DC_PATTERNS[0].finditer(text):
+    for m in _finditer(_SAVE_DC_PATTERNS[0], text):
         dc_val = int(m.group(1))
         is_basic = m.group(2) is not None
         save_type = _SAVE_TYPE_MAP[m.group(3).lower()]
@@ -157,7 +300,7 @@ def extract_save_dc(text):
             results.append(result)
 
     # Pass 2: <save_type> DC <num>
-    for m in _SAVE_DC_PATTERNS[1].finditer(text):
+    for m in _finditer(_SAVE_DC_PATTERNS[1], text):
         save_type = _SAVE_TYPE_MAP[m.group(1).lower()]
         dc_val = int(m.group(2))
         key = (dc_val, save_type)
@@ -168,7 +311,7 @@ def extract_save_dc(text):
             results.append(result)
 
     # Pass 3: DC <num> flat check
-    for m in _SAVE_DC_PATTERNS[2].finditer(text):
+    for m in _finditer(_SAVE_DC_PATTERNS[2], text):
         dc_val = int(m.group(1))
         key = (dc_val, "Flat Check")
         if key not in seen_dcs:
@@ -178,7 +321,7 @@ def extract_save_dc(text):
             results.append(result)
 
     # Pass 4: bare DC <num> — only if this DC wasn't already captured
-    for m in _SAVE_DC_PATTERNS[3].finditer(text):
+    for m in _finditer(_SAVE_DC_PATTERNS[3], text):
         dc_val = int(m.group(1))
         if not any(dc_val == dc for dc, _ in seen_dcs):
             seen_dcs.add((dc_val, None))
@@ -213,7 +356,7 @@ def extract_area(text):
         return []
     results = []
     seen = set()
-    for m in _AREA_PATTERN.finditer(text):
+    for m in _finditer(_AREA_PATTERN, text):
         size = int(m.group(1))
         shape = _SHAPE_MAP[m.group(2).lower()]
         unit = "miles" if "mile" in m.group(0).lower() else "feet"
@@ -245,7 +388,7 @@ def extract_range(text):
     """Extract a range from ability text. Returns a range object or None."""
     if not text:
         return None
-    m = _RANGE_PATTERN.search(text)
+    m = _search(_RANGE_PATTERN, text)
     if m:
         size = int(m.group(1))
         raw_unit = m.group(2).lower()
@@ -316,7 +459,7 @@ def extract_damage(text):
 
     Returns a list of attack_damage objects, or empty list.
     """
-    if not text or "damage" not in text.lower():
+    if not text or "damage" not in _folded(text):
         return []
 
     damages = []
@@ -342,7 +485,7 @@ def extract_damage(text):
         damages.append(dmg)
 
     # Pattern 1: "XdY [persistent] <type> damage"
-    for m in _DAMAGE_PATTERNS[0].finditer(text):
+    for m in _finditer(_DAMAGE_PATTERNS[0], text):
         formula = m.group(1).replace(" ", "")
         is_persistent = m.group(2) is not None
         damage_type = _resolve_damage_type(m.group(3))
@@ -351,26 +494,26 @@ def extract_damage(text):
 
     # Pattern 2: "XdY <type> and/plus XdY <type> damage"
     # Captures the FIRST part before "and/plus"
-    for m in _DAMAGE_PATTERNS[1].finditer(text):
+    for m in _finditer(_DAMAGE_PATTERNS[1], text):
         formula = m.group(1).replace(" ", "")
         damage_type = _resolve_damage_type(m.group(2))
         if damage_type:
             _add(formula, damage_type)
 
     # Pattern 3: "XdY damage" (untyped)
-    for m in _DAMAGE_PATTERNS[2].finditer(text):
+    for m in _finditer(_DAMAGE_PATTERNS[2], text):
         formula = m.group(1).replace(" ", "")
         _add(formula)
 
     # Pattern 4: "Damage XdY <type>" (stat block format)
-    for m in _DAMAGE_PATTERNS[3].finditer(text):
+    for m in _finditer(_DAMAGE_PATTERNS[3], text):
         formula = m.group(1).replace(" ", "")
         damage_type = _resolve_damage_type(m.group(2))
         if damage_type:
             _add(formula, damage_type)
 
     # Pattern 5: "extra/additional XdY [persistent] <type> damage"
-    for m in _DAMAGE_PATTERNS[4].finditer(text):
+    for m in _finditer(_DAMAGE_PATTERNS[4], text):
         formula = m.group(1).replace(" ", "")
         is_persistent = m.group(2) is not None
         damage_type = _resolve_damage_type(m.group(3))
@@ -378,7 +521,7 @@ def extract_damage(text):
             _add(formula, damage_type, is_persistent)
 
     # Pattern 6: "XdY extra/additional [persistent] <type> damage"
-    for m in _DAMAGE_PATTERNS[5].finditer(text):
+    for m in _finditer(_DAMAGE_PATTERNS[5], text):
         formula = m.group(1).replace(" ", "")
         is_persistent = m.group(2) is not None
         damage_type = _resolve_damage_type(m.group(3))
@@ -430,7 +573,7 @@ def extract_frequency(text):
     if not text:
         return None
     for pattern in _FREQUENCY_PATTERNS:
-        m = pattern.search(text)
+        m = _search(pattern, text)
         if m:
             return m.group(1).strip()
     return None
@@ -438,12 +581,15 @@ def extract_frequency(text):
 
 # --- Keyword detection ---
 
+# These run over every ability, so each starts with its literal where it
+# can: "DC(?<!\wDC)" is "\bDC" in a form the regex engine can search for
+# directly instead of trying every position.
 _KEYWORD_DETECTORS = {
-    "dc": re.compile(r"\bDC\b"),
-    "damage": re.compile(r"\bdamage\b", re.IGNORECASE),
+    "dc": re.compile(r"DC(?<!\wDC)\b"),
+    "damage": re.compile(r"damage(?<!\wdamage)\b", re.IGNORECASE),
     "area": re.compile(r"\d+[- ]?(?:foot|mile)\b", re.IGNORECASE),
     "frequency": re.compile(
-        r"\b(?:again for|once per|per day|per round|per minute|per hour)\b",
+        r"\b(?:again for|once per|per (?:day|round|minute|hour))\b",
         re.IGNORECASE,
     ),
 }
@@ -459,7 +605,7 @@ def detect_keywords(text):
         return {}
     found = {}
     for name, pattern in _KEYWORD_DETECTORS.items():
-        raw_count = len(pattern.findall(text))
+        raw_count = _count(pattern, text)
         if raw_count > 0:
             false_alarm_count = _count_false_alarms(name, text)
             effective = raw_count - false_alarm_count
@@ -646,6 +792,19 @@ _FALSE_ALARM_PATTERNS = {
 }
 
 
+# keyword -> [(pattern, weight, requirements, ignorecase)], unpacked and gated
+# once rather than per ability.
+_FALSE_ALARM_GATES = {
+    keyword: [
+        (pattern, weight, *_gate(pattern))
+        for pattern, weight in (
+            entry if isinstance(entry, tuple) else (entry, 1) for entry in entries
+        )
+    ]
+    for keyword, entries in _FALSE_ALARM_PATTERNS.items()
+}
+
+
 def _count_false_alarms(keyword, text):
     """Count how many keyword matches are consumed by false alarm patterns.
 
@@ -653,14 +812,11 @@ def _count_false_alarms(keyword, text):
     or a (regex, weight) tuple where weight is the number of keyword
     matches each false alarm match accounts for.
     """
-    entries = _FALSE_ALARM_PATTERNS.get(keyword, [])
+    folded = _folded(text)
     count = 0
-    for entry in entries:
-        if isinstance(entry, tuple):
-            pattern, weight = entry
-        else:
-            pattern, weight = entry, 1
-        count += len(pattern.findall(text)) * weight
+    for pattern, weight, requirements, ignorecase in _FALSE_ALARM_GATES.get(keyword, ()):
+        if _satisfied(requirements, folded if ignorecase else text):
+            count += len(pattern.findall(text)) * weight
     return count
 
 
@@ -755,3 +911,63 @@ def extract_all(ability_json):
 
     result = enriched if changed else None
     return result, missed
+
+
+def _provided(ability_json, field):
+    # extract_all's own test for "the parser already wrote this field".
+    if field == "frequency":
+        return bool(ability_json.get("frequency"))
+    return field in ability_json
+
+
+def field_versions(ability_json):
+    """{field: extractor version} for the fields extract_all fills on a raw ability.
+
+    Fields the parser provided are left out: no extractor ever writes them.
+    """
+    if isinstance(ability_json, str):
+        ability_json = json.loads(ability_json)
+    return {
+        field: version
+        for field, version in EXTRACTOR_VERSIONS.items()
+        if not _provided(ability_json, field)
+    }
+
+
+def outdated_fields(ability_json, versions):
+    """Fields whose stored version is behind their extractor's, sorted.
+
+    versions is a record's field_versions. LLM-derived fields are never
+    outdated, nor are fields the parser provided.
+    """
+    return sorted(
+        field
+        for field, current in field_versions(ability_json).items()
+        if versions.get(field) != LLM_DERIVED and (versions.get(field) or 0) < current
+    )
+
+
+def reextract_fields(enriched, fields):
+    """Recompute fields of an enriched ability; every other field is kept.
+
+    Returns (enriched_ability, missed_dict) as extract_all does, except that
+    the ability is returned even when the extractors find nothing: the
+    outdated values are gone from it either way.
+    """
+    if isinstance(enriched, str):
+        enriched = json.loads(enriched)
+    kept = {key: value for key, value in enriched.items() if key not in fields}
+    result, missed = extract_all(kept)
+    return (kept if result is None else result), missed
+
+
+for _pattern in (
+    *_SAVE_DC_PATTERNS,
+    _AREA_PATTERN,
+    _RANGE_PATTERN,
+    *_DAMAGE_PATTERNS,
+    *_FREQUENCY_PATTERNS,
+    *_KEYWORD_DETECTORS.values(),
+):
+    _GATES[id(_pattern)] = _gate(_pattern)
+del _pattern
@@ -20,6 +20,7 @@ from pfsrd2.sql.traits import (
 from pfsrd2.sql.traits import (
     trait_db_pass as universal_trait_db_pass,
 )
+from universal.cleanup import TagRule
 from universal.creatures import (
     universal_handle_alignment,
     universal_handle_range,
@@ -593,10 +594,12 @@ def _content_filter_v2(soup):
     _remove_empty_links(main)
 
 
-def _sidebar_filter(soup):
+def _decompose_sidebar(div):
     """Pre-filter for parse_universal: remove sidebar divs (supplementary info)."""
-    for div in soup.find_all("div", class_="sidebar"):
-        div.decompose()
+    div.decompose()
+
+
+_sidebar_filter = TagRule("div", _decompose_sidebar, {"class": "sidebar"})
 
 
 def restructure_equipment_v2_pass(details, equipment_type):
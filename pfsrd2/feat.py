@@ -11,7 +11,7 @@ from pfsrd2.license import license_consolidation_pass, license_pass
 from pfsrd2.schema import validate_against_schema
 from pfsrd2.sql.traits import trait_db_pass
 from universal.ability import parse_ability_from_html
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
 from universal.markdown import markdown_pass as universal_markdown_pass
 from universal.markdown import md
 from universal.universal import (
@@ -810,8 +810,7 @@ def _clean_html_fields(struct):
 def write_feat(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_feat_filename(jsondir, struct)
-    with open(filename, "w") as fp:
-        json.dump(struct, fp, indent=2, sort_keys=True)
+    write_json(filename, struct)
 
 
 def create_feat_filename(jsondir, struct):
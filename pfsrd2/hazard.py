@@ -33,7 +33,7 @@ from pfsrd2.sql.traits import fetch_trait_by_name, trait_db_pass
 from universal.ability import ADDON_LABELS_WITH_RESULTS, parse_abilities_from_nodes
 from universal.attack import parse_attack_action
 from universal.creatures import universal_handle_save_dc
-from universal.files import char_replace, disambiguated_filename, makedirs
+from universal.files import char_replace, disambiguated_filename, makedirs, write_json
 from universal.markdown import markdown_pass as universal_markdown_pass
 from universal.monster_ability import monster_ability_db_pass
 from universal.universal import (
@@ -215,8 +215,7 @@ def find_hazard(struct):
 def write_hazard(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = disambiguated_filename(jsondir, struct, "hazard")
-    with open(filename, "w") as fp:
-        json.dump(struct, fp, indent=2, sort_keys=True)
+    write_json(filename, struct)
 
 
 def restructure_hazard_pass(details):
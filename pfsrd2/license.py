@@ -1,13 +1,22 @@
+import copy
+import hashlib
 import json
 import os
 import sys
+from functools import lru_cache
 
 from bs4 import BeautifulSoup
 
 from pfsrd2.constants import ORC_LICENSE
 from pfsrd2.data import get_data
 from pfsrd2.sql import get_db_path
-from universal.files import char_replace, makedirs
+from universal.files import (
+    char_replace,
+    makedirs,
+    pretty_json,
+    set_output_transform,
+    write_json,
+)
 from universal.universal import entity_pass, parse_universal, remove_empty_sections_pass
 
 # TODO markdown the licenses
@@ -68,9 +77,7 @@ def additional_sections_pass(ogl):
 def write_license(jsondir, struct):
     print("{}: {}".format("license", struct["name"]))
     filename = create_license_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_license_filename(jsondir, struct):
@@ -79,55 +86,65 @@ def create_license_filename(jsondir, struct):
 
 
 def get_license(license, attribution_section, sec_8, sources):
-    new_sec_8 = []
-    missing_sources = []
-    for source in sources:
-        found = False
-        for sec in sec_8:
-            if sec["name"] == source["name"]:
-                new_sec_8.append(sec)
-                found = True
-                break
-        if not found:
-            missing_sources.append(source["name"])
-    if missing_sources:
-        for name in missing_sources:
-            print(f"Warning: Source not found in license: {name}")
-    attribution_section["sections"] = new_sec_8
+    by_name = {}
+    for sec in sec_8:
+        by_name.setdefault(sec["name"], sec)
+    attribution_section["sections"] = [
+        by_name[source["name"]] for source in sources if source["name"] in by_name
+    ]
     return license
 
 
-def get_orc_license(sources):
-    def _get_sec_8():
-        path = get_db_path("open_game_license_version_10a.json")
-        with open(path) as f:
-            license_data = json.load(f)
-        return license_data["sections"]
-
-    license = ORC_LICENSE
-    sec_8 = _get_sec_8()
-    result = get_license(license, license["sections"][0], sec_8, sources)
-    for source in sources:
-        found = any(sec["name"] == source["name"] for sec in sec_8)
-        if not found:
-            print(f"Could not find source in license: {source['name']}")
-    return result
-
-
-def get_ogl_license(sources):
+# Every document carries a license built from the same OGL file and the same
+# few source sets, so the file is read once per process and each finished
+# license is kept by (kind, source names). Callers get a deep copy: the
+# markdown pass rewrites license text in place and license_consolidation_pass
+# appends to its sections, and neither may reach the memo.
+@lru_cache(maxsize=1)
+def _load_ogl():
     path = get_db_path("open_game_license_version_10a.json")
     with open(path) as f:
-        license_data = json.load(f)
-    license = license_data
+        return json.load(f)
+
+
+@lru_cache(maxsize=512)
+def _built_license(kind, source_names):
+    sources = [{"name": name} for name in source_names]
+    sec_8 = _load_ogl()["sections"]
+    if kind == "orc":
+        license = copy.deepcopy(ORC_LICENSE)
+        return get_license(license, license["sections"][0], sec_8, sources)
+    license = dict(_load_ogl())
     license["subtype"] = "license"
     license["license"] = license["name"]
-    sec_8 = license_data["sections"]
-    result = get_license(license, license, sec_8, sources)
-    for source in sources:
-        found = any(sec["name"] == source["name"] for sec in sec_8)
-        if not found:
-            print(f"Could not find source in license: {source['name']}")
-    return result
+    return get_license(license, license, sec_8, sources)
+
+
+def _cached_license(kind, sources):
+    names = tuple(source["name"] for source in sources)
+    license = _built_license(kind, names)
+    # Warned per document, not per build: a memo hit must still say which of
+    # this document's sources section 8 does not know.
+    known = _ogl_section_names()
+    missing = [name for name in names if name not in known]
+    for name in missing:
+        print(f"Warning: Source not found in license: {name}")
+    for name in missing:
+        print(f"Could not find source in license: {name}")
+    return copy.deepcopy(license)
+
+
+@lru_cache(maxsize=1)
+def _ogl_section_names():
+    return frozenset(sec["name"] for sec in _load_ogl()["sections"])
+
+
+def get_orc_license(sources):
+    return _cached_license("orc", sources)
+
+
+def get_ogl_license(sources):
+    return _cached_license("ogl", sources)
 
 
 def license_pass(struct):
@@ -155,9 +172,48 @@ def license_consolidation_pass(struct):
 
     licenses = _get_licenses(struct)
     ogl = licenses.pop(0)
+    section_names = {s["name"] for s in ogl["sections"]}
     for sl in licenses:
-        section_names = [s["name"] for s in ogl["sections"]]
+        # Names join the set once the whole license is merged, not one at a
+        # time: a name repeated inside one nested license is appended each
+        # time, as it always was.
         for section in sl["sections"]:
             if section["name"] not in section_names:
                 ogl["sections"].append(section)
+        section_names.update(s["name"] for s in sl["sections"])
     struct["license"] = ogl
+
+
+# --license-refs: each distinct consolidated license is written once, to
+# <output>/licenses/<id>.json, and documents carry a license_ref pointing at
+# it instead of the full text and section 8 list. The id is the first 16 hex
+# digits of the sha256 of the license as written, so the same license always
+# lands in the same file, whichever parser or process writes it first.
+# Documents are validated with their full license; the reference replaces it
+# only as the document is written.
+_license_ref_output = None
+_written_license_refs = set()
+
+
+def set_license_refs(output):
+    """Reference licenses under output from now on; None embeds them again."""
+    global _license_ref_output
+    _license_ref_output = output
+    _written_license_refs.clear()
+    set_output_transform(license_reference if output else None)
+
+
+def license_reference(struct):
+    license = struct.get("license")
+    if not isinstance(license, dict) or license.get("type") == "license_ref":
+        return struct
+    text = pretty_json(license)
+    ref_id = hashlib.sha256(text.encode("ascii")).hexdigest()[:16]
+    if ref_id not in _written_license_refs:
+        jsondir = makedirs(_license_ref_output, "licenses")
+        write_json(os.path.join(jsondir, ref_id + ".json"), license)
+        _written_license_refs.add(ref_id)
+    ref = {"type": "license_ref", "id": ref_id, "name": license["name"]}
+    if "license" in license:
+        ref["license"] = license["license"]
+    return {**struct, "license": ref}
@@ -14,7 +14,7 @@ from pfsrd2.prose_changes import _prose_changes_for_line
 from pfsrd2.schema import validate_against_schema
 from pfsrd2.sql.sources import set_edition_from_db_pass
 from universal.ability import ADDON_LABELS_WITH_RESULTS, parse_abilities_from_nodes
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
 from universal.markdown import markdown_pass as universal_markdown_pass
 from universal.monster_ability import monster_ability_db_pass
 from universal.spells import is_spell_name, parse_spell_block
@@ -694,9 +694,7 @@ def _clean_html_fields(struct):
 def write_monster_family(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_monster_family_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_monster_family_filename(jsondir, struct):
@@ -0,0 +1,304 @@
+"""Throughput of the LLM enrichment path, without a GPU.
+
+run_llm and run_llm_classify spend their time in three places: the model,
+the client around it (prompt building, the cache, parsing, the grounding
+guard) and the enrichment DB. The model's share says nothing about changes
+to the other two, so this harness replaces it with a stub:
+
+    bin/pf2_llm_bench                          # 500 records, every pass
+    bin/pf2_llm_bench --latency 0.2 --jitter 0.1 --workers 8
+    bin/pf2_llm_bench --batch 8 --passes damage dc
+    bin/pf2_llm_bench --warm                   # a second run, on the warm cache
+
+A local HTTP server answers /api/generate like Ollama after a configurable
+latency, with canned answers read off the ability text, so the grounding
+guard accepts them and the DB is written as in a real run. Records are
+synthetic, in a scratch enrichment DB and LLM cache, with a share of them
+repeating another's text. Each pass reports records per second, cache hits
+and misses, and the seconds spent in the DB.
+"""
+
+import argparse
+import contextlib
+import importlib.machinery
+import importlib.util
+import io
+import json
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from pfsrd2.enrichment import llm_cache, llm_extractor
+from pfsrd2.sql.enrichment import (
+    get_enrichment_db_connection,
+    insert_ability_record,
+    mark_needs_review,
+)
+
+MODEL = "bench"
+PASSES = ("classify", "frequency", "dc", "area", "damage")
+_CLI = os.path.join(os.path.dirname(__file__), "..", "..", "bin", "pf2_enrich_abilities")
+
+
+# --- canned answers ---
+
+# Prompt opening -> what a model would find in the ability text.
+_ANSWERS = {
+    "You are extracting frequency": re.compile(r"once per (?:day|hour|minute|round)"),
+    "You are extracting DCs": re.compile(r"DC \d+ basic \w+"),
+    "You are extracting area": re.compile(r"\d+-foot (?:cone|line|burst|emanation)"),
+    "You are extracting damage": re.compile(r"\d+d\d+(?:\+\d+)? \w+(?= damage)"),
+}
+_BATCH_ITEM = re.compile(r"^(\d+)\. Ability: .*\nText: (.*)$", re.M)
+
+
+def canned_answer(prompt):
+    """What a well-behaved model would answer, read off the prompt's text."""
+    if prompt.startswith("You are classifying"):
+        return "offensive"
+    pattern = next(p for opening, p in _ANSWERS.items() if prompt.startswith(opening))
+
+    def answer(text):
+        return "; ".join(pattern.findall(text)) or "none"
+
+    if prompt.endswith("Answers:"):
+        return "\n".join(f"{n}. {answer(text)}" for n, text in _BATCH_ITEM.findall(prompt))
+    return answer(prompt.rsplit("Text: ", 1)[1].split("\n", 1)[0])
+
+
+# --- the stub server ---
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # waits out the client's delayed ACK, 40ms a request that Ollama does
+    # not charge.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._send({"models": [{"name": f"{MODEL}:latest"}]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            delay = server.latency + server.rng.uniform(0, server.jitter)
+            server.requests += 1
+        time.sleep(delay)
+        self._send({"model": request["model"], "response": canned_answer(request["prompt"])})
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(latency=0.05, jitter=0.0, seed=0):
+    """A running stub Ollama on a free local port. Call .shutdown() when done."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.rng = random.Random(seed)
+    server.latency = latency
+    server.jitter = jitter
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+# --- synthetic records ---
+
+_TEMPLATES = [
+    "The {n} exhales a {size}-foot cone that deals {dice} fire damage "
+    "(DC {dc} basic Reflex save). It can't use this again for 1d4 rounds.",
+    "Frequency once per day. The {n} releases a {size}-foot emanation; creatures take "
+    "{dice} sonic damage (DC {dc} basic Fortitude save).",
+    "The {n} makes a Strike that deals an extra {dice} piercing damage.",
+    "Once per hour the {n} calls a {size}-foot line of lightning dealing {dice} electricity "
+    "damage (DC {dc} basic Reflex save).",
+]
+
+
+def synthetic_records(conn, count, duplicates=0.3, seed=0):
+    """Insert count flagged records; `duplicates` of them reuse an earlier text."""
+    rng = random.Random(seed)
+    curs = conn.cursor()
+    texts = []
+    for i in range(count):
+        if texts and rng.random() < duplicates:
+            text = rng.choice(texts)
+        else:
+            text = rng.choice(_TEMPLATES).format(
+                n=f"creature {i}",
+                size=rng.choice((15, 30, 60)),
+                dice=f"{rng.randint(1, 12)}d{rng.choice((4, 6, 8, 10))}",
+                dc=rng.randint(15, 40),
+            )
+            texts.append(text)
+        name = f"Ability {i}"
+        raw = json.dumps({"name": name, "text": text, "type": "ability"})
+        ability_id = insert_ability_record(curs, name, f"bench-{i}", raw)
+        mark_needs_review(curs, ability_id, "unextracted: frequency(1), dc(1), area(1), damage(1)")
+    conn.commit()
+
+
+# --- DB timing ---
+
+
+class _Timed:
+    """Proxy that adds the time spent in the wrapped object's calls to a clock."""
+
+    _TIMED = {"execute", "executemany", "fetchone", "fetchall", "commit"}
+
+    def __init__(self, target, clock):
+        self._target = target
+        self._clock = clock
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if name == "cursor":
+            return lambda *a, **kw: _Timed(value(*a, **kw), self._clock)
+        if name not in self._TIMED:
+            return value
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                self._clock[0] += time.perf_counter() - start
+
+        return timed
+
+
+# --- the benchmark ---
+
+
+def _load_cli():
+    spec = importlib.util.spec_from_loader(
+        "pf2_enrich_abilities", importlib.machinery.SourceFileLoader("pf2_enrich_abilities", _CLI)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_passes(conn, passes=PASSES, workers=4, batch=1):
+    """Run each pass against conn; one result dict per pass."""
+    cli = _load_cli()
+    results = []
+    for name in passes:
+        clock = [0.0]
+        timed = _Timed(conn, clock)
+        args = SimpleNamespace(
+            llm_type=name,
+            dry_run=False,
+            model=MODEL,
+            force_version=False,
+            llm_workers=workers,
+            llm_batch=batch,
+            budget=None,
+        )
+        before = llm_cache.cache_counters()
+        start = time.perf_counter()
+        # The passes' own reports would bury the table.
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            if name == "classify":
+                cli.run_llm_classify(timed, args)
+            else:
+                cli.run_llm(timed, args)
+        seconds = time.perf_counter() - start
+        after = llm_cache.cache_counters()
+        results.append(
+            {
+                "pass": name,
+                "seconds": seconds,
+                "hits": after["hits"] - before["hits"],
+                "misses": after["misses"] - before["misses"],
+                "db_seconds": clock[0],
+            }
+        )
+    return results
+
+
+def benchmark(
+    records=500, latency=0.05, jitter=0.0, workers=4, batch=1, passes=PASSES, warm=False, seed=0
+):
+    """Run the passes on a scratch DB and cache against the stub.
+
+    Returns (result dicts, model requests). With warm, the passes run a
+    second time on fresh records with the same texts, so every answer is
+    already cached; only that run is reported.
+    """
+    server = start_stub(latency, jitter, seed)
+    saved = (llm_extractor.OLLAMA_URL, llm_extractor._health, llm_cache._conn)
+    with tempfile.TemporaryDirectory() as scratch:
+        llm_extractor.OLLAMA_URL = f"http://127.0.0.1:{server.server_port}/api/generate"
+        llm_extractor._health = llm_extractor._Health()
+        llm_cache._conn = sqlite3.connect(
+            os.path.join(scratch, "llm_cache.db"), check_same_thread=False
+        )
+        llm_cache._ensure_table(llm_cache._conn)
+        try:
+            for run in range(2 if warm else 1):
+                conn = get_enrichment_db_connection(os.path.join(scratch, f"enrichment{run}.db"))
+                try:
+                    synthetic_records(conn, records, seed=seed)
+                    requests = server.requests
+                    results = run_passes(conn, passes, workers, batch)
+                finally:
+                    conn.close()
+            return results, server.requests - requests
+        finally:
+            llm_cache.cache_flush()
+            llm_cache._conn.close()
+            llm_extractor.OLLAMA_URL, llm_extractor._health, llm_cache._conn = saved
+            server.shutdown()
+            server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra 0..N seconds, uniform")
+    parser.add_argument("--workers", type=int, default=llm_extractor.DEFAULT_WORKERS)
+    parser.add_argument("--batch", type=int, default=1, help="abilities per extraction prompt")
+    parser.add_argument("--passes", nargs="+", choices=PASSES, default=list(PASSES))
+    parser.add_argument("--warm", action="store_true", help="report a run on a warm cache")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results, requests = benchmark(
+        args.records,
+        args.latency,
+        args.jitter,
+        args.workers,
+        args.batch,
+        args.passes,
+        args.warm,
+        args.seed,
+    )
+    print(f"\n{'pass':<10} {'records/s':>10} {'seconds':>8} {'hit rate':>9} {'db s':>7}")
+    for row in results:
+        lookups = row["hits"] + row["misses"]
+        hit_rate = f"{row['hits'] / lookups:.0%}" if lookups else "-"
+        print(
+            f"{row['pass']:<10} {args.records / row['seconds']:>10.1f} {row['seconds']:>8.2f}"
+            f" {hit_rate:>9} {row['db_seconds']:>7.3f}"
+        )
+    print(f"\nmodel requests: {requests}")
+    return 0
@@ -0,0 +1,311 @@
+"""Worst-case timing for the enrichment extractors' regular expressions.
+
+regex_extractor and change_extractor run a few hundred patterns, many with
+lazy or nested quantifiers, over free text. A pattern that backtracks
+super-linearly is invisible on the short abilities the tests use and turns up
+as a stalled full enrichment run. This harness finds such patterns first:
+
+    bin/pf2_regex_perf                     # exit 1 if a new pattern grows super-linearly
+    bin/pf2_regex_perf --top 40            # show more of the slowest pairs
+    bin/pf2_regex_perf --update-baseline   # accept today's offenders
+
+Every pattern is collected -- module-level compiled patterns, including those
+inside lists, tuples and dicts, plus every literal pattern passed inline to
+re.search/re.sub/... (found in the module source) -- and run with finditer,
+which tries every start position the way findall, sub and a failed search do.
+
+Two kinds of input:
+- the corpus: every text field in the generated data (PF2_DATA_DIR). The
+  slowest pattern/text pairs are reported; a missing data checkout just
+  skips this part.
+- adversarial strings grown to increasing lengths: runs of one character,
+  the pattern's own words repeated, and near-misses that end in a character
+  that breaks the match. Time at each length is fitted to a growth exponent;
+  more than MAX_EXPONENT (1 is linear) fails, as does a single match that
+  runs past MATCH_BUDGET seconds.
+
+The extractors shipped with 50 such patterns. They are listed in
+regex_perf_baseline.json, keyed on pattern text and flags (labels carry line
+numbers and list positions, which move), and only a pattern not listed there
+fails the run. Fixing one is reported so its entry can be dropped.
+"""
+
+import argparse
+import ast
+import inspect
+import json
+import math
+import os
+import re
+import time
+
+from pfsrd2.qa import iter_json_dir
+from universal.watchdog import FileTimeout, watchdog
+
+SIZES = (500, 1000, 2000, 4000)
+MAX_EXPONENT = 1.5
+# Growth is not judged below this time at the largest size: a microsecond
+# pattern's exponent is timer noise.
+MIN_JUDGED_SECONDS = 0.002
+MATCH_BUDGET = 2.0
+TEXT_KEYS = ("text", "effect", "trigger", "requirements", "frequency", "description")
+BASELINE = os.path.join(os.path.dirname(__file__), "regex_perf_baseline.json")
+
+
+def _modules():
+    from pfsrd2.enrichment import change_extractor, regex_extractor
+
+    return [regex_extractor, change_extractor]
+
+
+# --- pattern collection ---
+
+
+def _walk_compiled(value, label, found):
+    if isinstance(value, re.Pattern):
+        found.append((label, value))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _walk_compiled(item, f"{label}[{key!r}]", found)
+    elif isinstance(value, list | tuple):
+        for i, item in enumerate(value):
+            _walk_compiled(item, f"{label}[{i}]", found)
+
+
+# Position of the flags argument for each re function called positionally.
+_FLAGS_ARG = {
+    "compile": 1,
+    "search": 2,
+    "match": 2,
+    "fullmatch": 2,
+    "findall": 2,
+    "finditer": 2,
+    "split": 3,
+    "sub": 4,
+    "subn": 4,
+}
+
+
+def _flags(node):
+    if node is None:
+        return 0
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _flags(node.left) | _flags(node.right)
+    if (
+        isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "re"
+    ):
+        return getattr(re, node.attr)
+    raise ValueError(f"unsupported flags expression: {ast.unparse(node)}")
+
+
+def _inline_patterns(module):
+    """Literal patterns passed straight to re.<function>(...) in module's source."""
+    found = []
+    name = module.__name__.rsplit(".", 1)[-1]
+    for node in ast.walk(ast.parse(inspect.getsource(module))):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "re"
+            and node.func.attr in _FLAGS_ARG
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+            and isinstance(node.args[0].value, str)
+        ):
+            continue
+        flags_node = next((k.value for k in node.keywords if k.arg == "flags"), None)
+        position = _FLAGS_ARG[node.func.attr]
+        if flags_node is None and len(node.args) > position:
+            flags_node = node.args[position]
+        found.append((f"{name}:{node.lineno}", re.compile(node.args[0].value, _flags(flags_node))))
+    return found
+
+
+def collect_patterns(modules=None):
+    """(label, compiled pattern) for every distinct pattern in the modules."""
+    found = []
+    for module in _modules() if modules is None else modules:
+        name = module.__name__.rsplit(".", 1)[-1]
+        for attr, value in vars(module).items():
+            _walk_compiled(value, f"{name}.{attr}", found)
+        found.extend(_inline_patterns(module))
+    unique = {}
+    for label, pattern in found:
+        unique.setdefault((pattern.pattern, pattern.flags), (label, pattern))
+    return list(unique.values())
+
+
+# --- inputs ---
+
+
+def corpus_texts(kinds=("",)):
+    """Every text field in the generated data, deduplicated."""
+    texts = set()
+
+    def walk(value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in TEXT_KEYS and isinstance(item, str):
+                    texts.add(item)
+                else:
+                    walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    for doc in iter_json_dir(*kinds):
+        walk(doc)
+    return sorted(texts)
+
+
+def adversarial_generators(pattern):
+    """name -> function of n giving an input of roughly n characters."""
+    words = sorted(set(re.findall(r"[A-Za-z]{2,}", pattern.pattern)))[:4] or ["ab"]
+    phrase = " ".join(words)
+    return {
+        "spaces": lambda n: " " * n + "!",
+        "letters": lambda n: "a" * n + "!",
+        "digits": lambda n: "1" * n + "!",
+        "words": lambda n: ("word " * (n // 5)) + "!",
+        "pattern words": lambda n: (phrase + " ") * (n // (len(phrase) + 1)) + "!",
+        "pattern words, no spaces": lambda n: phrase.replace(" ", "") * (n // len(phrase)) + ")",
+        "open parens": lambda n: "(" * n,
+        "dice": lambda n: "1d6+" * (n // 4) + "x",
+    }
+
+
+# --- timing ---
+
+
+def time_pattern(pattern, text, repeat=3):
+    """Best-of-repeat seconds to run finditer over text to exhaustion."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _match in pattern.finditer(text):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_exponent(sizes, seconds):
+    """Slope of log(time) against log(size) between the two largest sizes."""
+    (n1, t1), (n2, t2) = list(zip(sizes, seconds, strict=True))[-2:]
+    if t1 <= 0:
+        return 0.0
+    return math.log(t2 / t1) / math.log(n2 / n1)
+
+
+def check_growth(label, pattern, sizes=SIZES, budget=MATCH_BUDGET):
+    """Problems with one pattern's growth, as (label, input name, detail) rows."""
+    problems = []
+    for name, generate in adversarial_generators(pattern).items():
+        seconds = []
+        try:
+            for n in sizes:
+                with watchdog(budget):
+                    seconds.append(time_pattern(pattern, generate(n)))
+        except FileTimeout:
+            problems.append((label, name, f"over {budget:g}s at {n} chars"))
+            continue
+        if seconds[-1] < MIN_JUDGED_SECONDS:
+            continue
+        exponent = growth_exponent(sizes, seconds)
+        if exponent > MAX_EXPONENT:
+            problems.append(
+                (label, name, f"grows as n^{exponent:.2f} ({seconds[-1] * 1000:.1f}ms)")
+            )
+    return problems
+
+
+def slowest_on_corpus(patterns, texts, top=20, budget=MATCH_BUDGET):
+    """The top slowest (seconds, label, text) pairs over the corpus."""
+    timings = []
+    for label, pattern in patterns:
+        for text in texts:
+            try:
+                with watchdog(budget):
+                    seconds = time_pattern(pattern, text, repeat=1)
+            except FileTimeout:
+                seconds = math.inf
+            timings.append((seconds, label, text))
+    timings.sort(key=lambda row: row[0], reverse=True)
+    return timings[:top]
+
+
+# --- known offenders ---
+
+
+def load_baseline(path=BASELINE):
+    """{(pattern text, flags): label} of the offenders already known."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fp:
+        entries = json.load(fp)
+    return {(e["pattern"], e["flags"]): e["label"] for e in entries}
+
+
+def write_baseline(offenders, path=BASELINE):
+    """Record offenders, a list of (label, pattern), as the known ones."""
+    entries = [
+        {"label": label, "pattern": pattern.pattern, "flags": pattern.flags}
+        for label, pattern in sorted(offenders, key=lambda row: row[0])
+    ]
+    with open(path, "w") as fp:
+        json.dump(entries, fp, indent=2, ensure_ascii=False)
+        fp.write("\n")
+
+
+def _key(pattern):
+    return (pattern.pattern, pattern.flags)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=20, help="slowest corpus pairs to show")
+    parser.add_argument("--no-corpus", action="store_true", help="adversarial inputs only")
+    parser.add_argument(
+        "--baseline", default=BASELINE, help="known offenders (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write this run's offenders to the baseline and exit 0",
+    )
+    args = parser.parse_args(argv)
+
+    patterns = collect_patterns()
+    print(f"{len(patterns)} patterns")
+
+    if not args.no_corpus:
+        texts = corpus_texts()
+        print(f"{len(texts)} corpus texts")
+        for seconds, label, text in slowest_on_corpus(patterns, texts, args.top):
+            print(f"  {seconds * 1000:9.2f}ms  {label}  {text[:70]!r}")
+
+    known = load_baseline(args.baseline)
+    offenders = []
+    new = 0
+    for label, pattern in patterns:
+        problems = check_growth(label, pattern)
+        if not problems:
+            continue
+        offenders.append((label, pattern))
+        tag = "KNOWN" if _key(pattern) in known else "SUPER-LINEAR"
+        new += tag == "SUPER-LINEAR"
+        for _, name, detail in problems:
+            print(f"{tag}: {label} on {name}: {detail}")
+    print(f"\npatterns with super-linear growth: {len(offenders)} ({new} not in the baseline)")
+
+    if args.update_baseline:
+        write_baseline(offenders, args.baseline)
+        print(f"wrote {len(offenders)} offenders to {args.baseline}")
+        return 0
+    slow = {_key(pattern) for _, pattern in offenders}
+    for key, label in sorted(known.items(), key=lambda item: item[1]):
+        if key not in slow:
+            print(f"FIXED: {label} is no longer slow; drop it with --update-baseline")
+    return 1 if new else 0
@@ -10,7 +10,7 @@ from pfsrd2.schema import validate_against_schema
 from pfsrd2.sql.sources import set_edition_from_db_pass
 from pfsrd2.sql.traits import trait_db_pass
 from universal.ability import parse_ability_from_html
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
 from universal.markdown import markdown_pass as universal_markdown_pass
 from universal.markdown import md
 from universal.universal import (
@@ -541,9 +541,7 @@ def skill_cleanup_pass(struct):
 def write_skill(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_skill_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_skill_filename(jsondir, struct):
@@ -8,7 +8,7 @@ from dateutil import parser as dateparser
 
 from pfsrd2.license import get_ogl_license, get_orc_license
 from pfsrd2.schema import validate_against_schema
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
 from universal.universal import (
     aon_pass,
     entity_pass,
@@ -275,9 +275,7 @@ def drop_sources_fields_pass(struct):
 def write_source(jsondir, struct):
     print("{}: {}".format(struct["game-obj"], struct["name"]))
     filename = create_source_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_source_filename(jsondir, struct):
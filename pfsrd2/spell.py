@@ -10,7 +10,7 @@ from pfsrd2.license import license_consolidation_pass, license_pass
 from pfsrd2.schema import validate_against_schema
 from pfsrd2.sql.sources import set_edition_from_db_pass
 from pfsrd2.sql.traits import trait_db_pass
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
 from universal.markdown import markdown_pass as universal_markdown_pass
 from universal.universal import (
     DEGREE_FIELDS,
@@ -1079,9 +1079,7 @@ def _spell_valid_tags(struct, name, path, validset):
 def write_spell(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_spell_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_spell_filename(jsondir, struct):
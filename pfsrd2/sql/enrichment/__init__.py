@@ -17,8 +17,10 @@ from pfsrd2.sql.enrichment.queries import (  # noqa: F401
     count_change_records,
     fetch_abilities_by_name,
     fetch_abilities_for_creature,
+    fetch_abilities_with_field_versions,
     fetch_ability_by_hash,
     fetch_ability_by_id,
+    fetch_ability_impact,
     fetch_all_creature_types,
     fetch_change_by_hash,
     fetch_changes_for_source,
@@ -197,6 +199,23 @@ def _create_db_v_6(conn, curs, ver):
     return ver
 
 
+def _create_db_v_7(conn, curs, ver):
+    """Version 7: Add field_versions to ability_records.
+
+    JSON {field: extractor version} for each field the regex extractors
+    filled, or "llm" for a field the LLM filled. Lets a run recompute only
+    the fields whose extractor changed. NULL on records enriched before it
+    existed; those are only re-extracted whole (--force-version).
+    """
+    if ver >= 7:
+        return ver
+    ver = 7
+    curs.execute("ALTER TABLE ability_records ADD COLUMN field_versions TEXT")
+    _set_version(curs, ver)
+    conn.commit()
+    return ver
+
+
 # --- Connection ---
 
 
@@ -221,6 +240,7 @@ def get_enrichment_db_connection(db_path=None):
         ver = _create_db_v_4(conn, curs, ver)
         ver = _create_db_v_5(conn, curs, ver)
         ver = _create_db_v_6(conn, curs, ver)
+        ver = _create_db_v_7(conn, curs, ver)
     finally:
         curs.close()
     conn.row_factory = _dict_factory
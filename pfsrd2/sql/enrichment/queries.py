@@ -75,20 +75,58 @@ def fetch_needing_enrichment(curs, current_version):
     return curs.fetchall()
 
 
-def update_enriched_json(curs, ability_id, enriched_json, enrichment_version, extraction_method):
-    """Store enrichment results for an ability record."""
+def fetch_abilities_with_field_versions(curs):
+    """Fetch enriched, current, non-verified records that store field_versions.
+
+    The candidates for per-field re-extraction; the caller compares each
+    record's versions against the extractors'.
+    """
+    sql = "\n".join(
+        [
+            "SELECT * FROM ability_records",
+            " WHERE human_verified = 0",
+            " AND stale = 0",
+            " AND enriched_json IS NOT NULL",
+            " AND field_versions IS NOT NULL",
+        ]
+    )
+    curs.execute(sql)
+    return curs.fetchall()
+
+
+def update_enriched_json(
+    curs, ability_id, enriched_json, enrichment_version, extraction_method, field_versions=None
+):
+    """Store enrichment results for an ability record.
+
+    field_versions ({field: version}) replaces the stored one when given;
+    otherwise the stored one is kept.
+    """
     sql = "\n".join(
         [
             "UPDATE ability_records",
             " SET enriched_json = ?,",
             "     enrichment_version = ?,",
             "     extraction_method = ?,",
+            "     field_versions = COALESCE(?, field_versions),",
             "     stale = 0,",
             "     updated_at = ?",
             " WHERE ability_id = ?",
         ]
     )
-    curs.execute(sql, (enriched_json, enrichment_version, extraction_method, _now(), ability_id))
+    if field_versions is not None:
+        field_versions = json.dumps(field_versions, sort_keys=True)
+    curs.execute(
+        sql,
+        (
+            enriched_json,
+            enrichment_version,
+            extraction_method,
+            field_versions,
+            _now(),
+            ability_id,
+        ),
+    )
 
 
 def mark_stale(curs, ability_id, new_raw_json):
@@ -215,6 +253,23 @@ def fetch_abilities_for_creature(curs, creature_game_id):
     return curs.fetchall()
 
 
+def fetch_ability_impact(curs):
+    """ability_id -> (linked creatures, highest linked creature level).
+
+    Abilities with no creature links are absent.
+    """
+    sql = "\n".join(
+        [
+            "SELECT ability_id, COUNT(DISTINCT creature_game_id) AS creatures,",
+            "  MAX(creature_level) AS max_level",
+            " FROM ability_creature_links",
+            " GROUP BY ability_id",
+        ]
+    )
+    curs.execute(sql)
+    return {row["ability_id"]: (row["creatures"], row["max_level"]) for row in curs.fetchall()}
+
+
 def count_ability_records(curs):
     """Return counts for reporting: total, enriched, stale, verified."""
     curs.execute("SELECT COUNT(*) FROM ability_records")
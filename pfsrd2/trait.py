@@ -8,7 +8,8 @@ from bs4 import BeautifulSoup
 from pfsrd2.license import license_pass
 from pfsrd2.schema import validate_against_schema
 from universal.creatures import universal_handle_alignment
-from universal.files import char_replace, makedirs
+from universal.files import char_replace, makedirs, write_json
+from universal.log_sink import MARKDOWN, log
 from universal.markdown import md
 from universal.universal import (
     aon_pass,
@@ -27,7 +28,7 @@ from universal.universal import (
     source_edition_override_pass,
     source_pass,
 )
-from universal.utils import bs_pop_spaces, get_text, get_unique_tag_set, log_element
+from universal.utils import bs_pop_spaces, get_text, get_unique_tag_set
 
 
 def _content_filter(soup):
@@ -305,9 +306,7 @@ def trait_cleanup_pass(struct):
 def write_trait(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_trait_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_trait_filename(jsondir, struct):
@@ -357,7 +356,7 @@ def markdown_pass(struct, name, path):
                 struct[k] = v
             _validate_acceptable_tags(v)
             struct[k] = md(v).strip()
-            log_element("markdown.log")("{} : {}".format(f"{path}/{k}", name))
+            log(MARKDOWN, "{} : {}".format(f"{path}/{k}", name))
 
 
 def extract_starting_traits(description):
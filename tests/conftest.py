@@ -1,6 +1,7 @@
 import pytest
 
 from pfsrd2.enrichment import change_extractor
+from universal.log_sink import LogSink
 
 
 @pytest.fixture(autouse=True)
@@ -60,3 +61,55 @@ def seeded_creature_types(monkeypatch):
             }
         ),
     )
+
+
+@pytest.fixture(autouse=True)
+def discard_buffered_logs():
+    """Keep the parsers' diagnostic logs out of the working tree.
+
+    markdown_pass and friends buffer lines in universal.log_sink, which
+    flushes to ./<channel>.log at exit. Tests that care about the sink flush
+    it themselves inside a tmp dir.
+    """
+    yield
+    LogSink.discard()
+
+
+@pytest.fixture(autouse=True)
+def scratch_extractor_cache(monkeypatch):
+    """Give each test an empty, in-memory extractor cache.
+
+    Cached results outlive the monkeypatches the extractor tests rely on
+    (stub traits, pinned creature types), and ~/.pfsrd2 is not the tests'
+    to write to.
+    """
+    import sqlite3
+
+    from pfsrd2.enrichment import extractor_cache
+
+    conn = sqlite3.connect(":memory:")
+    extractor_cache._ensure_table(conn)
+    monkeypatch.setattr(extractor_cache, "_conn", conn)
+    monkeypatch.setattr(extractor_cache, "_pending", 0)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def scratch_llm_cache(monkeypatch):
+    """Give each test an empty, in-memory LLM cache.
+
+    The LLM passes prefetch their prompts' cached answers even when a test
+    stubs the extractor, so without this they would read ~/.pfsrd2's.
+    """
+    import sqlite3
+
+    from pfsrd2.enrichment import llm_cache, llm_extractor
+
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    llm_cache._ensure_table(conn)
+    monkeypatch.setattr(llm_cache, "_conn", conn)
+    monkeypatch.setattr(llm_cache, "_pending", 0)
+    monkeypatch.setattr(llm_extractor, "_prefetched", {})
+    yield conn
+    conn.close()
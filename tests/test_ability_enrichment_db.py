@@ -8,6 +8,7 @@ from pfsrd2.sql.enrichment import (
     count_ability_records,
     fetch_abilities_by_name,
     fetch_abilities_for_creature,
+    fetch_abilities_with_field_versions,
     fetch_ability_by_hash,
     fetch_ability_by_id,
     fetch_creatures_for_ability,
@@ -142,6 +143,34 @@ class TestAbilityRecordCRUD:
         names = {r["name"] for r in rows}
         assert names == {"Grab", "Push"}
 
+    def test_field_versions_are_kept_unless_given(self, db):
+        curs = db.cursor()
+        aid = insert_ability_record(curs, "Grab", "hash1", "{}")
+        update_enriched_json(curs, aid, "{}", 2, "regex", {"damage": 1, "area": 1})
+        update_enriched_json(curs, aid, "{}", 2, "manual")
+        assert json.loads(fetch_ability_by_id(curs, aid)["field_versions"]) == {
+            "area": 1,
+            "damage": 1,
+        }
+        update_enriched_json(curs, aid, "{}", 2, "llm:m", {"damage": "llm"})
+        assert json.loads(fetch_ability_by_id(curs, aid)["field_versions"]) == {"damage": "llm"}
+
+    def test_fetch_abilities_with_field_versions(self, db):
+        curs = db.cursor()
+        versioned = insert_ability_record(curs, "Grab", "hash1", "{}")
+        update_enriched_json(curs, versioned, "{}", 2, "regex", {"damage": 1})
+        legacy = insert_ability_record(curs, "Push", "hash2", "{}")
+        update_enriched_json(curs, legacy, "{}", 2, "regex")
+        verified = insert_ability_record(curs, "Trip", "hash3", "{}")
+        update_enriched_json(curs, verified, "{}", 2, "manual", {"damage": 1})
+        mark_human_verified(curs, verified)
+        stale = insert_ability_record(curs, "Bite", "hash4", "{}")
+        update_enriched_json(curs, stale, "{}", 2, "regex", {"damage": 1})
+        mark_stale(curs, stale, '{"new": true}')
+        db.commit()
+        rows = fetch_abilities_with_field_versions(curs)
+        assert [r["name"] for r in rows] == ["Grab"]
+
 
 class TestCreatureLinkCRUD:
     def test_insert_and_fetch(self, db):
@@ -176,6 +176,41 @@ class TestTheRejectPathActuallyRejects:
         assert json.loads(out)["saving_throw"][0]["dc"] == 25
         assert marked == []
 
+    def test_an_accepted_value_is_stored_as_llm_derived(self, monkeypatch):
+        # So a later bump of the regex dc extractor does not overwrite it.
+        import pfsrd2.ability_enrichment as ae
+        import pfsrd2.enrichment.llm_extractor as le
+
+        stored = []
+        monkeypatch.setattr(ae, "extract_all", lambda j: (json.loads(j), ["dc"]))
+        monkeypatch.setattr(ae, "update_enriched_json", lambda *a, **k: stored.append(a))
+        monkeypatch.setattr(
+            le, "extract_dc_llm", lambda n, t: [{"dc": 25, "text": "DC 25 basic Reflex"}]
+        )
+        raw = json.dumps(
+            {"name": "Fling Foe", "text": "It takes damage (DC 25 basic Fortitude save)."}
+        )
+        ae._try_inline_enrich(object(), 1, raw)
+        versions = stored[0][-1]
+        assert versions["saving_throw"] == "llm"
+        assert isinstance(versions["damage"], int)
+
+    def test_an_ollama_outage_keeps_the_regex_result(self, monkeypatch):
+        # The breaker raises rather than timing out; a parser run carries on.
+        import pfsrd2.ability_enrichment as ae
+        import pfsrd2.enrichment.llm_extractor as le
+
+        def _down(name, text):
+            raise le.OllamaUnavailable("no answer from localhost:11434")
+
+        monkeypatch.setattr(ae, "extract_all", lambda j: (json.loads(j), ["dc"]))
+        monkeypatch.setattr(ae, "update_enriched_json", lambda *a, **k: None)
+        monkeypatch.setattr(le, "extract_dc_llm", _down)
+        raw = json.dumps({"name": "Fling Foe", "text": self.SOURCE, "type": "ability"})
+        out = ae._try_inline_enrich(object(), 1, raw)
+        assert json.loads(out)["name"] == "Fling Foe"
+        assert "saving_throw" not in json.loads(out)
+
 
 class TestTheRejectionCanBeRequeued:
     """A flagged record is re-queued by substring-matching its review_reason
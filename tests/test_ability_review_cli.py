@@ -0,0 +1,111 @@
+"""Tests for bin/pf2_ability_review's enrich command (write path)."""
+
+import importlib.machinery
+import importlib.util
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from pfsrd2.enrichment.regex_extractor import EXTRACTOR_VERSIONS
+from pfsrd2.sql.enrichment import (
+    get_enrichment_db_connection,
+    insert_ability_record,
+    insert_creature_link,
+)
+
+CLI = os.path.join(os.path.dirname(__file__), "..", "bin", "pf2_ability_review")
+
+
+def load_cli():
+    spec = importlib.util.spec_from_loader(
+        "pf2_ability_review",
+        importlib.machinery.SourceFileLoader("pf2_ability_review", CLI),
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def db():
+    conn = get_enrichment_db_connection(":memory:")
+    yield conn
+    conn.close()
+
+
+def _ability(conn, text, field_versions=None, enriched=None):
+    curs = conn.cursor()
+    raw = json.dumps({"name": "Spit", "text": text})
+    ability_id = insert_ability_record(curs, "Spit", "h", raw)
+    insert_creature_link(curs, ability_id, "c-1", "Goblin", 1, [], "Bestiary", "offensive")
+    if enriched is not None:
+        curs.execute(
+            "UPDATE ability_records SET enriched_json = ?, field_versions = ?"
+            " WHERE ability_id = ?",
+            (json.dumps(enriched), json.dumps(field_versions), ability_id),
+        )
+    conn.commit()
+    return ability_id
+
+
+def _row(conn, ability_id):
+    curs = conn.cursor()
+    curs.execute("SELECT * FROM ability_records WHERE ability_id = ?", (ability_id,))
+    return curs.fetchone()
+
+
+class TestEnrichRecordsFieldVersions:
+    def test_regex_fields_get_the_current_versions(self, db):
+        cli = load_cli()
+        ability_id = _ability(db, "It spits, dealing 2d6 acid damage.")
+        cli.cmd_enrich(db.cursor(), SimpleNamespace(creature_id="c-1"))
+        row = _row(db, ability_id)
+        assert row["enrichment_version"] == cli.ENRICHMENT_VERSION
+        assert json.loads(row["field_versions"]) == EXTRACTOR_VERSIONS
+
+    def test_llm_fields_are_marked_llm_derived(self, db, monkeypatch):
+        cli = load_cli()
+        ability_id = _ability(db, "It spits acid once per day in a 15-foot")
+        monkeypatch.setattr(cli, "extract_area_llm", lambda name, text: "15-foot line")
+        cli.cmd_enrich(db.cursor(), SimpleNamespace(creature_id="c-1"))
+        row = _row(db, ability_id)
+        assert json.loads(row["enriched_json"])["area"] == "15-foot line"
+        versions = json.loads(row["field_versions"])
+        assert versions["area"] == "llm"
+        assert versions["damage"] == EXTRACTOR_VERSIONS["damage"]
+
+    def test_an_earlier_llm_answer_stays_llm_derived(self, db, monkeypatch):
+        cli = load_cli()
+        text = "It spits acid once per day in a 15-foot"
+        stored = {"name": "Spit", "text": text, "damage": "1d4 acid"}
+        ability_id = _ability(db, text, {"damage": "llm"}, stored)
+        monkeypatch.setattr(cli, "extract_area_llm", lambda name, text: None)
+        cli.cmd_enrich(db.cursor(), SimpleNamespace(creature_id="c-1"))
+        assert json.loads(_row(db, ability_id)["field_versions"])["damage"] == "llm"
+
+
+class TestEnrichSurvivesAnOutage:
+    def test_the_regex_result_is_kept_and_the_llm_skipped(self, db, monkeypatch, capsys):
+        from pfsrd2.enrichment.llm_extractor import OllamaUnavailable
+
+        cli = load_cli()
+        calls = []
+
+        def down(name, text):
+            calls.append(name)
+            raise OllamaUnavailable("no answer from localhost:11434")
+
+        monkeypatch.setattr(cli, "extract_area_llm", down)
+        ability_id = _ability(db, "It spits, dealing 2d6 acid damage in a 15-foot")
+        second = insert_ability_record(
+            db.cursor(), "Spray", "h2", json.dumps({"name": "Spray", "text": "A 30-foot spray."})
+        )
+        insert_creature_link(db.cursor(), second, "c-1", "Goblin", 1, [], "Bestiary", "offensive")
+        cli.cmd_enrich(db.cursor(), SimpleNamespace(creature_id="c-1"))
+        assert "LLM unavailable" in capsys.readouterr().out
+        assert len(calls) == 1
+        row = _row(db, ability_id)
+        assert row["extraction_method"] == "regex"
+        assert json.loads(row["enriched_json"])["damage"][0]["formula"] == "2d6"
@@ -0,0 +1,101 @@
+"""Tests for universal/bundle.py — NDJSON bundle output."""
+
+import gzip
+import os
+
+import pytest
+
+from universal.bundle import bundle_filename, read_bundle, read_index, read_record
+from universal.files import makedirs, set_bundle_output, write_json
+
+GOBLIN = {"name": "Goblin", "game-obj": "Monsters", "game-id": "g1", "aonid": 1}
+ORC = {"name": "Orc", "game-obj": "Monsters", "game-id": "o1", "aonid": 2}
+FIREBALL = {"name": "Fireball", "game-obj": "Spells", "game-id": "f1", "aonid": 3}
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "gzip"])
+def bundled(request, tmp_path):
+    set_bundle_output(str(tmp_path), compress=request.param)
+    yield tmp_path, request.param
+    set_bundle_output(None)
+
+
+def _write(output, struct, source="Bestiary"):
+    jsondir = makedirs(str(output), struct["game-obj"], source)
+    write_json(os.path.join(jsondir, struct["name"].lower() + ".json"), struct)
+
+
+class TestBundleOutput:
+    def test_one_bundle_per_content_type(self, bundled):
+        output, compress = bundled
+        for struct in (GOBLIN, FIREBALL, ORC):
+            _write(output, struct)
+        monsters = bundle_filename(str(output), "monsters", compress)
+        spells = bundle_filename(str(output), "spells", compress)
+        assert list(read_bundle(monsters)) == [GOBLIN, ORC]
+        assert list(read_bundle(spells)) == [FIREBALL]
+
+    def test_no_tree_is_created(self, bundled):
+        output, compress = bundled
+        _write(output, GOBLIN)
+        bundle = os.path.basename(bundle_filename(str(output), "monsters", compress))
+        assert sorted(os.listdir(output)) == [bundle, bundle + ".idx"]
+
+    def test_index_entries_read_back_their_documents(self, bundled):
+        output, compress = bundled
+        for struct in (GOBLIN, ORC):
+            _write(output, struct)
+        monsters = bundle_filename(str(output), "monsters", compress)
+        entries = read_index(monsters)
+        assert [e["path"] for e in entries] == [
+            os.path.join("monsters", "bestiary", "goblin.json"),
+            os.path.join("monsters", "bestiary", "orc.json"),
+        ]
+        assert [read_record(monsters, e) for e in entries] == [GOBLIN, ORC]
+
+    def test_a_document_under_several_sources_is_stored_once(self, bundled):
+        output, compress = bundled
+        _write(output, GOBLIN, "Bestiary")
+        _write(output, GOBLIN, "Monster Core")
+        monsters = bundle_filename(str(output), "monsters", compress)
+        assert list(read_bundle(monsters)) == [GOBLIN]
+        entries = read_index(monsters)
+        assert len(entries) == 2
+        assert entries[0]["offset"] == entries[1]["offset"]
+
+    def test_stored_once_with_license_refs_too(self, bundled):
+        # The license reference transform returns a new dict on every write.
+        from pfsrd2.license import set_license_refs
+
+        output, compress = bundled
+        goblin = {**GOBLIN, "license": {"name": "ORC", "text": "Open RPG Creative"}}
+        set_license_refs(str(output))
+        try:
+            _write(output, goblin, "Bestiary")
+            _write(output, goblin, "Monster Core")
+        finally:
+            set_license_refs(None)
+        monsters = bundle_filename(str(output), "monsters", compress)
+        (stored,) = read_bundle(monsters)
+        assert stored["license"]["type"] == "license_ref"
+        entries = read_index(monsters)
+        assert len(entries) == 2
+        assert entries[0]["offset"] == entries[1]["offset"]
+
+    def test_a_reparse_supersedes_the_earlier_record(self, bundled):
+        output, compress = bundled
+        _write(output, GOBLIN)
+        _write(output, {**GOBLIN, "level": -1})
+        monsters = bundle_filename(str(output), "monsters", compress)
+        (entry,) = read_index(monsters)
+        assert read_record(monsters, entry)["level"] == -1
+
+    def test_gzip_bundle_is_ordinary_gzip(self, tmp_path):
+        set_bundle_output(str(tmp_path), compress=True)
+        try:
+            _write(tmp_path, GOBLIN)
+            _write(tmp_path, ORC)
+        finally:
+            set_bundle_output(None)
+        with gzip.open(tmp_path / "monsters.ndjson.gz", "rt") as fp:
+            assert len(fp.read().splitlines()) == 2
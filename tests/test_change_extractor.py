@@ -1,3 +1,5 @@
+import ast
+import inspect
 import json
 
 import pytest
@@ -1113,3 +1115,19 @@ class TestChooseSkillSelection:
     def test_plain_ability_grant_unaffected(self):
         effects = _build_effects("- Add the following abilities.", "abilities", "Catfolk")
         assert effects[0]["operation"] == "add_items"
+
+
+def test_every_pattern_is_compiled_once():
+    # Inline re.search(r"...") pays a cache lookup per call and a
+    # recompile whenever the re cache has been churned.
+    source = inspect.getsource(change_extractor)
+    inline = [
+        node.lineno
+        for node in ast.walk(ast.parse(source))
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "re"
+        and node.func.attr != "compile"
+    ]
+    assert inline == []
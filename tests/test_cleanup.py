@@ -0,0 +1,128 @@
+"""Tests for universal/cleanup.py — the one-traversal pre-filter engine."""
+
+from bs4 import BeautifulSoup
+
+from universal.cleanup import TagRule, apply_pre_filters, apply_rules
+from universal.universal import href_filter, span_formatting_filter
+from universal.utils import sidebar_filter
+
+PAGE = """<html><body><div id="main">
+<div class="sidebar-nofloat"><a href="Traits.aspx?ID=12">Fire</a></div>
+<span style="color:red"> </span>
+<span style="color:red"><a>orphan</a></span>
+<a href="javascript:void(0);"><span style="x"> </span></a>
+<a href="Spells.aspx?ID=3&amp;Redirected=1">Fireball</a>
+<a>no href</a>
+</div></body></html>"""
+
+
+def _soup():
+    return BeautifulSoup(PAGE.replace("\n", ""), "lxml")
+
+
+class TestTagRule:
+    def test_class_matches_one_of_several(self):
+        soup = BeautifulSoup('<div class="a sidebar b"></div>', "html.parser")
+        assert TagRule("div", None, {"class": "sidebar"}).matches(soup.div)
+
+    def test_presence_and_predicate(self):
+        soup = BeautifulSoup('<span style="margin-left:auto"></span><span></span>', "html.parser")
+        first, second = soup.find_all("span")
+        assert TagRule("span", None, {"style": True}).matches(first)
+        assert not TagRule("span", None, {"style": True}).matches(second)
+        rule = TagRule("span", None, {"style": lambda s: s and "margin-left" in s})
+        assert rule.matches(first)
+        assert not rule.matches(second)
+
+    def test_called_on_a_soup_applies_alone(self):
+        soup = BeautifulSoup('<div class="sidebar-nofloat"><b>Keep</b></div>', "html.parser")
+        sidebar_filter(soup)
+        assert soup.find("div") is None
+
+
+class TestApplyRules:
+    def test_one_traversal_matches_rule_by_rule(self):
+        merged = _soup()
+        apply_pre_filters(merged, [sidebar_filter, href_filter, span_formatting_filter])
+        # What the three filter functions did: one find_all each, in turn.
+        sequential = _soup()
+        for rule in (sidebar_filter, href_filter, span_formatting_filter):
+            for tag in sequential.find_all(rule.name):
+                if rule.matches(tag):
+                    rule.action(tag)
+        assert str(merged) == str(sequential)
+
+    def test_actions_run_in_rule_order(self):
+        seen = []
+        soup = BeautifulSoup("<b>1</b><i>2</i><b>3</b>", "html.parser")
+        apply_rules(
+            soup,
+            [
+                TagRule("i", lambda t: seen.append(t.string)),
+                TagRule("b", lambda t: seen.append(t.string)),
+            ],
+        )
+        assert seen == ["2", "1", "3"]
+
+    def test_removed_tags_are_skipped(self):
+        seen = []
+        soup = BeautifulSoup("<div><a>inner</a></div><a>outer</a>", "html.parser")
+        apply_rules(
+            soup,
+            [
+                TagRule("div", lambda t: t.decompose()),
+                TagRule("a", lambda t: seen.append(t.string)),
+            ],
+        )
+        assert seen == ["outer"]
+
+    def test_attributes_are_tested_after_earlier_rules(self):
+        # find_all at the later rule's turn would see the attribute the first
+        # rule set, so the merged pass has to as well.
+        soup = BeautifulSoup("<a>x</a>", "html.parser")
+
+        def _mark(a):
+            a["data-hit"] = "1"
+
+        apply_rules(
+            soup,
+            [TagRule("a", _mark), TagRule("a", lambda t: t.decompose(), {"data-hit": "1"})],
+        )
+        assert soup.find("a") is None
+
+    def test_inserted_nodes_reach_later_rules(self):
+        soup = BeautifulSoup("<p>x</p>", "html.parser")
+
+        def _insert(p):
+            new = soup.new_tag("b")
+            p.insert_after(new)
+            return [new]
+
+        apply_rules(soup, [TagRule("p", _insert), TagRule("b", lambda t: t.decompose())])
+        assert soup.find("b") is None
+
+
+class TestApplyPreFilters:
+    def test_functions_are_barriers(self):
+        calls = []
+        soup = BeautifulSoup("<b>1</b>", "html.parser")
+
+        def _structural(s):
+            calls.append(("fn", len(s.find_all("b"))))
+            s.append(s.new_tag("b"))
+
+        rule = TagRule("b", lambda t: calls.append(("rule", None)))
+        apply_pre_filters(soup, [rule, _structural, rule])
+        # The second run of the rule sees the <b> the function added.
+        assert calls == [("rule", None), ("fn", 1), ("rule", None), ("rule", None)]
+
+    def test_equipment_sidebar_rule(self):
+        from pfsrd2.equipment import _sidebar_filter
+
+        soup = BeautifulSoup(
+            '<div id="main"><div class="sidebar">Side<a href="x">l</a></div><p>Body</p></div>',
+            "html.parser",
+        )
+        apply_pre_filters(soup, [_sidebar_filter, href_filter])
+        assert "Side" not in soup.get_text()
+        assert "Body" in soup.get_text()
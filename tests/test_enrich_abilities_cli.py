@@ -9,10 +9,12 @@ real here, against an in-memory DB with a stubbed extractor.
 The CLI guards `if __name__ == "__main__"`, so importing it runs nothing.
 """
 
+import argparse
 import importlib.machinery
 import importlib.util
 import json
 import os
+import time
 
 import pytest
 
@@ -38,6 +40,10 @@ class Args:
         self.dry_run = kw.get("dry_run", False)
         self.model = kw.get("model", "test-model")
         self.force_version = kw.get("force_version", False)
+        self.llm_workers = kw.get("llm_workers", 2)
+        self.budget = kw.get("budget")
+        self.llm_batch = kw.get("llm_batch", 1)
+        self.confirm_compact = kw.get("confirm_compact", False)
 
 
 @pytest.fixture
@@ -393,3 +399,496 @@ class TestHealStaleRespectsDryRun:
         ability_id = self._stale(db)
         cli.run_heal_stale(db, Args(dry_run=False))
         assert _row(db, ability_id)["stale"] == 0
+
+
+class TestDuplicateTextsShareOneQuery:
+    """A family's shared wording is one LLM query, applied to every record."""
+
+    def _records(self, conn, rows):
+        from pfsrd2.sql.enrichment.queries import insert_ability_record, mark_needs_review
+
+        curs = conn.cursor()
+        ids = []
+        for i, (name, text) in enumerate(rows):
+            raw = json.dumps({"name": name, "text": text})
+            ability_id = insert_ability_record(curs, name, f"hash-{i}", raw)
+            mark_needs_review(curs, ability_id, "unextracted: damage(1) --llm-type damage")
+            ids.append(ability_id)
+        conn.commit()
+        return ids
+
+    def test_each_distinct_text_is_queried_once(self, db, monkeypatch, capsys):
+        cli = load_cli()
+        ids = self._records(
+            db,
+            [
+                ("Breath Weapon", "deals 6d6 fire damage"),
+                ("Breath Weapon", "deals  6d6 fire\ndamage"),
+                ("Fire Breath", "deals 6d6 fire damage"),
+                ("Bite", "deals 2d8 piercing damage"),
+            ],
+        )
+        calls = []
+
+        def _extract(name, text, **kw):
+            calls.append(text)
+            formula = "6d6" if "6d6" in text else "2d8"
+            return [{"formula": formula}]
+
+        monkeypatch.setattr(cli, "extract_damage_llm", _extract)
+        cli.run_llm(db, Args(llm_type="damage"))
+
+        assert calls == ["deals 6d6 fire damage", "deals 2d8 piercing damage"]
+        formulas = [json.loads(_row(db, i)["enriched_json"])["damage"][0]["formula"] for i in ids]
+        assert formulas == ["6d6", "6d6", "6d6", "2d8"]
+        assert all(_row(db, i)["needs_review"] == 0 for i in ids)
+        assert "4 flagged damage records (2 distinct texts)" in capsys.readouterr().out
+
+    def test_the_guard_still_checks_every_record(self, db, monkeypatch):
+        # Normalization only folds whitespace, so a group's texts are the
+        # same words and ground the same values; each is still checked.
+        cli = load_cli()
+        ids = self._records(db, [("A", "no dice here"), ("B", "no  dice here")])
+        monkeypatch.setattr(
+            cli, "extract_damage_llm", lambda name, text, **kw: [{"formula": "9d9"}]
+        )
+        cli.run_llm(db, Args(llm_type="damage"))
+        assert all(_row(db, i)["enriched_json"] is None for i in ids)
+        assert all("9d9" in _row(db, i)["review_reason"] for i in ids)
+
+    def test_batched_mode_sends_groups_together(self, db, monkeypatch):
+        cli = load_cli()
+        ids = self._records(
+            db,
+            [
+                ("Breath Weapon", "deals 6d6 fire damage"),
+                ("Fire Breath", "deals 6d6 fire damage"),
+                ("Bite", "deals 2d8 piercing damage"),
+                ("Claw", "deals 1d6 slashing damage"),
+            ],
+        )
+        batches = []
+
+        def _extract_batch(llm_type, items, model=None):
+            batches.append([text for _, text in items])
+            return [[{"formula": text.split()[1]}] for _, text in items]
+
+        monkeypatch.setattr(cli, "extract_batch_llm", _extract_batch)
+        monkeypatch.setattr(cli, "extract_damage_llm", lambda *a, **kw: pytest.fail("single"))
+        cli.run_llm(db, Args(llm_type="damage", llm_batch=2))
+
+        assert batches == [
+            ["deals 6d6 fire damage", "deals 2d8 piercing damage"],
+            ["deals 1d6 slashing damage"],
+        ]
+        formulas = [json.loads(_row(db, i)["enriched_json"])["damage"][0]["formula"] for i in ids]
+        assert formulas == ["6d6", "6d6", "2d8", "1d6"]
+
+    def test_classification_groups_on_every_prompt_input(self, db, monkeypatch):
+        from pfsrd2.sql.enrichment.queries import insert_ability_record
+
+        cli = load_cli()
+        curs = db.cursor()
+        for i, name in enumerate(["Trample", "Trample", "Rend"]):
+            raw = json.dumps({"name": name, "text": "the creature moves"})
+            insert_ability_record(curs, name, f"hash-{i}", raw)
+        db.commit()
+        calls = []
+
+        def _classify(name, text, **kw):
+            calls.append(name)
+            return "offensive"
+
+        monkeypatch.setattr(cli, "classify_ability_category_llm", _classify)
+        cli.run_llm_classify(db, Args())
+
+        assert calls == ["Rend", "Trample"]
+        curs.execute("SELECT ability_category FROM ability_records")
+        assert [row["ability_category"] for row in curs.fetchall()] == ["offensive"] * 3
+
+
+class TestCachedAnswersArePrefetched:
+    """The default (unbatched) passes look cached answers up a chunk at a time."""
+
+    def _lookups(self, monkeypatch):
+        from pfsrd2.enrichment import llm_extractor
+
+        calls = []
+        monkeypatch.setattr(llm_extractor, "cache_get", lambda *a: calls.append(a))
+        monkeypatch.setattr(llm_extractor, "_generate", lambda *a: pytest.fail("generated"))
+        return calls
+
+    def test_extraction(self, db, monkeypatch):
+        from pfsrd2.enrichment import llm_cache
+        from pfsrd2.enrichment.llm_extractor import extraction_prompt
+
+        cli = load_cli()
+        texts = ["deals 6d6 fire damage", "deals 2d8 piercing damage"]
+        ids = TestDuplicateTextsShareOneQuery()._records(
+            db, [(f"A{i}", text) for i, text in enumerate(texts)]
+        )
+        for i, text in enumerate(texts):
+            prompt = extraction_prompt("damage", f"A{i}", text)
+            llm_cache.cache_put(llm_cache.compute_prompt_hash(prompt), "m", text.split()[1])
+        lookups = self._lookups(monkeypatch)
+        cli.run_llm(db, Args(llm_type="damage", model="m"))
+        assert lookups == []
+        formulas = [json.loads(_row(db, i)["enriched_json"])["damage"][0]["formula"] for i in ids]
+        assert formulas == ["6d6", "2d8"]
+
+    def test_classification(self, db, monkeypatch):
+        from pfsrd2.enrichment import llm_cache
+        from pfsrd2.enrichment.llm_extractor import category_prompt
+        from pfsrd2.sql.enrichment.queries import insert_ability_record
+
+        cli = load_cli()
+        curs = db.cursor()
+        for i, name in enumerate(["Trample", "Rend"]):
+            raw = json.dumps({"name": name, "text": "the creature moves"})
+            insert_ability_record(curs, name, f"hash-{i}", raw)
+            prompt = category_prompt(name, "the creature moves")
+            llm_cache.cache_put(llm_cache.compute_prompt_hash(prompt), "m", "offensive")
+        db.commit()
+        lookups = self._lookups(monkeypatch)
+        cli.run_llm_classify(db, Args(model="m"))
+        assert lookups == []
+        curs.execute("SELECT ability_category FROM ability_records")
+        assert [row["ability_category"] for row in curs.fetchall()] == ["offensive"] * 2
+
+
+class TestImpactOrderAndBudget:
+    def _records(self, conn, creatures_per_record):
+        from pfsrd2.sql.enrichment.queries import (
+            insert_ability_record,
+            insert_creature_link,
+            mark_needs_review,
+        )
+
+        curs = conn.cursor()
+        ids = []
+        for i, creatures in enumerate(creatures_per_record):
+            raw = json.dumps({"name": f"A{i}", "text": f"deals {i + 1}d6 fire damage"})
+            ability_id = insert_ability_record(curs, f"A{i}", f"hash-{i}", raw)
+            mark_needs_review(curs, ability_id, "unextracted: damage(1) --llm-type damage")
+            for creature in creatures:
+                level = int(creature[1:])
+                insert_creature_link(curs, ability_id, creature, creature, level, None, None, "x")
+            ids.append(ability_id)
+        conn.commit()
+        return ids
+
+    def _stub(self, cli, monkeypatch):
+        calls = []
+
+        def _extract(name, text, **kw):
+            calls.append(name)
+            return [{"formula": text.split()[1]}]
+
+        monkeypatch.setattr(cli, "extract_damage_llm", _extract)
+        return calls
+
+    def test_the_most_linked_abilities_go_first(self, db, monkeypatch):
+        cli = load_cli()
+        self._records(db, [["c1"], [], ["c1", "c2", "c3"], ["c4"], ["c1", "c2"]])
+        calls = self._stub(cli, monkeypatch)
+        cli.run_llm(db, Args(llm_type="damage", llm_workers=1))
+        # A3's one creature outranks A0's on level; A1 has no links at all.
+        assert calls == ["A2", "A4", "A3", "A0", "A1"]
+
+    def test_a_record_budget_stops_and_the_next_run_resumes(self, db, monkeypatch):
+        cli = load_cli()
+        ids = self._records(db, [[], ["c1"], ["c1", "c2"]])
+        calls = self._stub(cli, monkeypatch)
+
+        cli.run_llm(db, Args(llm_type="damage", budget=cli.parse_budget("2")))
+        assert calls == ["A2", "A1"]
+        assert [_row(db, i)["needs_review"] for i in ids] == [1, 0, 0]
+
+        cli.run_llm(db, Args(llm_type="damage"))
+        assert calls == ["A2", "A1", "A0"]
+        assert [_row(db, i)["needs_review"] for i in ids] == [0, 0, 0]
+
+    def test_a_spent_time_budget_does_no_work(self, db, monkeypatch):
+        cli = load_cli()
+        ids = self._records(db, [[]])
+        calls = self._stub(cli, monkeypatch)
+        cli.run_llm(db, Args(llm_type="damage", budget=cli.Budget(seconds=0)))
+        assert _row(db, ids[0])["needs_review"] == 1
+        assert calls == []
+
+    @pytest.mark.parametrize(
+        "value, seconds, records",
+        [("90s", 90, None), ("30m", 1800, None), ("1.5h", 5400, None), ("500", None, 500)],
+    )
+    def test_budget_values(self, value, seconds, records):
+        budget = load_cli().parse_budget(value)
+        assert budget.records == records
+        if seconds is None:
+            assert budget.deadline is None
+        else:
+            assert budget.deadline == pytest.approx(time.monotonic() + seconds, abs=5)
+
+    @pytest.mark.parametrize("value", ["", "30x", "1.5", "-3m"])
+    def test_bad_budget_values(self, value):
+        with pytest.raises(argparse.ArgumentTypeError):
+            load_cli().parse_budget(value)
+
+
+class TestAnOutageStopsTheRun:
+    def test_work_before_the_outage_is_kept_and_the_rest_stays_queued(self, db, monkeypatch):
+        from pfsrd2.enrichment.llm_extractor import OllamaUnavailable
+        from pfsrd2.sql.enrichment.queries import insert_ability_record, mark_needs_review
+
+        cli = load_cli()
+        curs = db.cursor()
+        ids = []
+        for i, text in enumerate(["takes 4d6 fire damage", "takes 2d6 cold damage"]):
+            raw = json.dumps({"name": f"A{i}", "text": text})
+            ids.append(insert_ability_record(curs, f"A{i}", f"hash-{i}", raw))
+            mark_needs_review(curs, ids[-1], "unextracted: damage(1) --llm-type damage")
+        db.commit()
+
+        def _extract(name, text, **kw):
+            if "cold" in text:
+                raise OllamaUnavailable("no answer from localhost:11434")
+            return [{"formula": "4d6"}]
+
+        monkeypatch.setattr(cli, "extract_damage_llm", _extract)
+        monkeypatch.setattr(cli, "probe", lambda model: None)
+        monkeypatch.setattr(cli, "get_enrichment_db_connection", lambda: db)
+        monkeypatch.setattr(
+            "sys.argv", ["pf2_enrich_abilities", "--llm", "damage", "--llm-workers", "1"]
+        )
+        assert cli.main() == 1
+
+        db.rollback()
+        assert [_row(db, i)["needs_review"] for i in ids] == [0, 1]
+
+    def test_a_failed_probe_stops_before_any_work(self, db, monkeypatch, capsys):
+        from pfsrd2.enrichment.llm_extractor import OllamaUnavailable
+
+        cli = load_cli()
+        ability_id = _flagged_record(db, "takes 4d6 fire damage", "unextracted: damage(1)")
+
+        def _probe(model):
+            raise OllamaUnavailable("model qwen2.5:7b is not pulled on localhost:11434")
+
+        monkeypatch.setattr(cli, "probe", _probe)
+        monkeypatch.setattr(cli, "extract_damage_llm", lambda *a, **kw: pytest.fail("queried"))
+        monkeypatch.setattr(cli, "get_enrichment_db_connection", lambda: db)
+        monkeypatch.setattr("sys.argv", ["pf2_enrich_abilities", "--llm", "damage"])
+        assert cli.main() == 1
+        assert "not pulled" in capsys.readouterr().out
+        assert _row(db, ability_id)["needs_review"] == 1
+
+
+class TestCompactLlmCache:
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        import sqlite3
+
+        from pfsrd2.enrichment import llm_cache
+
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        llm_cache._ensure_table(conn)
+        monkeypatch.setattr(llm_cache, "_conn", conn)
+        return llm_cache
+
+    def test_only_answers_for_current_prompts_are_kept(self, db, cache, capsys):
+        from pfsrd2.enrichment.llm_extractor import category_prompt, extraction_prompt
+
+        cli = load_cli()
+        _flagged_record(db, "takes 4d6 fire damage", "unextracted: damage(1)")
+        live = [
+            extraction_prompt("damage", "Test Ability", "takes 4d6 fire damage"),
+            category_prompt("Test Ability", "takes 4d6 fire damage"),
+        ]
+        stale = extraction_prompt("damage", "Test Ability", "an older wording")
+        for prompt in [*live, stale]:
+            cache.cache_put(cache.compute_prompt_hash(prompt), "m", "answer")
+
+        cli.run_compact_llm_cache(db, Args(dry_run=True))
+        assert "Would drop 1 LLM cache entries; 3 kept" in capsys.readouterr().out
+        cli.run_compact_llm_cache(db, Args(confirm_compact=True))
+        assert "Dropped 1 LLM cache entries; 2 kept" in capsys.readouterr().out
+        assert cache.cache_get(cache.compute_prompt_hash(stale), "m") is None
+
+    def test_an_empty_enrichment_db_is_refused(self, db, cache, capsys):
+        cli = load_cli()
+        cache.cache_put("h", "m", "answer")
+        cli.run_compact_llm_cache(db, Args(confirm_compact=True))
+        assert "refusing" in capsys.readouterr().out
+        assert cache.cache_stats()["total"] == 1
+
+    def test_the_first_compaction_needs_a_confirm(self, db, cache, capsys):
+        cli = load_cli()
+        _flagged_record(db, "takes 4d6 fire damage", "unextracted: damage(1)")
+        cache.cache_put("stale", "m", "answer")
+        cli.run_compact_llm_cache(db, Args())
+        assert "--confirm-compact" in capsys.readouterr().out
+        assert cache.cache_stats()["total"] == 1
+
+    def test_a_partly_rebuilt_db_is_refused(self, db, cache, capsys):
+        from pfsrd2.sql.enrichment.queries import insert_ability_record
+
+        cli = load_cli()
+        _flagged_record(db, "takes 4d6 fire damage", "unextracted: damage(1)")
+        insert_ability_record(db.cursor(), "Bite", "hash-2", json.dumps({"name": "Bite"}))
+        cli.run_compact_llm_cache(db, Args(confirm_compact=True))
+        assert cache.get_meta("compacted_records") == "2"
+
+        db.execute("DELETE FROM ability_records WHERE name = 'Bite'")
+        cache.cache_put("bite's answer", "m", "answer")
+        cli.run_compact_llm_cache(db, Args())
+        assert "fewer than the 2" in capsys.readouterr().out
+        assert cache.cache_stats()["total"] == 1
+        cli.run_compact_llm_cache(db, Args(dry_run=True))
+        assert "Would drop 1" in capsys.readouterr().out
+
+    def test_a_full_db_compacts_without_a_confirm(self, db, cache, capsys):
+        cli = load_cli()
+        _flagged_record(db, "takes 4d6 fire damage", "unextracted: damage(1)")
+        cache.set_meta("compacted_records", "1")
+        cache.cache_put("stale", "m", "answer")
+        cli.run_compact_llm_cache(db, Args())
+        assert "Dropped 1 LLM cache entries; 0 kept" in capsys.readouterr().out
+
+
+class TestRegexResultsOutliveTheDb:
+    def test_a_rebuilt_db_is_enriched_from_the_extractor_cache(self, monkeypatch):
+        from pfsrd2.enrichment import regex_extractor
+        from pfsrd2.sql.enrichment import get_enrichment_db_connection
+        from pfsrd2.sql.enrichment.queries import insert_ability_record
+
+        cli = load_cli()
+        calls = []
+        real = regex_extractor.extract_all
+        monkeypatch.setattr(
+            regex_extractor, "extract_all", lambda raw: calls.append(raw) or real(raw)
+        )
+        raw = json.dumps({"name": "Spit", "text": "It spits, dealing 2d6 acid damage."})
+        enriched = []
+        for _rebuild in range(2):
+            conn = get_enrichment_db_connection(":memory:")
+            ability_id = insert_ability_record(conn.cursor(), "Spit", "h", raw)
+            conn.commit()
+            cli.run_regex(conn, Args())
+            enriched.append(_row(conn, ability_id)["enriched_json"])
+            conn.close()
+        assert len(calls) == 1
+        assert enriched[0] == enriched[1]
+        assert json.loads(enriched[1])["damage"][0]["formula"] == "2d6"
+
+
+class TestOnlyOutdatedFieldsAreRecomputed:
+    TEXT = "It spits, dealing 2d6 acid damage in a 15-foot line (DC 20 basic Reflex save)."
+
+    def _enriched(self, conn, **stored):
+        """A record enriched by run_regex, then given `stored` field values."""
+        from pfsrd2.sql.enrichment.queries import insert_ability_record
+
+        cli = load_cli()
+        raw = json.dumps({"name": "Spit", "text": self.TEXT})
+        ability_id = insert_ability_record(conn.cursor(), "Spit", "h", raw)
+        conn.commit()
+        cli.run_regex(conn, Args())
+        row = _row(conn, ability_id)
+        enriched = {**json.loads(row["enriched_json"]), **stored}
+        conn.execute(
+            "UPDATE ability_records SET enriched_json = ? WHERE ability_id = ?",
+            (json.dumps(enriched), ability_id),
+        )
+        conn.commit()
+        return cli, ability_id
+
+    def test_a_bumped_extractor_recomputes_its_field_alone(self, db, monkeypatch, capsys):
+        from pfsrd2.enrichment import regex_extractor
+
+        cli, ability_id = self._enriched(
+            db, damage=[{"formula": "9d9"}], area=[{"text": "stored area"}]
+        )
+        monkeypatch.setitem(regex_extractor.EXTRACTOR_VERSIONS, "damage", 2)
+        cli.run_regex(db, Args())
+        row = _row(db, ability_id)
+        enriched = json.loads(row["enriched_json"])
+        assert enriched["damage"][0]["formula"] == "2d6"
+        assert enriched["area"] == [{"text": "stored area"}]
+        assert json.loads(row["field_versions"])["damage"] == 2
+        assert "1 records with outdated extractors (damage)" in capsys.readouterr().out
+
+    def test_current_records_are_not_touched(self, db, monkeypatch):
+        cli, ability_id = self._enriched(db, damage=[{"formula": "9d9"}])
+        cli.run_regex(db, Args())
+        assert json.loads(_row(db, ability_id)["enriched_json"])["damage"] == [{"formula": "9d9"}]
+
+    def test_llm_derived_and_human_verified_fields_stay(self, db, monkeypatch):
+        from pfsrd2.enrichment import regex_extractor
+        from pfsrd2.sql.enrichment import mark_human_verified
+
+        cli, llm_id = self._enriched(db, damage=[{"formula": "9d9"}])
+        db.execute(
+            "UPDATE ability_records SET field_versions = json_set(field_versions,"
+            " '$.damage', 'llm') WHERE ability_id = ?",
+            (llm_id,),
+        )
+        db.commit()
+        monkeypatch.setitem(regex_extractor.EXTRACTOR_VERSIONS, "damage", 2)
+        cli.run_regex(db, Args())
+        assert json.loads(_row(db, llm_id)["enriched_json"])["damage"] == [{"formula": "9d9"}]
+
+        monkeypatch.setitem(regex_extractor.EXTRACTOR_VERSIONS, "area", 2)
+        mark_human_verified(db.cursor(), llm_id)
+        db.commit()
+        before = _row(db, llm_id)["enriched_json"]
+        cli.run_regex(db, Args())
+        assert _row(db, llm_id)["enriched_json"] == before
+
+    def test_an_llm_answer_is_recorded_as_llm_derived(self, db, monkeypatch):
+        cli, ability_id = self._enriched(db)
+        db.execute(
+            "UPDATE ability_records SET needs_review = 1,"
+            " review_reason = 'unextracted: frequency(1)' WHERE ability_id = ?",
+            (ability_id,),
+        )
+        db.commit()
+        monkeypatch.setattr(cli, "extract_frequency_llm", lambda name, text, model=None: "daily")
+        monkeypatch.setattr(cli, "reject_if_ungrounded", lambda *a, **kw: False)
+        cli.run_llm(db, Args(llm_type="frequency"))
+        row = _row(db, ability_id)
+        assert json.loads(row["enriched_json"])["frequency"] == "daily"
+        assert json.loads(row["field_versions"])["frequency"] == "llm"
+
+
+class TestWorkersOption:
+    def _parse(self, monkeypatch, *argv):
+        cli = load_cli()
+        seen = []
+        monkeypatch.setattr(cli, "get_enrichment_db_connection", lambda: _NoDb())
+        monkeypatch.setattr(cli, "_run", lambda conn, args: seen.append(args))
+        monkeypatch.setattr("sys.argv", ["pf2_enrich_abilities", *argv])
+        cli.main()
+        return seen[0]
+
+    def test_the_environment_sets_the_default(self, monkeypatch):
+        monkeypatch.setenv("PF2_LLM_WORKERS", "6")
+        assert self._parse(monkeypatch, "--stats").llm_workers == 6
+
+    def test_the_command_line_wins_over_a_bad_environment_value(self, monkeypatch):
+        monkeypatch.setenv("PF2_LLM_WORKERS", "four")
+        assert self._parse(monkeypatch, "--stats", "--llm-workers", "2").llm_workers == 2
+
+    def test_a_bad_environment_value_is_a_usage_error(self, monkeypatch, capsys):
+        monkeypatch.setenv("PF2_LLM_WORKERS", "four")
+        with pytest.raises(SystemExit) as info:
+            self._parse(monkeypatch, "--stats")
+        assert info.value.code == 2
+        assert "invalid int value: 'four'" in capsys.readouterr().err
+
+
+class _NoDb:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
@@ -11,6 +11,7 @@ from pfsrd2.sql.enrichment import (
     _create_db_v_4,
     _create_db_v_5,
     _create_db_v_6,
+    _create_db_v_7,
     get_enrichment_db_connection,
 )
 
@@ -23,10 +24,10 @@ def fresh_conn():
 
 
 class TestFullMigrationChain:
-    def test_fresh_db_ends_at_v6(self, fresh_conn):
+    def test_fresh_db_ends_at_v7(self, fresh_conn):
         curs = fresh_conn.cursor()
         curs.execute("SELECT MAX(version) AS v FROM enrichment_db_version")
-        assert curs.fetchone()["v"] == 6
+        assert curs.fetchone()["v"] == 7
 
     def test_creature_types_table_exists_and_is_nocase(self, fresh_conn):
         curs = fresh_conn.cursor()
@@ -67,3 +68,21 @@ class TestMigrationIdempotency:
         again = _create_db_v_6(conn, curs, ver)
         assert again == 6
         conn.close()
+
+    def test_v7_adds_field_versions_to_an_existing_db(self):
+        conn = self._raw_conn()
+        curs = conn.cursor()
+        ver = _create_db_v_1(conn, curs)
+        for fn in (_create_db_v_2, _create_db_v_3, _create_db_v_4, _create_db_v_5, _create_db_v_6):
+            ver = fn(conn, curs, ver)
+        curs.execute(
+            "INSERT INTO ability_records (name, identity_hash, raw_json, created_at, updated_at)"
+            " VALUES ('Grab', 'h', '{}', 'now', 'now')"
+        )
+        ver = _create_db_v_7(conn, curs, ver)
+        assert ver == 7
+        assert _create_db_v_7(conn, curs, ver) == 7
+        # Records enriched before v7 have no per-field versions
+        curs.execute("SELECT field_versions FROM ability_records")
+        assert curs.fetchone()[0] is None
+        conn.close()
@@ -0,0 +1,146 @@
+"""Tests for pfsrd2/enrichment/extractor_cache.py.
+
+conftest gives every test an empty in-memory cache.
+"""
+
+import json
+
+import pytest
+
+from pfsrd2.enrichment import change_extractor, extractor_cache, regex_extractor
+
+DRAGON = json.dumps(
+    {
+        "name": "Breath Weapon",
+        "text": "The dragon breathes a 30-foot cone that deals 6d6 fire damage "
+        "(DC 25 basic Reflex save). Frequency once per day; its smoke fills 15-foot",
+    },
+    sort_keys=True,
+)
+CHANGE = json.dumps({"text": "Increase the creature's AC by 2."})
+
+
+class _Counting:
+    """Wraps an extractor and counts the calls that reach it."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.fn(*args)
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    extract = _Counting(regex_extractor.extract_all)
+    enrich = _Counting(change_extractor.enrich_change)
+    monkeypatch.setattr(regex_extractor, "extract_all", extract)
+    monkeypatch.setattr(change_extractor, "enrich_change", enrich)
+    return extract, enrich
+
+
+class TestCacheGetPut:
+    def test_miss_returns_none(self):
+        assert extractor_cache.cache_get("h", "extract_all", 1) is None
+
+    def test_put_then_get(self):
+        extractor_cache.cache_put("h", "extract_all", 1, [None, {}])
+        assert extractor_cache.cache_get("h", "extract_all", 1) == [None, {}]
+
+    def test_the_version_is_part_of_the_key(self):
+        extractor_cache.cache_put("h", "extract_all", 1, [None, {}])
+        assert extractor_cache.cache_get("h", "extract_all", 2) is None
+        assert extractor_cache.cache_get("h", "enrich_change", 1) is None
+
+    def test_puts_are_committed_in_batches(self, scratch_extractor_cache, monkeypatch):
+        monkeypatch.setattr(extractor_cache, "COMMIT_EVERY", 3)
+        for i in range(2):
+            extractor_cache.cache_put(f"h{i}", "extract_all", 1, [None, {}])
+        assert scratch_extractor_cache.in_transaction
+        extractor_cache.cache_put("h2", "extract_all", 1, [None, {}])
+        assert not scratch_extractor_cache.in_transaction
+        extractor_cache.cache_put("h3", "extract_all", 1, [None, {}])
+        extractor_cache.cache_flush()
+        assert not scratch_extractor_cache.in_transaction
+
+    def test_stats(self):
+        extractor_cache.cache_put("h", "extract_all", 1, [None, {}])
+        extractor_cache.cache_get("h", "extract_all", 1)
+        extractor_cache.cache_get("other", "extract_all", 1)
+        stats = extractor_cache.cache_stats()
+        assert stats["entries"] == {"extract_all": 1}
+        assert (stats["hits"], stats["misses"]) >= (1, 1)
+
+
+class TestCachedExtractAll:
+    def test_a_second_call_is_a_lookup_with_the_same_result(self, counted):
+        extract, _ = counted
+        first = extractor_cache.extract_all(DRAGON)
+        second = extractor_cache.extract_all(DRAGON)
+        assert extract.calls == 1
+        assert second == first
+        # missed keeps its (detected, extracted) tuples through JSON
+        assert first[1] and all(isinstance(v, tuple) for v in second[1].values())
+
+    def test_nothing_extracted_is_cached_too(self, counted):
+        extract, _ = counted
+        raw = json.dumps({"name": "Plain", "text": "It is very tall."})
+        assert extractor_cache.extract_all(raw) == (None, {})
+        assert extractor_cache.extract_all(raw) == (None, {})
+        assert extract.calls == 1
+
+    def test_a_version_bump_recomputes(self, counted, monkeypatch):
+        extract, _ = counted
+        extractor_cache.extract_all(DRAGON)
+        monkeypatch.setattr(regex_extractor, "ENRICHMENT_VERSION", 999)
+        extractor_cache.extract_all(DRAGON)
+        assert extract.calls == 2
+
+    def test_a_field_version_bump_recomputes(self, counted, monkeypatch):
+        extract, _ = counted
+        extractor_cache.extract_all(DRAGON)
+        bumped = {**regex_extractor.EXTRACTOR_VERSIONS, "damage": 99}
+        monkeypatch.setattr(regex_extractor, "EXTRACTOR_VERSIONS", bumped)
+        extractor_cache.extract_all(DRAGON)
+        assert extract.calls == 2
+
+    def test_any_raw_json_change_recomputes(self, counted):
+        # Keyed on the whole raw_json, not the identity hash: the result
+        # embeds the ability, links and all.
+        extract, _ = counted
+        extractor_cache.extract_all(DRAGON)
+        linked = json.loads(DRAGON)
+        linked["links"] = [{"name": "fire"}]
+        result, _ = extractor_cache.extract_all(json.dumps(linked))
+        assert extract.calls == 2
+        assert result["links"] == [{"name": "fire"}]
+
+
+class TestCachedEnrichChange:
+    def test_a_second_call_is_a_lookup(self, counted):
+        _, enrich = counted
+        first = extractor_cache.enrich_change(CHANGE, "Elite")
+        assert first[0] is not None
+        assert extractor_cache.enrich_change(CHANGE, "Elite") == first
+        assert enrich.calls == 1
+
+    def test_the_source_name_is_part_of_the_key(self, counted):
+        _, enrich = counted
+        extractor_cache.enrich_change(CHANGE, "Elite")
+        extractor_cache.enrich_change(CHANGE, "Weak")
+        assert enrich.calls == 2
+
+    def test_a_trait_lookup_error_is_not_cached(self, monkeypatch):
+        calls = []
+
+        def failing(raw_json, source_name):
+            calls.append(source_name)
+            raise change_extractor.TraitLookupError("Revulsion")
+
+        monkeypatch.setattr(change_extractor, "enrich_change", failing)
+        for _ in range(2):
+            with pytest.raises(change_extractor.TraitLookupError):
+                extractor_cache.enrich_change(CHANGE, "Vampire")
+        assert len(calls) == 2
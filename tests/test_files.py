@@ -0,0 +1,223 @@
+"""Tests for universal/files.py — writing and naming output JSON."""
+
+import glob
+import io
+import itertools
+import json
+import os
+
+import pytest
+
+from universal import files
+from universal.files import (
+    NameAllocator,
+    commit_names,
+    disambiguated_filename,
+    pretty_json,
+    reset_write_counts,
+    set_name_allocation,
+    write_counts,
+    write_json,
+)
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _corpus():
+    """Every JSON document in the repository: schemas, fixtures, caches."""
+    docs = []
+    for path in sorted(glob.glob(os.path.join(REPO, "**", "*.json"), recursive=True)):
+        with open(path) as fp:
+            docs.append(pytest.param(json.load(fp), id=os.path.relpath(path, REPO)))
+    return docs
+
+
+EDGE_CASES = [
+    {},
+    [],
+    "",
+    0,
+    None,
+    {"a": {}, "b": [], "c": [[]], "d": [{}]},
+    {"nested": {"deeper": {"deepest": [1, [2, [3]]]}}},
+    {"floats": [1.5, -0.0, 1e100, float("inf"), float("nan")], "flags": [True, False, None]},
+    {"text": 'é ’ — "quoted" \\ back\nslash\t\u0001 \U0001f600'},
+    {"b": 1, "a": 2, "A": 3, "_": 4, "é": 5},
+    {10: "int key", 2: "sorted as ints", 2.5: "float key"},
+    {"tuple": (1, (2, 3), {"x": (4,)})},
+    [{"type": "stat_block_section", "subtype": "attack", "bonus": {"bonuses": [18, 14, 10]}}],
+]
+
+
+@pytest.fixture(params=["c", "hybrid"])
+def layout(request, monkeypatch):
+    # "hybrid" is the path taken where the C encoder ignores indent.
+    if request.param == "hybrid":
+        monkeypatch.setattr(files, "_c_pretty", None)
+    return request.param
+
+
+class TestPrettyJson:
+    @pytest.mark.parametrize("struct", EDGE_CASES)
+    def test_edge_cases_match_json_dump(self, layout, struct):
+        expected = io.StringIO()
+        json.dump(struct, expected, indent=2, sort_keys=True)
+        assert pretty_json(struct) == expected.getvalue()
+
+    @pytest.mark.parametrize("struct", _corpus())
+    def test_repository_json_round_trips_byte_identical(self, layout, struct):
+        assert pretty_json(struct) == json.dumps(struct, indent=2, sort_keys=True)
+
+    def test_unserializable_value_raises_type_error(self, layout):
+        with pytest.raises(TypeError, match="not JSON serializable"):
+            pretty_json({"a": [object()]})
+
+    def test_mixed_key_types_raise_like_json(self, layout):
+        with pytest.raises(TypeError):
+            pretty_json({"a": 1, 2: 3})
+
+
+class TestWriteJson:
+    def test_writes_what_json_dump_wrote(self, tmp_path):
+        struct = EDGE_CASES[-1]
+        write_json(tmp_path / "out.json", struct)
+        expected = io.StringIO()
+        json.dump(struct, expected, indent=2, sort_keys=True)
+        assert (tmp_path / "out.json").read_text() == expected.getvalue()
+
+    def test_unchanged_file_is_not_rewritten(self, tmp_path):
+        path = tmp_path / "out.json"
+        assert write_json(path, {"a": 1}) is True
+        os.utime(path, (0, 0))
+        reset_write_counts()
+        assert write_json(path, {"a": 1}) is False
+        assert os.stat(path).st_mtime == 0
+        assert write_counts() == {"written": 0, "unchanged": 1, "removed": 0}
+
+    def test_changed_file_is_replaced(self, tmp_path):
+        path = tmp_path / "out.json"
+        write_json(path, {"a": 1})
+        reset_write_counts()
+        assert write_json(path, {"a": 2}) is True
+        assert json.loads(path.read_text()) == {"a": 2}
+        assert write_counts()["written"] == 1
+        assert os.listdir(tmp_path) == ["out.json"]
+
+    def test_failed_write_keeps_the_old_file(self, tmp_path):
+        path = tmp_path / "out.json"
+        write_json(path, {"a": 1})
+        with pytest.raises(TypeError):
+            write_json(path, {"a": object()})
+        assert json.loads(path.read_text()) == {"a": 1}
+
+    def test_interrupted_replace_leaves_no_temp_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "out.json"
+        write_json(path, {"a": 1})
+
+        def _killed(src, dst):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(os, "replace", _killed)
+        with pytest.raises(KeyboardInterrupt):
+            write_json(path, {"a": 2})
+        assert os.listdir(tmp_path) == ["out.json"]
+        assert json.loads(path.read_text()) == {"a": 1}
+
+    def test_file_mode_follows_umask(self, tmp_path):
+        path = tmp_path / "out.json"
+        write_json(path, {})
+        with open(tmp_path / "plain.json", "w"):
+            pass
+        assert os.stat(path).st_mode == os.stat(tmp_path / "plain.json").st_mode
+
+    def test_disambiguation_counts_the_moved_file(self, tmp_path):
+        write_json(tmp_path / "glyph.json", {"name": "Glyph", "aonid": 1})
+        reset_write_counts()
+        path = disambiguated_filename(str(tmp_path), {"name": "Glyph", "aonid": 2}, "hazard")
+        assert path.endswith("glyph_2.json")
+        assert write_counts()["removed"] == 1
+
+
+GLYPHS = [
+    {"name": "Glyph of Warding", "aonid": 263, "game-id": "a"},
+    {"name": "Glyph of Warding", "aonid": 266, "game-id": "b"},
+    {"name": "Glyph of Warding", "aonid": 300, "game-id": "a"},
+    {"name": "Glyph of Warding Trap", "aonid": 12, "game-id": "c"},
+    {"name": "Hidden Pit", "aonid": 5, "game-id": "d"},
+]
+
+
+@pytest.fixture
+def allocation(monkeypatch):
+    monkeypatch.setattr(files, "_allocators", {})
+    set_name_allocation(True)
+    yield
+    set_name_allocation(False)
+
+
+def _batch(directory, structs):
+    for struct in structs:
+        write_json(disambiguated_filename(str(directory), struct, "hazard"), struct)
+    commit_names()
+    return {
+        name: json.loads((directory / name).read_text())["aonid"]
+        for name in sorted(os.listdir(directory))
+    }
+
+
+class TestNameAllocator:
+    def test_matches_disambiguated_filename_in_every_order(self, tmp_path, allocation):
+        for i, order in enumerate(itertools.permutations(GLYPHS[:3] + GLYPHS[4:])):
+            set_name_allocation(False)
+            (tmp_path / f"disk{i}").mkdir()
+            expected = _batch(tmp_path / f"disk{i}", order)
+            set_name_allocation(True)
+            (tmp_path / f"memory{i}").mkdir()
+            assert _batch(tmp_path / f"memory{i}", order) == expected
+
+    def test_a_collision_suffixes_everyone_whatever_the_order(self, tmp_path, allocation):
+        layouts = set()
+        for i, order in enumerate(itertools.permutations(GLYPHS[:2] + GLYPHS[3:4])):
+            (tmp_path / str(i)).mkdir()
+            layouts.add(tuple(_batch(tmp_path / str(i), order)))
+        assert layouts == {
+            (
+                "glyph_of_warding_263.json",
+                "glyph_of_warding_266.json",
+                "glyph_of_warding_trap.json",
+            )
+        }
+
+    def test_squatters_move_at_commit(self, tmp_path, allocation):
+        write_json(tmp_path / "glyph_of_warding.json", GLYPHS[0])
+        path = disambiguated_filename(str(tmp_path), GLYPHS[1], "hazard")
+        assert path.endswith("glyph_of_warding_266.json")
+        assert os.path.exists(tmp_path / "glyph_of_warding.json")
+        commit_names()
+        assert sorted(os.listdir(tmp_path)) == ["glyph_of_warding_263.json"]
+
+    def test_a_squatter_rewritten_in_the_batch_keeps_the_new_content(self, tmp_path, allocation):
+        write_json(tmp_path / "glyph_of_warding.json", {**GLYPHS[0], "level": 1})
+        assert _batch(tmp_path, [GLYPHS[1], GLYPHS[0]]) == {
+            "glyph_of_warding_263.json": 263,
+            "glyph_of_warding_266.json": 266,
+        }
+        assert "level" not in json.loads((tmp_path / "glyph_of_warding_263.json").read_text())
+
+    def test_the_directory_is_read_once(self, tmp_path, allocation, monkeypatch):
+        write_json(tmp_path / "hidden_pit.json", GLYPHS[4])
+        disambiguated_filename(str(tmp_path), GLYPHS[0], "hazard")
+        monkeypatch.setattr(glob, "glob", None)
+        assert disambiguated_filename(str(tmp_path), GLYPHS[4], "hazard").endswith(
+            "hidden_pit.json"
+        )
+
+    def test_unreadable_files_fail_only_the_name_they_hold(self, tmp_path):
+        (tmp_path / "hidden_pit.json").write_text("not json")
+        (tmp_path / "glyph_of_warding.json").write_text("{}")
+        allocator = NameAllocator(str(tmp_path), "hazard")
+        assert allocator.allocate(GLYPHS[3]).endswith("glyph_of_warding_trap.json")
+        with pytest.raises(ValueError, match="not readable JSON"):
+            allocator.allocate(GLYPHS[4])
+        with pytest.raises(AssertionError, match="has no aonid"):
+            allocator.allocate(GLYPHS[0])
@@ -0,0 +1,173 @@
+"""Tests for pfsrd2/license.py license assembly and consolidation."""
+
+import json
+import os
+
+import jsonschema
+import pytest
+
+from pfsrd2 import license as license_module
+from pfsrd2.license import (
+    get_ogl_license,
+    get_orc_license,
+    license_consolidation_pass,
+    license_pass,
+    set_license_refs,
+)
+from pfsrd2.schema import get_schema
+from universal.files import write_json
+
+OGL = {
+    "name": "OPEN GAME LICENSE Version 1.0a",
+    "type": "section",
+    "text": "<p>The following text is the property of Wizards of the Coast.</p>",
+    "sections": [
+        {"name": "Core Rulebook", "type": "section", "text": "<b>Core</b> © 2019"},
+        {"name": "Bestiary", "type": "section", "text": "<b>Bestiary</b> © 2019"},
+        {"name": "GM Core", "type": "section", "text": "<b>GM Core</b> © 2023"},
+    ],
+}
+
+
+def _clear_memos():
+    license_module._load_ogl.cache_clear()
+    license_module._built_license.cache_clear()
+    license_module._ogl_section_names.cache_clear()
+
+
+@pytest.fixture
+def ogl_file(tmp_path, monkeypatch):
+    path = tmp_path / "open_game_license_version_10a.json"
+    path.write_text(json.dumps(OGL))
+    monkeypatch.setattr(license_module, "get_db_path", lambda name: str(tmp_path / name))
+    _clear_memos()
+    yield path
+    _clear_memos()
+
+
+class TestLicenseAssembly:
+    def test_ogl_keeps_only_the_documents_sources_in_order(self, ogl_file):
+        lic = get_ogl_license([{"name": "GM Core"}, {"name": "Core Rulebook"}])
+        assert [s["name"] for s in lic["sections"]] == ["GM Core", "Core Rulebook"]
+        assert lic["subtype"] == "license"
+        assert lic["license"] == OGL["name"]
+
+    def test_orc_fills_the_attribution_section(self, ogl_file):
+        lic = get_orc_license([{"name": "Bestiary"}])
+        assert lic["name"] == "ORC Notice"
+        assert [s["name"] for s in lic["sections"][0]["sections"]] == ["Bestiary"]
+
+    def test_file_is_read_once(self, ogl_file):
+        get_ogl_license([{"name": "Bestiary"}])
+        ogl_file.unlink()
+        lic = get_ogl_license([{"name": "GM Core"}])
+        assert [s["name"] for s in lic["sections"]] == ["GM Core"]
+
+    def test_memo_hit_per_source_set(self, ogl_file):
+        get_ogl_license([{"name": "Bestiary", "page": 10}])
+        get_ogl_license([{"name": "Bestiary", "page": 99}])
+        info = license_module._built_license.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_callers_cannot_reach_the_memo(self, ogl_file):
+        first = get_orc_license([{"name": "Bestiary"}])
+        first["sections"][0]["sections"][0]["text"] = "rewritten by markdown_pass"
+        first["sections"].append({"name": "appended by consolidation"})
+        second = get_orc_license([{"name": "Bestiary"}])
+        assert second["sections"][0]["sections"][0]["text"] == "<b>Bestiary</b> © 2019"
+        assert "appended by consolidation" not in [s["name"] for s in second["sections"]]
+
+    def test_orc_constant_is_left_alone(self, ogl_file):
+        from pfsrd2.constants import ORC_LICENSE
+
+        get_orc_license([{"name": "Bestiary"}])
+        assert ORC_LICENSE["sections"][0]["sections"] == []
+
+    def test_unknown_source_warns_on_every_document(self, ogl_file, capsys):
+        get_ogl_license([{"name": "Nowhere"}])
+        get_ogl_license([{"name": "Nowhere"}])
+        out = capsys.readouterr().out
+        assert out.count("Warning: Source not found in license: Nowhere") == 2
+        assert out.count("Could not find source in license: Nowhere") == 2
+
+
+class TestLicenseConsolidation:
+    def test_nested_sections_merge_once(self, ogl_file):
+        struct = {
+            "edition": "legacy",
+            "sources": [{"name": "Core Rulebook"}],
+            "traits": [
+                {"name": "fire", "license": get_ogl_license([{"name": "Core Rulebook"}])},
+                {"name": "cold", "license": get_ogl_license([{"name": "Bestiary"}])},
+                {"name": "acid", "license": get_ogl_license([{"name": "Bestiary"}])},
+            ],
+        }
+        license_pass(struct)
+        license_consolidation_pass(struct)
+        names = [s["name"] for s in struct["license"]["sections"]]
+        assert names == ["Core Rulebook", "Bestiary"]
+        assert all("license" not in t for t in struct["traits"])
+
+    def test_repeats_inside_one_nested_license_are_kept(self):
+        # The name list used to be rebuilt per nested license, so a name a
+        # single license repeats was appended each time. Preserved.
+        struct = {
+            "license": {"sections": [{"name": "A"}]},
+            "inner": {"license": {"sections": [{"name": "B"}, {"name": "B"}, {"name": "A"}]}},
+            "other": {"license": {"sections": [{"name": "B"}]}},
+        }
+        license_consolidation_pass(struct)
+        assert [s["name"] for s in struct["license"]["sections"]] == ["A", "B", "B"]
+
+
+@pytest.fixture
+def license_refs(tmp_path):
+    set_license_refs(str(tmp_path))
+    yield tmp_path
+    set_license_refs(None)
+
+
+def _doc(name, source):
+    struct = {"name": name, "sources": [{"name": source}]}
+    license_pass(struct)
+    return struct
+
+
+class TestLicenseRefs:
+    def test_documents_point_at_one_shared_license(self, ogl_file, license_refs):
+        for name in ("goblin", "orc"):
+            write_json(license_refs / f"{name}.json", _doc(name, "Bestiary"))
+        goblin = json.loads((license_refs / "goblin.json").read_text())
+        orc = json.loads((license_refs / "orc.json").read_text())
+        assert goblin["license"] == orc["license"]
+        ref = goblin["license"]
+        assert ref["type"] == "license_ref"
+        assert ref["license"] == OGL["name"]
+        assert os.listdir(license_refs / "licenses") == [ref["id"] + ".json"]
+        stored = json.loads((license_refs / "licenses" / (ref["id"] + ".json")).read_text())
+        assert [s["name"] for s in stored["sections"]] == ["Bestiary"]
+
+    def test_different_licenses_get_different_ids(self, ogl_file, license_refs):
+        write_json(license_refs / "a.json", _doc("a", "Bestiary"))
+        write_json(license_refs / "b.json", _doc("b", "GM Core"))
+        assert len(os.listdir(license_refs / "licenses")) == 2
+
+    def test_the_validated_document_is_left_alone(self, ogl_file, license_refs):
+        struct = _doc("goblin", "Bestiary")
+        write_json(license_refs / "goblin.json", struct)
+        assert struct["license"]["type"] == "section"
+
+    @pytest.mark.parametrize("schema_name", ["creature.schema.json", "spell.schema.json"])
+    def test_schemas_accept_either_form(self, ogl_file, license_refs, schema_name):
+        schema = get_schema(schema_name)
+        struct = _doc("goblin", "Bestiary")
+        write_json(license_refs / "goblin.json", struct)
+        ref = json.loads((license_refs / "goblin.json").read_text())["license"]
+        license_schema = schema["properties"]["license"]
+        for value in (struct["license"], ref):
+            jsonschema.validate(value, {**license_schema, "definitions": schema["definitions"]})
+        with pytest.raises(jsonschema.ValidationError):
+            jsonschema.validate(
+                {**ref, "id": "not-a-hash"},
+                {**license_schema, "definitions": schema["definitions"]},
+            )
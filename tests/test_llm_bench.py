@@ -0,0 +1,73 @@
+"""Tests for pfsrd2/qa/llm_bench.py — the LLM throughput benchmark."""
+
+import json
+
+from pfsrd2.enrichment import llm_cache, llm_extractor
+from pfsrd2.qa import llm_bench
+from pfsrd2.qa.llm_bench import benchmark, canned_answer, synthetic_records
+from pfsrd2.sql.enrichment import get_enrichment_db_connection
+
+TEXT = (
+    "Frequency once per day. The drake releases a 30-foot emanation; creatures take "
+    "4d6 sonic damage (DC 25 basic Fortitude save)."
+)
+
+
+class TestCannedAnswers:
+    def test_single_prompts_are_answered_from_the_text(self):
+        assert canned_answer(llm_extractor.extraction_prompt("damage", "A", TEXT)) == "4d6 sonic"
+        assert canned_answer(llm_extractor.extraction_prompt("dc", "A", TEXT)) == (
+            "DC 25 basic Fortitude"
+        )
+        assert canned_answer(llm_extractor.extraction_prompt("area", "A", TEXT)) == (
+            "30-foot emanation"
+        )
+        assert canned_answer(llm_extractor.extraction_prompt("frequency", "A", "x")) == "none"
+        assert canned_answer(llm_extractor.category_prompt("A", TEXT)) == "offensive"
+
+    def test_batched_prompts_get_numbered_answers(self):
+        template = llm_extractor._EXTRACTIONS["damage"][0]
+        prompt = llm_extractor._batch_prompt(template, [("A", TEXT), ("B", "no dice")])
+        assert canned_answer(prompt) == "1. 4d6 sonic\n2. none"
+
+
+class TestSyntheticRecords:
+    def test_records_are_flagged_for_every_type_and_some_share_text(self):
+        conn = get_enrichment_db_connection(":memory:")
+        synthetic_records(conn, 50, duplicates=0.5)
+        rows = conn.execute("SELECT raw_json, review_reason FROM ability_records").fetchall()
+        assert len(rows) == 50
+        assert all("damage(1)" in row["review_reason"] for row in rows)
+        assert len({json.loads(row["raw_json"])["text"] for row in rows}) < 50
+
+
+class TestBenchmark:
+    def test_every_pass_runs_against_the_stub(self):
+        results, requests = benchmark(records=20, latency=0, workers=2)
+        assert [row["pass"] for row in results] == list(llm_bench.PASSES)
+        assert requests > 0
+        assert all(row["misses"] > 0 and row["hits"] == 0 for row in results)
+
+    def test_a_warm_run_sends_nothing(self):
+        results, requests = benchmark(records=20, latency=0, passes=["damage"], warm=True)
+        assert requests == 0
+        assert results[0]["hits"] > 0 and results[0]["misses"] == 0
+
+    def test_batching_cuts_the_requests(self):
+        _, single = benchmark(records=20, latency=0, passes=["damage"])
+        _, batched = benchmark(records=20, latency=0, passes=["damage"], batch=8)
+        assert batched < single
+
+    def test_the_process_state_is_restored(self):
+        url, health, conn = llm_extractor.OLLAMA_URL, llm_extractor._health, llm_cache._conn
+        benchmark(records=5, latency=0, passes=["dc"])
+        assert url == llm_extractor.OLLAMA_URL
+        assert llm_extractor._health is health
+        assert llm_cache._conn is conn
+
+
+def test_main_prints_a_table(capsys):
+    assert llm_bench.main(["--records", "10", "--latency", "0", "--passes", "area"]) == 0
+    out = capsys.readouterr().out
+    assert "records/s" in out
+    assert out.splitlines()[-3].startswith("area")
@@ -1,7 +1,10 @@
 """Tests for pfsrd2/enrichment/llm_cache.py using in-memory SQLite."""
 
+import gzip
 import sqlite3
 
+import pytest
+
 import pfsrd2.enrichment.llm_cache as llm_cache
 
 
@@ -82,3 +85,158 @@ class TestCacheStats:
         stats = llm_cache.cache_stats()
         assert stats["total"] == 3
         assert stats["models"] == 2
+
+
+class TestBatchedCommits:
+    def teardown_method(self):
+        llm_cache._conn.close()
+        llm_cache._conn = None
+        llm_cache._pending = 0
+
+    def _file_cache(self, tmp_path):
+        path = str(tmp_path / "llm_cache.db")
+        conn = sqlite3.connect(path, check_same_thread=False)
+        llm_cache._ensure_table(conn)
+        llm_cache._conn = conn
+        llm_cache._pending = 0
+        return path
+
+    def _committed(self, path):
+        with sqlite3.connect(path) as other:
+            return other.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def test_puts_are_committed_in_batches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "COMMIT_EVERY", 3)
+        path = self._file_cache(tmp_path)
+        llm_cache.cache_put("h1", "m", "r1")
+        llm_cache.cache_put("h2", "m", "r2")
+        assert self._committed(path) == 0
+        assert llm_cache.cache_get("h2", "m") == "r2"
+        llm_cache.cache_put("h3", "m", "r3")
+        assert self._committed(path) == 3
+
+    def test_a_slow_trickle_is_committed_on_time(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "COMMIT_SECONDS", 0)
+        path = self._file_cache(tmp_path)
+        llm_cache.cache_put("h1", "m", "r1")
+        assert self._committed(path) == 1
+
+    def test_flush_commits_the_rest(self, tmp_path):
+        path = self._file_cache(tmp_path)
+        llm_cache.cache_put("h1", "m", "r1")
+        llm_cache.cache_flush()
+        assert self._committed(path) == 1
+
+
+class TestBulkLookupAndCounters:
+    def setup_method(self):
+        self.conn = _setup_in_memory()
+
+    def teardown_method(self):
+        llm_cache._conn = None
+
+    def test_one_call_finds_every_cached_hash(self, monkeypatch):
+        monkeypatch.setattr(llm_cache, "_LOOKUP_CHUNK", 2)
+        for i in range(5):
+            llm_cache.cache_put(f"h{i}", "m", f"r{i}")
+        llm_cache.cache_put("h9", "other", "r9")
+        found = llm_cache.cache_get_many(["h0", "h2", "h4", "h5", "h9", "h0"], "m")
+        assert found == {"h0": "r0", "h2": "r2", "h4": "r4"}
+
+    def test_hits_and_misses_are_counted(self):
+        before = llm_cache.cache_counters()
+        llm_cache.cache_put("h1", "m", "r1")
+        llm_cache.cache_get("h1", "m")
+        llm_cache.cache_get("h2", "m")
+        llm_cache.cache_get_many(["h1", "h2", "h3"], "m")
+        stats = llm_cache.cache_stats()
+        assert stats["hits"] - before["hits"] == 2
+        assert stats["misses"] - before["misses"] == 3
+
+
+class TestCompact:
+    def setup_method(self):
+        self.conn = _setup_in_memory()
+        for h in ("live1", "live2", "dead1", "dead2"):
+            llm_cache.cache_put(h, "m", "r")
+        llm_cache.cache_put("live1", "other", "r")
+
+    def teardown_method(self):
+        llm_cache._conn = None
+
+    def _hashes(self):
+        return sorted(self.conn.execute("SELECT prompt_hash, model FROM llm_cache"))
+
+    def test_entries_no_live_prompt_produces_are_dropped(self):
+        assert llm_cache.compact({"live1", "live2", "never-cached"}) == 2
+        assert self._hashes() == [("live1", "m"), ("live1", "other"), ("live2", "m")]
+
+    def test_a_dry_run_only_counts(self):
+        assert llm_cache.compact({"live1", "live2"}, dry_run=True) == 2
+        assert len(self._hashes()) == 5
+        # The scratch table is gone, so a second run works.
+        assert llm_cache.compact({"live1"}) == 3
+
+    def test_meta_values_are_kept_beside_the_entries(self):
+        assert llm_cache.get_meta("compacted_records") is None
+        llm_cache.set_meta("compacted_records", "12")
+        llm_cache.set_meta("compacted_records", "14")
+        assert llm_cache.get_meta("compacted_records") == "14"
+        assert llm_cache.compact({"live1"}) == 3
+
+
+class TestExportImport:
+    def setup_method(self):
+        self.conn = _setup_in_memory()
+
+    def teardown_method(self):
+        llm_cache._conn = None
+
+    def _fill(self):
+        llm_cache.cache_put("h2", "modelB", "r2")
+        llm_cache.cache_put("h1", "modelA", "réponse")
+        llm_cache.cache_put("h3", "modelA", None)
+
+    def test_the_export_is_deterministic(self, tmp_path):
+        self._fill()
+        first, second = tmp_path / "a.jsonl.gz", tmp_path / "b.jsonl.gz"
+        assert llm_cache.export_cache(first) == 3
+        # Same entries, different insertion order and timestamps.
+        llm_cache._conn = None
+        self.conn = _setup_in_memory()
+        llm_cache.cache_put("h3", "modelA", None)
+        llm_cache.cache_put("h1", "modelA", "réponse")
+        llm_cache.cache_put("h2", "modelB", "r2")
+        llm_cache.export_cache(second)
+        assert first.read_bytes() == second.read_bytes()
+
+    def test_a_round_trip_restores_every_entry(self, tmp_path):
+        self._fill()
+        path = tmp_path / "cache.jsonl.gz"
+        llm_cache.export_cache(path)
+        self.conn = _setup_in_memory()
+        assert llm_cache.import_cache(path) == {"read": 3, "added": 3, "differing": 0}
+        assert llm_cache.cache_get("h1", "modelA") == "réponse"
+        assert llm_cache.cache_get("h2", "modelB") == "r2"
+        assert llm_cache.cache_stats()["total"] == 3
+
+    def test_an_export_can_be_one_model(self, tmp_path):
+        self._fill()
+        path = tmp_path / "cache.jsonl.gz"
+        assert llm_cache.export_cache(path, model="modelB") == 1
+
+    def test_an_import_keeps_what_is_already_cached(self, tmp_path):
+        self._fill()
+        path = tmp_path / "cache.jsonl.gz"
+        llm_cache.export_cache(path)
+        self.conn = _setup_in_memory()
+        llm_cache.cache_put("h2", "modelB", "local answer")
+        assert llm_cache.import_cache(path) == {"read": 3, "added": 2, "differing": 1}
+        assert llm_cache.cache_get("h2", "modelB") == "local answer"
+
+    def test_a_file_that_is_not_an_export_is_refused(self, tmp_path):
+        path = tmp_path / "other.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"model": "m", "prompt_hash": "h", "response": "r"}\n')
+        with pytest.raises(ValueError, match="not an LLM cache export"):
+            llm_cache.import_cache(path)
@@ -13,10 +13,18 @@ These tests are designed to validate model upgrades — if you switch
 models, run these to confirm the new model handles the same cases.
 """
 
+import json
+import socket
+import sqlite3
 import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
+from pfsrd2.enrichment import llm_cache, llm_extractor
+
 
 def ollama_available():
     try:
@@ -455,3 +463,355 @@ class TestClassifyAbilityCategoryNormalization:
     def test_no_answer_is_no_category(self, monkeypatch):
         assert self._classify(monkeypatch, "") is None
         assert self._classify(monkeypatch, None) is None
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Answers /api/generate like Ollama: {"response": ...} for a JSON prompt."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        stub = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with stub.lock:
+            stub.requests.append(request)
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+        time.sleep(stub.delay)
+        with stub.lock:
+            stub.in_flight -= 1
+        if stub.answer is None:
+            answer = f" echo: {request['prompt']} "
+        else:
+            answer = stub.answer(request["prompt"])
+        body = json.dumps({"model": request["model"], "response": answer})
+        self.send_response(stub.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+        # Hang up without saying so, like a server timing out an idle
+        # keep-alive connection.
+        self.close_connection = stub.drop_after_response
+
+    def do_GET(self):
+        body = json.dumps({"models": [{"name": name} for name in self.server.models]})
+        self.send_response(200 if self.path == "/api/tags" else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    server.lock = threading.Lock()
+    server.connections = server.in_flight = server.max_in_flight = 0
+    server.requests = []
+    server.delay = 0
+    server.status = 200
+    server.drop_after_response = False
+    server.models = ["m:latest"]
+    server.answer = None
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        llm_extractor, "OLLAMA_URL", f"http://127.0.0.1:{server.server_port}/api/generate"
+    )
+    cache = sqlite3.connect(":memory:", check_same_thread=False)
+    llm_cache._ensure_table(cache)
+    monkeypatch.setattr(llm_cache, "_conn", cache)
+    monkeypatch.setattr(llm_extractor, "_health", llm_extractor._Health())
+    yield server
+    for conn in llm_extractor._local.__dict__.pop("conns", {}).values():
+        conn.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestOllamaClient:
+    def test_a_prompt_is_answered_and_cached(self, ollama):
+        assert llm_extractor._query_ollama("hello", "m") == "echo: hello"
+        assert llm_extractor._query_ollama("hello", "m") == "echo: hello"
+        assert ollama.requests == [{"model": "m", "prompt": "hello", "stream": False}]
+
+    def test_the_connection_is_kept_alive(self, ollama):
+        for i in range(5):
+            assert llm_extractor._query_ollama(f"prompt {i}", "m") == f"echo: prompt {i}"
+        assert ollama.connections == 1
+
+    def test_a_connection_closed_by_the_server_is_reopened(self, ollama):
+        ollama.drop_after_response = True
+        for i in range(3):
+            assert llm_extractor._query_ollama(f"prompt {i}", "m") == f"echo: prompt {i}"
+        assert ollama.connections == 3
+
+    def test_an_error_status_is_no_answer_and_is_not_cached(self, ollama):
+        ollama.status = 500
+        assert llm_extractor._query_ollama("hello", "m") is None
+        ollama.status = 200
+        assert llm_extractor._query_ollama("hello", "m") == "echo: hello"
+
+    def test_an_unreachable_server_is_no_answer(self, ollama, monkeypatch):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        monkeypatch.setattr(llm_extractor, "OLLAMA_URL", f"http://127.0.0.1:{port}/api/generate")
+        assert llm_extractor._query_ollama("hello", "m") is None
+
+    def test_requests_overlap_up_to_the_worker_count(self, ollama):
+        ollama.delay = 0.05
+        prompts = [f"prompt {i}" for i in range(12)]
+        results = list(
+            llm_extractor.map_ordered(lambda p: llm_extractor._query_ollama(p, "m"), prompts, 4)
+        )
+        assert results == [(p, f"echo: {p}") for p in prompts]
+        assert 1 < ollama.max_in_flight <= 4
+        assert ollama.connections <= 4
+
+
+def _unused_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}/api/generate"
+
+
+class TestBackendHealth:
+    def test_the_probe_passes_when_the_model_is_pulled(self, ollama):
+        llm_extractor.probe("m")
+        llm_extractor.probe("m:latest")
+
+    def test_the_probe_names_a_missing_model(self, ollama):
+        with pytest.raises(llm_extractor.OllamaUnavailable, match="not pulled"):
+            llm_extractor.probe("other")
+
+    def test_the_probe_fails_fast_on_a_stopped_server(self, ollama, monkeypatch):
+        monkeypatch.setattr(llm_extractor, "OLLAMA_URL", _unused_url())
+        start = time.monotonic()
+        with pytest.raises(llm_extractor.OllamaUnavailable, match="no answer"):
+            llm_extractor.probe("m")
+        assert time.monotonic() - start < llm_extractor.PROBE_TIMEOUT
+
+    def test_the_breaker_opens_on_a_stopped_server(self, ollama, monkeypatch):
+        monkeypatch.setattr(llm_extractor, "OLLAMA_URL", _unused_url())
+        for i in range(llm_extractor.BREAKER_THRESHOLD - 1):
+            assert llm_extractor._query_ollama(f"prompt {i}", "m") is None
+        with pytest.raises(llm_extractor.OllamaUnavailable):
+            llm_extractor._query_ollama("one too many", "m")
+        with pytest.raises(llm_extractor.OllamaUnavailable):
+            llm_extractor._query_ollama("after", "m")
+
+    def test_a_server_that_answers_the_probe_gets_one_more_run(self, ollama):
+        ollama.status = 500
+        threshold = llm_extractor.BREAKER_THRESHOLD
+        for i in range(2 * threshold - 1):
+            assert llm_extractor._query_ollama(f"prompt {i}", "m") is None
+        with pytest.raises(llm_extractor.OllamaUnavailable, match="after a good probe"):
+            llm_extractor._query_ollama("last", "m")
+        sent = len(ollama.requests)
+        with pytest.raises(llm_extractor.OllamaUnavailable):
+            llm_extractor._query_ollama("not sent", "m")
+        assert len(ollama.requests) == sent
+
+    def test_an_answer_resets_the_count(self, ollama):
+        for i in range(3):
+            ollama.status = 500
+            for j in range(llm_extractor.BREAKER_THRESHOLD - 1):
+                assert llm_extractor._query_ollama(f"bad {i} {j}", "m") is None
+            ollama.status = 200
+            assert llm_extractor._query_ollama(f"good {i}", "m") == f"echo: good {i}"
+
+    @pytest.mark.parametrize(
+        "latencies, timeout",
+        [
+            ([], llm_extractor.REQUEST_TIMEOUT),
+            ([1.0] * 5, llm_extractor.REQUEST_TIMEOUT),
+            ([1.0] * 20, llm_extractor.MIN_TIMEOUT),
+            ([5.0] * 19 + [100.0], 15.0),
+            ([50.0] * 20, llm_extractor.REQUEST_TIMEOUT),
+        ],
+    )
+    def test_the_timeout_follows_observed_latency(self, latencies, timeout):
+        health = llm_extractor._Health()
+        for seconds in latencies:
+            health.succeeded(seconds)
+        assert health.timeout() == timeout
+
+    def test_a_request_slower_than_the_timeout_is_a_failure(self, ollama, monkeypatch):
+        monkeypatch.setattr(llm_extractor, "MIN_TIMEOUT", 0.05)
+        for _ in range(llm_extractor.LATENCY_SAMPLES):
+            llm_extractor._health.succeeded(0.001)
+        ollama.delay = 0.5
+        assert llm_extractor._query_ollama("slow", "m") is None
+        assert llm_extractor._health.failures == 1
+
+
+class TestBatchedExtraction:
+    ITEMS = [
+        ("Breath Weapon", "deals 6d6 fire damage"),
+        ("Grab", "no dice here"),
+        ("Bite", "deals 2d8 piercing damage"),
+    ]
+
+    @staticmethod
+    def _answer(batch_answer):
+        def answer(prompt):
+            if prompt.endswith("Answers:"):
+                return batch_answer
+            text = prompt.rsplit("Text: ", 1)[1]
+            return "6d6 fire" if "6d6" in text else "2d8 piercing" if "2d8" in text else "none"
+
+        return answer
+
+    def test_one_prompt_answers_every_ability(self, ollama):
+        ollama.answer = self._answer("1. 6d6 fire\n2. none\n3. 2d8 piercing")
+        results = llm_extractor.extract_batch_llm("damage", self.ITEMS, "m")
+        assert [r and r[0]["formula"] for r in results] == ["6d6", None, "2d8"]
+        assert results[0][0]["damage_type"] == "fire"
+        assert len(ollama.requests) == 1
+        assert "3. Ability: Bite\nText: deals 2d8 piercing damage" in ollama.requests[0]["prompt"]
+
+    def test_answers_are_cached_per_ability(self, ollama):
+        ollama.answer = self._answer("1. 6d6 fire\n2. none\n3. 2d8 piercing")
+        llm_extractor.extract_batch_llm("damage", self.ITEMS, "m")
+        # The single-ability path finds the batched answer in the cache.
+        single = llm_extractor.extract_damage_llm(*self.ITEMS[2], model="m")
+        assert single[0]["formula"] == "2d8"
+        assert len(ollama.requests) == 1
+
+    def test_cached_abilities_are_not_sent(self, ollama):
+        ollama.answer = self._answer("1. 2d8 piercing")
+        llm_extractor.extract_damage_llm(*self.ITEMS[0], model="m")
+        llm_extractor.extract_damage_llm(*self.ITEMS[1], model="m")
+        results = llm_extractor.extract_batch_llm("damage", self.ITEMS, "m")
+        assert [r and r[0]["formula"] for r in results] == ["6d6", None, "2d8"]
+        # One left over is asked on its own, not as a batch of one.
+        assert not ollama.requests[-1]["prompt"].endswith("Answers:")
+        assert len(ollama.requests) == 3
+
+    @pytest.mark.parametrize(
+        "batch_answer",
+        ["I could not do that.", "1. 6d6 fire\n1. none\n3. 2d8 piercing", "1. 6d6 fire\n4. none"],
+    )
+    def test_a_garbled_batch_falls_back_to_single_prompts(self, ollama, batch_answer):
+        ollama.answer = self._answer(batch_answer)
+        results = llm_extractor.extract_batch_llm("damage", self.ITEMS, "m")
+        assert [r and r[0]["formula"] for r in results] == ["6d6", None, "2d8"]
+        assert len(ollama.requests) == 4
+
+    def test_an_unanswered_ability_alone_is_asked_again(self, ollama):
+        ollama.answer = self._answer("1. 6d6 fire\n3. 2d8 piercing")
+        results = llm_extractor.extract_batch_llm("damage", self.ITEMS, "m")
+        assert [r and r[0]["formula"] for r in results] == ["6d6", None, "2d8"]
+        assert len(ollama.requests) == 2
+        assert "Grab" in ollama.requests[1]["prompt"]
+
+    def test_every_extraction_has_a_batched_prompt(self):
+        for template, _ in llm_extractor._EXTRACTIONS.values():
+            prompt = llm_extractor._batch_prompt(template, [("A", "x"), ("B", "y")])
+            assert "{" not in prompt
+            assert prompt.endswith("2. Ability: B\nText: y\n\nAnswers:")
+            assert "Now extract from:" not in prompt
+
+
+class TestPrefetch:
+    PROMPTS = [f"prompt {i}" for i in range(5)]
+
+    @pytest.fixture
+    def lookups(self, monkeypatch):
+        calls = []
+
+        def counting(prompt_hash, model):
+            calls.append(prompt_hash)
+            return llm_cache.cache_get(prompt_hash, model)
+
+        monkeypatch.setattr(llm_extractor, "cache_get", counting)
+        return calls
+
+    def _query_all(self, prompts, workers=3):
+        pending = llm_extractor.prefetching(prompts, lambda p: p, "m", chunk=2)
+        return [r for _, r in llm_extractor.map_ordered(self._query, pending, workers)]
+
+    @staticmethod
+    def _query(prompt):
+        return llm_extractor._query_ollama(prompt, "m")
+
+    def test_cached_prompts_need_no_lookup_each(self, ollama, lookups):
+        for prompt in self.PROMPTS:
+            llm_cache.cache_put(llm_cache.compute_prompt_hash(prompt), "m", f"cached {prompt}")
+        assert self._query_all(self.PROMPTS) == [f"cached {p}" for p in self.PROMPTS]
+        assert lookups == []
+        assert ollama.requests == []
+
+    def test_misses_are_sent_once_and_counted_once(self, ollama, lookups):
+        llm_cache.cache_put(llm_cache.compute_prompt_hash("prompt 0"), "m", "cached")
+        before = llm_cache.cache_counters()
+        assert self._query_all(self.PROMPTS, workers=1)[1:] == [
+            f"echo: {p}" for p in self.PROMPTS[1:]
+        ]
+        assert len(ollama.requests) == 4
+        assert lookups == []
+        after = llm_cache.cache_counters()
+        assert after["hits"] - before["hits"] == 1
+        assert after["misses"] - before["misses"] == 4
+
+    def test_a_caller_stopping_early_leaves_nothing_behind(self, ollama):
+        pending = llm_extractor.prefetching(self.PROMPTS, lambda p: p, "m", chunk=2)
+        next(pending)
+        pending.close()
+        assert llm_extractor._prefetched == {}
+
+    def test_items_without_a_prompt_are_passed_through(self, ollama, monkeypatch):
+        monkeypatch.setattr(llm_extractor, "_prefetched", {})
+        items = list(llm_extractor.prefetching(["a", "", "b"], lambda p: p or None, "m"))
+        assert items == ["a", "", "b"]
+        hashes = {h for h, _ in llm_extractor._prefetched}
+        assert hashes == {llm_cache.compute_prompt_hash(p) for p in "ab"}
+
+
+class TestMapOrdered:
+    def test_results_come_back_in_order_with_bounded_concurrency(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work(i):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02 if i % 2 else 0.005)
+            with lock:
+                state["running"] -= 1
+            return i * i
+
+        assert list(llm_extractor.map_ordered(work, range(10), 3)) == [
+            (i, i * i) for i in range(10)
+        ]
+        assert state["peak"] <= 3
+
+    def test_one_worker_runs_inline(self):
+        caller = threading.current_thread()
+        threads = [
+            t for _, t in llm_extractor.map_ordered(lambda _: threading.current_thread(), "ab", 1)
+        ]
+        assert threads == [caller, caller]
+
+    def test_an_exception_surfaces_at_its_item(self):
+        def work(i):
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        results = llm_extractor.map_ordered(work, range(5), 2)
+        assert next(results) == (0, 0)
+        assert next(results) == (1, 1)
+        with pytest.raises(ValueError):
+            next(results)
@@ -0,0 +1,78 @@
+"""Tests for universal/log_sink.py — buffered diagnostic log channels."""
+
+import multiprocessing
+import os
+
+import pytest
+
+from universal import log_sink
+from universal.log_sink import MARKDOWN, LogSink, flush_logs, log
+from universal.utils import log_element
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    LogSink.discard()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestLogSink:
+    def test_nothing_reaches_disk_until_flushed(self, in_tmp):
+        log(MARKDOWN, "/text : Fireball")
+        assert not (in_tmp / "markdown.log").exists()
+        flush_logs()
+        assert (in_tmp / "markdown.log").read_text() == "/text : Fireball\n"
+
+    def test_flush_appends(self, in_tmp):
+        (in_tmp / "markdown.log").write_text("earlier run\n")
+        log(MARKDOWN, "a")
+        log(MARKDOWN, "b")
+        flush_logs()
+        assert (in_tmp / "markdown.log").read_text() == "earlier run\na\nb\n"
+
+    def test_one_open_per_channel_per_flush(self, in_tmp, monkeypatch):
+        opened = []
+        real_open = os.open
+
+        def _counting_open(path, *args):
+            opened.append(path)
+            return real_open(path, *args)
+
+        monkeypatch.setattr(log_sink.os, "open", _counting_open)
+        for i in range(50):
+            log(MARKDOWN, f"field {i}")
+        log("speed", "10 feet")
+        flush_logs()
+        assert sorted(opened) == ["markdown.log", "speed.log"]
+
+    def test_flushes_itself_when_full(self, in_tmp):
+        sink = type(LogSink)(max_buffered=3)
+        sink.write("small", "1")
+        sink.write("small", "2")
+        assert not (in_tmp / "small.log").exists()
+        sink.write("small", "3")
+        assert (in_tmp / "small.log").read_text() == "1\n2\n3\n"
+        assert sink.pending("small") == []
+
+    def test_log_element_writes_to_the_channel_its_file_names(self, in_tmp):
+        log_element("speed.log")("fly 30 feet")
+        assert LogSink.pending("speed") == ["fly 30 feet"]
+        flush_logs()
+        assert (in_tmp / "speed.log").read_text() == "fly 30 feet\n"
+
+
+def _child_pending(queue):
+    queue.put(LogSink.pending(MARKDOWN))
+
+
+class TestForkedWorkers:
+    def test_a_forked_worker_does_not_inherit_pending_lines(self, in_tmp):
+        log(MARKDOWN, "parent only")
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        child = ctx.Process(target=_child_pending, args=(queue,))
+        child.start()
+        assert queue.get(timeout=10) == []
+        child.join()
+        assert LogSink.pending(MARKDOWN) == ["parent only"]
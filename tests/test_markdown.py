@@ -66,3 +66,53 @@ class TestMarkdownDisallowedTags:
         # caught by validation first
         with pytest.raises(AssertionError):
             markdown_pass(struct, "test", "/test")
+
+
+class TestMarkdownMemo:
+    """One converter, one memo, shared by every document in the process."""
+
+    def test_converter_is_reused(self):
+        from universal import markdown
+
+        markdown.md("<b>first</b>")
+        converter = markdown._converter
+        markdown.md("<i>second</i>")
+        assert markdown._converter is converter
+
+    def test_repeat_conversion_is_a_memo_hit(self):
+        from universal import markdown
+
+        text = "<b>Open Game License</b> memo probe"
+        first = markdown.md(text)
+        hits = markdown._memoized_md.cache_info().hits
+        assert markdown.md(text) == first
+        assert markdown._memoized_md.cache_info().hits == hits + 1
+
+    def test_options_bypass_the_memo(self):
+        from universal import markdown
+
+        assert markdown.md("<b>x</b>", strong_em_symbol="_") == "__x__"
+        assert markdown.md("<b>x</b>") == "**x**"
+
+    def test_tag_free_text_never_builds_a_soup(self, monkeypatch):
+        import universal.utils as utils
+
+        def _no_soup(*args, **kwargs):
+            raise AssertionError("tag-free text should not be parsed")
+
+        monkeypatch.setattr(utils, "BeautifulSoup", _no_soup)
+        assert utils.get_unique_tag_set("Plain text, no tags") == set()
+
+    def test_tag_set_is_a_fresh_set(self):
+        from universal.utils import get_unique_tag_set
+
+        tags = get_unique_tag_set("<b>x</b><i>y</i>")
+        tags.add("div")
+        assert get_unique_tag_set("<b>x</b><i>y</i>") == {"b", "i"}
+
+    def test_converted_fields_are_logged_to_the_buffered_channel(self):
+        from universal.log_sink import MARKDOWN, LogSink
+
+        LogSink.discard()
+        markdown_pass({"inner": {"text": "<b>x</b>"}}, "Fireball", "")
+        assert LogSink.pending(MARKDOWN) == ["/inner/text : Fireball"]
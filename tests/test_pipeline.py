@@ -0,0 +1,127 @@
+"""Tests for universal/pipeline.py — overlapped read/parse/write in exec_main."""
+
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from universal import files, pipeline
+from universal.files import write_json
+from universal.options import exec_main
+from universal.pipeline import Pipeline, read_source
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"in{i}.html"
+        path.write_text(f"<p>{i}</p>")
+        paths.append(str(path))
+    return paths
+
+
+class TestReadAhead:
+    def test_inputs_come_from_memory(self, inputs):
+        p = Pipeline(inputs).start()
+        try:
+            time.sleep(0.05)
+            os.unlink(inputs[0])
+            assert read_source(inputs[0]) == "<p>0</p>"
+        finally:
+            p.close()
+
+    def test_read_ahead_is_bounded(self, inputs, monkeypatch):
+        opened = []
+        real_open = open
+
+        def _counting_open(name, *args, **kwargs):
+            opened.append(name)
+            return real_open(name, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", _counting_open)
+        p = Pipeline(inputs, read_ahead=2).start()
+        try:
+            time.sleep(0.1)
+            # Two queued, one read and waiting for room.
+            assert len(opened) == 3
+            assert read_source(inputs[0]) == "<p>0</p>"
+        finally:
+            p.close()
+
+    def test_skipped_inputs_are_dropped(self, inputs):
+        p = Pipeline(inputs).start()
+        try:
+            assert read_source(inputs[3]) == "<p>3</p>"
+            assert read_source(inputs[4]) == "<p>4</p>"
+        finally:
+            p.close()
+
+    def test_files_outside_the_batch_are_opened(self, inputs, tmp_path):
+        other = tmp_path / "other.html"
+        other.write_text("other")
+        p = Pipeline(inputs).start()
+        try:
+            assert read_source(str(other)) == "other"
+            assert read_source(inputs[0]) == "<p>0</p>"
+            # A second read of the same input is not prefetched again.
+            assert read_source(inputs[0]) == "<p>0</p>"
+        finally:
+            p.close()
+
+    def test_unreadable_input_raises_from_the_parser(self, inputs):
+        os.unlink(inputs[1])
+        p = Pipeline(inputs).start()
+        try:
+            with pytest.raises(FileNotFoundError):
+                read_source(inputs[1])
+            assert read_source(inputs[2]) == "<p>2</p>"
+        finally:
+            p.close()
+
+
+class TestWriteBehind:
+    def test_close_drains_every_write(self, tmp_path):
+        p = Pipeline([]).start()
+        for i in range(50):
+            assert write_json(tmp_path / f"{i}.json", {"i": i}) is None
+        p.close()
+        assert len(os.listdir(tmp_path)) == 50
+        assert json.loads((tmp_path / "49.json").read_text()) == {"i": 49}
+
+    def test_the_document_is_serialized_when_handed_over(self, tmp_path):
+        struct = {"name": "before"}
+        p = Pipeline([]).start()
+        write_json(tmp_path / "out.json", struct)
+        struct["name"] = "after"
+        p.close()
+        assert json.loads((tmp_path / "out.json").read_text()) == {"name": "before"}
+
+    def test_a_write_error_is_raised_on_close(self, tmp_path):
+        p = Pipeline([]).start()
+        write_json(tmp_path / "missing" / "out.json", {})
+        with pytest.raises(FileNotFoundError):
+            p.close()
+        assert files._write_behind is None
+        assert pipeline._pipeline is None
+
+
+class TestExecMain:
+    def test_a_batch_runs_through_the_pipeline(self, inputs, tmp_path):
+        out = tmp_path / "out"
+        out.mkdir()
+        seen = []
+
+        def _parse(filename, options):
+            assert pipeline._pipeline is not None
+            text = read_source(filename)
+            seen.append(text)
+            write_json(out / (os.path.basename(filename) + ".json"), {"text": text})
+
+        options = SimpleNamespace(output=str(out), dryrun=False)
+        exec_main(options, inputs, _parse, None)
+        assert seen == [f"<p>{i}</p>" for i in range(6)]
+        assert len(os.listdir(out)) == 6
+        assert pipeline._pipeline is None
@@ -1,7 +1,17 @@
 """Tests for the regex extraction tier."""
 
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from pfsrd2.enrichment import regex_extractor
 from pfsrd2.enrichment.regex_extractor import (
     _apply_trailing_modifier,
+    _gate,
+    _may_match,
     detect_keywords,
     extract_all,
     extract_area,
@@ -9,8 +19,13 @@ from pfsrd2.enrichment.regex_extractor import (
     extract_frequency,
     extract_range,
     extract_save_dc,
+    field_versions,
+    outdated_fields,
+    reextract_fields,
 )
 
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
 
 class TestExtractSaveDC:
     def test_dc_basic_reflex(self):
@@ -450,6 +465,44 @@ class TestExtractAll:
         assert result["saving_throw"][0]["dc"] == 20
 
 
+class TestFieldVersions:
+    SPIT = {"name": "Spit", "text": "It spits, dealing 2d6 acid damage in a 15-foot line."}
+
+    def test_every_field_extract_all_fills_is_versioned(self):
+        assert field_versions(self.SPIT) == regex_extractor.EXTRACTOR_VERSIONS
+
+    def test_parser_provided_fields_are_not(self):
+        versions = field_versions({**self.SPIT, "damage": [], "frequency": "once per day"})
+        assert "damage" not in versions
+        assert "frequency" not in versions
+        # An empty frequency is one extract_all would still fill
+        assert "frequency" in field_versions({**self.SPIT, "frequency": ""})
+
+    def test_only_fields_behind_their_extractor_are_outdated(self, monkeypatch):
+        monkeypatch.setitem(regex_extractor.EXTRACTOR_VERSIONS, "damage", 5)
+        versions = {**field_versions(self.SPIT), "damage": 4}
+        assert outdated_fields(self.SPIT, versions) == ["damage"]
+
+    def test_llm_derived_and_missing_fields(self, monkeypatch):
+        monkeypatch.setitem(regex_extractor.EXTRACTOR_VERSIONS, "damage", 5)
+        versions = {"area": 1, "damage": "llm"}
+        assert outdated_fields(self.SPIT, versions) == ["frequency", "range", "saving_throw"]
+
+    def test_reextract_replaces_only_the_named_fields(self):
+        enriched, _ = extract_all(self.SPIT)
+        enriched["damage"] = [{"formula": "9d9", "damage_type": "old"}]
+        enriched["area"] = "kept as stored"
+        result, missed = reextract_fields(enriched, ["damage"])
+        assert result["damage"][0]["formula"] == "2d6"
+        assert result["area"] == "kept as stored"
+        assert missed == {}
+
+    def test_a_field_the_extractor_no_longer_finds_is_dropped(self):
+        stored = {**self.SPIT, "text": "It spits.", "damage": [{"formula": "2d6"}]}
+        result, _ = reextract_fields(stored, ["damage"])
+        assert "damage" not in result
+
+
 class TestApplyTrailingModifier:
     def test_adds_modifier_when_present(self):
         result = {"dc": 25}
@@ -472,3 +525,99 @@ class TestApplyTrailingModifier:
         assert result["save_type"] == "Ref"
         assert result["dc"] == 25
         assert "modifiers" in result
+
+
+class TestLiteralGates:
+    def test_every_required_literal_is_found(self):
+        requirements, ignorecase = _gate(re.compile(r"(?:bonus|penalty) to damage", re.I))
+        assert ignorecase
+        assert requirements == [(" to damage",), ("bonus", "penalty")]
+
+    def test_case_sensitive_literals_are_kept_as_written(self):
+        assert _gate(re.compile(r"\bDC\b")) == ([("DC",)], False)
+
+    def test_optional_and_repeated_parts_require_nothing(self):
+        assert _gate(re.compile(r"(?:fire )?(\d+)+d")) == ([("d",)], False)
+        assert _gate(re.compile(r"(?:a|)b*")) == ([], False)
+
+    def test_a_pattern_without_its_literal_is_skipped(self):
+        pattern = regex_extractor._AREA_PATTERN
+        assert not _may_match(pattern, "within 30 feet")
+        assert _may_match(pattern, "a 30-FOOT cone")
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "\u0130mmune to fire damage",  # dotted capital I lowers to two characters
+            "DAMAGE EQUAL TO its level",
+            "takes half damage from the fall",
+            "re\u017fistance to cold damage",  # long s
+            "once per day, 20-foot aura",
+            "deals 2d6 fire damage (DC 20 basic Reflex save)",
+        ],
+    )
+    def test_gates_never_skip_a_match(self, text):
+        patterns = [p for p, _weight, *_ in sum(regex_extractor._FALSE_ALARM_GATES.values(), [])]
+        patterns += [
+            *regex_extractor._SAVE_DC_PATTERNS,
+            *regex_extractor._DAMAGE_PATTERNS,
+            *regex_extractor._FREQUENCY_PATTERNS,
+            *regex_extractor._KEYWORD_DETECTORS.values(),
+        ]
+        for pattern in patterns:
+            if pattern.search(text):
+                gate = regex_extractor._GATES.get(id(pattern)) or _gate(pattern)
+                assert regex_extractor._satisfied(
+                    gate[0], regex_extractor._folded(text) if gate[1] else text
+                ), pattern.pattern
+
+    def test_without_the_private_parser_nothing_is_gated(self, monkeypatch):
+        monkeypatch.setattr(regex_extractor, "_sre_parse", None)
+        assert _gate(re.compile(r"\bDC\b")) == ([], False)
+
+    def test_the_module_imports_and_extracts_without_the_private_parser(self):
+        # In a fresh interpreter, so re is not left broken for other tests.
+        code = (
+            "import re, sys\n"
+            "del re._parser\n"
+            "sys.modules['re._parser'] = None\n"
+            "from pfsrd2.enrichment import regex_extractor as r\n"
+            "assert r._sre_parse is None\n"
+            "result, _ = r.extract_all({'text': 'deals 2d6 fire damage'})\n"
+            "assert result['damage'][0]['formula'] == '2d6'\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+
+    def test_an_unexpected_parse_is_not_gated(self, monkeypatch):
+        # re's internals changing shape must not break the module's patterns.
+        monkeypatch.setattr(regex_extractor, "_sre", object())
+        assert _gate(re.compile(r"DC (\d+)", re.I)) == ([], True)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "The dragon breathes a spray of acid that deals 12d6 acid damage in an 80-foot"
+            " line (DC 30 basic Reflex save). It can't use Breath Weapon again for 1d4 rounds.",
+            "Frequency once per day. Creatures within a 20-foot emanation take 4d8 sonic damage"
+            " (DC 25 Fortitude save) and are deafened for 1 minute.",
+            "The creature gains a +2 circumstance bonus to damage rolls. Range 60 feet.",
+            "Once per hour the shade makes a DC 5 flat check; on a failure it takes 2d6+4"
+            " persistent bleed damage.",
+            "It can reach 30 FEET with a whip and deals half damage to objects.",
+            "İt takes 3d6 cold damage (Will DC 22) once per round.",
+            "No numbers here at all.",
+        ],
+    )
+    def test_gating_changes_no_result(self, text, monkeypatch):
+        ability = {"name": "X", "text": text}
+        gated = extract_all(ability), detect_keywords(text)
+        monkeypatch.setattr(regex_extractor, "_GATES", {})
+        monkeypatch.setattr(
+            regex_extractor,
+            "_FALSE_ALARM_GATES",
+            {
+                keyword: [(p, w, [], ic) for p, w, _req, ic in entries]
+                for keyword, entries in regex_extractor._FALSE_ALARM_GATES.items()
+            },
+        )
+        assert (extract_all(ability), detect_keywords(text)) == gated
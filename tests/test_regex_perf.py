@@ -0,0 +1,146 @@
+"""Tests for pfsrd2/qa/regex_perf.py — the extractor regex timing harness."""
+
+import importlib.util
+import json
+import re
+
+import pytest
+
+from pfsrd2.qa import regex_perf
+from pfsrd2.qa.regex_perf import (
+    check_growth,
+    collect_patterns,
+    corpus_texts,
+    growth_exponent,
+    load_baseline,
+    slowest_on_corpus,
+    write_baseline,
+)
+
+MODULE = """
+import re
+
+_SINGLE = re.compile(r"\\bDC (\\d+)")
+_NESTED = {"damage": [re.compile(r"damage", re.I), (re.compile(r"foot"), 1)]}
+
+
+def uses_inline(text):
+    re.sub(r"\\s+", " ", text)
+    re.search(r"reach (\\d+)", text, re.I | re.S)
+    re.split(r",\\s*", text, flags=re.I)
+    return re.search(r"\\bDC (\\d+)", text)
+"""
+
+
+@pytest.fixture
+def module(tmp_path):
+    path = tmp_path / "fake_extractor.py"
+    path.write_text(MODULE)
+    spec = importlib.util.spec_from_file_location("fake_extractor", path)
+    loaded = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(loaded)
+    return loaded
+
+
+class TestCollectPatterns:
+    def test_compiled_and_inline_patterns_are_found_once(self, module):
+        found = dict(collect_patterns([module]))
+        assert set(found) == {
+            "fake_extractor._SINGLE",
+            "fake_extractor._NESTED['damage'][0]",
+            "fake_extractor._NESTED['damage'][1][0]",
+            "fake_extractor:9",
+            "fake_extractor:10",
+            "fake_extractor:11",
+        }
+        assert found["fake_extractor:10"].flags & re.S
+        assert found["fake_extractor:11"].flags & re.I
+
+    def test_the_extractors_are_covered(self):
+        labels = [label for label, _ in collect_patterns()]
+        assert any(label.startswith("regex_extractor._FALSE_ALARM_PATTERNS") for label in labels)
+        assert any(label.startswith("change_extractor._") for label in labels)
+
+
+class TestGrowth:
+    def test_exponent_of_linear_and_quadratic_timings(self):
+        assert growth_exponent((1000, 2000), (1.0, 2.0)) == pytest.approx(1.0)
+        assert growth_exponent((1000, 2000), (1.0, 4.0)) == pytest.approx(2.0)
+
+    def test_a_linear_pattern_passes(self):
+        assert check_growth("dc", re.compile(r"\bDC\b")) == []
+
+    def test_a_quadratic_pattern_fails(self):
+        problems = check_growth("lazy", re.compile(r"a.*?b"), sizes=(2000, 4000, 8000))
+        assert ("lazy", "letters") in {(label, name) for label, name, _ in problems}
+
+    def test_catastrophic_backtracking_is_cut_off(self):
+        problems = check_growth("nested", re.compile(r"(a+)+$"), sizes=(30, 60), budget=0.2)
+        assert any("over 0.2s" in detail for _, _, detail in problems)
+
+
+class TestCorpus:
+    def test_text_fields_are_collected(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PF2_DATA_DIR", str(tmp_path))
+        (tmp_path / "monsters").mkdir()
+        (tmp_path / "monsters" / "goblin.json").write_text(
+            json.dumps(
+                {
+                    "name": "Goblin",
+                    "text": "A small menace.",
+                    "abilities": [{"effect": "DC 15 Reflex", "text": "A small menace."}],
+                }
+            )
+        )
+        assert corpus_texts() == ["A small menace.", "DC 15 Reflex"]
+
+    def test_slowest_pairs_come_first(self):
+        patterns = [("fast", re.compile(r"x")), ("slow", re.compile(r"a.*?b"))]
+        rows = slowest_on_corpus(patterns, ["a" * 3000], top=1)
+        assert rows[0][1] == "slow"
+
+
+class TestBaseline:
+    SLOW = re.compile(r"a.*?b")
+
+    @pytest.fixture
+    def slow_module(self, monkeypatch):
+        # check_growth is what the timing tests cover; here it is pinned.
+        monkeypatch.setattr(regex_perf, "collect_patterns", lambda: [("slow", self.SLOW)])
+        monkeypatch.setattr(
+            regex_perf,
+            "check_growth",
+            lambda label, pattern: [(label, "letters", "grows as n^2.00 (9.0ms)")],
+        )
+
+    def test_a_new_offender_fails(self, slow_module, tmp_path, capsys):
+        assert regex_perf.main(["--no-corpus", "--baseline", str(tmp_path / "b.json")]) == 1
+        assert "SUPER-LINEAR: slow on letters" in capsys.readouterr().out
+
+    def test_a_known_offender_passes(self, slow_module, tmp_path, capsys):
+        path = str(tmp_path / "b.json")
+        assert regex_perf.main(["--no-corpus", "--baseline", path, "--update-baseline"]) == 0
+        assert load_baseline(path) == {(self.SLOW.pattern, self.SLOW.flags): "slow"}
+        assert regex_perf.main(["--no-corpus", "--baseline", path]) == 0
+        assert "KNOWN: slow on letters" in capsys.readouterr().out
+
+    def test_a_fixed_offender_is_reported(self, tmp_path, monkeypatch, capsys):
+        path = str(tmp_path / "b.json")
+        write_baseline([("slow", self.SLOW)], path)
+        monkeypatch.setattr(regex_perf, "collect_patterns", lambda: [])
+        assert regex_perf.main(["--no-corpus", "--baseline", path]) == 0
+        assert "FIXED: slow" in capsys.readouterr().out
+
+    def test_every_shipped_entry_is_a_current_pattern(self):
+        # An edited pattern is judged afresh (its key changes); the entry it
+        # leaves behind is dropped with --update-baseline, not left to pile up.
+        current = {(p.pattern, p.flags) for _, p in collect_patterns()}
+        known = load_baseline()
+        assert known
+        assert set(known) <= current
+
+
+def test_main_reports_without_a_corpus(capsys, monkeypatch):
+    monkeypatch.setattr(regex_perf, "_modules", lambda: [])
+    assert regex_perf.main(["--no-corpus"]) == 0
+    assert "0 patterns" in capsys.readouterr().out
@@ -1193,3 +1193,72 @@ class TestTheAlarmsSurviveDashO:
             [sys.executable, "-O", "-c", script], capture_output=True, text=True
         )
         assert out.stdout.strip() == "FIRED", out.stdout + out.stderr
+
+
+# --- parse_universal lxml fast path ---
+
+_FAST_PATH_PAGE = """<!DOCTYPE html>
+<html><head><title>Fireball</title><script>var nav = "<div id='main'>";</script></head>
+<body>
+<nav><a href="Spells.aspx">Spells</a><span style="x"> </span></nav>
+<div id="main">
+<span><a href="Spells.aspx">Spells</a></span><hr/>
+<span><h1 class="title">Fireball &amp; Friends</h1>
+<b>Source</b> <a href="Sources.aspx?ID=1">Core Rulebook pg. 326</a><br/>
+<div class="sidebar-nofloat">A <a href="javascript:void(0);"><i>burst</i></a> of flame.</div>
+<span style="color:red"> </span>
+<h2 class="title">Heightened</h2>
+Café déjà vu &mdash; more damage.
+</span>
+</div>
+<footer>Footer <a href="Contact.aspx">contact</a></footer>
+</body></html>"""
+
+
+class TestLxmlFastPath:
+    """The fast path must hand the passes the same content the full soup does."""
+
+    @pytest.fixture
+    def page(self, tmp_path):
+        path = tmp_path / "Spells.aspx.ID_1.html"
+        path.write_text(_FAST_PATH_PAGE)
+        return str(path)
+
+    @pytest.fixture
+    def fast_path(self):
+        from universal.universal import set_lxml_fast_path
+
+        set_lxml_fast_path(True)
+        yield
+        set_lxml_fast_path(False)
+
+    def _parse(self, page):
+        from universal.universal import parse_universal
+        from universal.utils import content_filter, sidebar_filter
+
+        return parse_universal(
+            page, max_title=4, cssclass="main", pre_filters=[content_filter, sidebar_filter]
+        )
+
+    def test_same_details_as_the_full_soup(self, page, request):
+        full = self._parse(page)
+        request.getfixturevalue("fast_path")
+        fast = self._parse(page)
+        assert repr(fast) == repr(full)
+        assert "Fireball" in repr(fast)
+
+    def test_missing_content_element(self, tmp_path, fast_path):
+        from universal.universal import parse_universal
+
+        path = tmp_path / "empty.html"
+        path.write_text("<html><body><p>No main here</p></body></html>")
+        assert parse_universal(str(path), cssclass="main") is None
+
+    def test_only_the_content_element_is_kept(self, fast_path):
+        from universal.universal import _content_only_soup
+
+        soup = _content_only_soup(_FAST_PATH_PAGE.replace("\n", ""), "main")
+        assert soup.find(id="main") is not None
+        assert soup.find("footer") is None
+        assert soup.find("nav") is None
+        assert soup.find("script") is None
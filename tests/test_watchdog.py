@@ -0,0 +1,92 @@
+"""Tests for universal/watchdog.py — the per-file time budget."""
+
+import contextlib
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from universal.log_sink import TIMEOUTS, LogSink
+from universal.options import exec_main, option_parser
+from universal.watchdog import FileTimeout, pass_name, watchdog
+
+
+def _backtrack_pass():
+    # Catastrophic backtracking: minutes without the watchdog.
+    re.match(r"(a+)+$", "a" * 40 + "!")
+
+
+def _parse_with_a_slow_pass(filename, options):
+    _backtrack_pass()
+
+
+class TestWatchdog:
+    def test_a_runaway_regex_is_interrupted(self):
+        start = time.monotonic()
+        with pytest.raises(FileTimeout), watchdog(0.2):
+            _backtrack_pass()
+        assert time.monotonic() - start < 5
+
+    def test_no_budget_means_no_limit(self):
+        with watchdog(0):
+            time.sleep(0.01)
+
+    def test_the_timer_is_cleared_after_the_body(self):
+        with watchdog(0.05):
+            pass
+        time.sleep(0.1)
+
+    def test_except_exception_cannot_swallow_it(self):
+        with pytest.raises(FileTimeout), watchdog(0.05), contextlib.suppress(Exception):
+            time.sleep(1)
+
+    def test_pass_name_is_the_innermost_pass(self):
+        with pytest.raises(FileTimeout) as info, watchdog(0.1):
+            _parse_with_a_slow_pass("x", None)
+        assert pass_name(info.value.__traceback__) == "_backtrack_pass"
+
+    def test_pass_name_falls_back_to_the_innermost_function(self):
+        def helper():
+            time.sleep(1)
+
+        with pytest.raises(FileTimeout) as info, watchdog(0.05):
+            helper()
+        assert pass_name(info.value.__traceback__) == "helper"
+
+
+class TestExecMainTimeouts:
+    def test_the_batch_continues_and_exits_124(self, tmp_path, monkeypatch):
+        parsed = []
+
+        def _parse(filename, options):
+            if filename == "slow":
+                _backtrack_pass()
+            parsed.append(filename)
+
+        written = []
+        monkeypatch.setattr(LogSink, "flush", lambda: None)
+        monkeypatch.setattr(LogSink, "write", lambda channel, line: written.append((channel, line)))
+        options = SimpleNamespace(output=str(tmp_path), dryrun=False, timeout=0.2)
+        with pytest.raises(SystemExit) as info:
+            exec_main(options, ["fast", "slow", "after"], _parse, None)
+        assert info.value.code == 124
+        assert parsed == ["fast", "after"]
+        assert written == [(TIMEOUTS, "slow\t0.2s\t_backtrack_pass")]
+
+
+class TestTimeoutOption:
+    def test_the_environment_sets_the_default(self, monkeypatch):
+        monkeypatch.setenv("PF2_FILE_TIMEOUT", "2.5")
+        assert option_parser("x").parse_args([]).timeout == 2.5
+
+    def test_the_command_line_wins_over_a_bad_environment_value(self, monkeypatch):
+        monkeypatch.setenv("PF2_FILE_TIMEOUT", "soon")
+        assert option_parser("x").parse_args(["--timeout", "3"]).timeout == 3.0
+
+    def test_a_bad_environment_value_is_a_usage_error(self, monkeypatch, capsys):
+        monkeypatch.setenv("PF2_FILE_TIMEOUT", "soon")
+        with pytest.raises(SystemExit) as info:
+            option_parser("x").parse_args([])
+        assert info.value.code == 2
+        assert "invalid float value: 'soon'" in capsys.readouterr().err
@@ -0,0 +1,108 @@
+"""Newline-delimited JSON bundles: one file per content type.
+
+With --bundle, write_json sends each document here instead of to its own file
+in the pfsrd2-data tree. A content type is the top-level directory the file
+would have gone to (monsters, spells, monster_abilities, ...), and its
+documents are appended to <output>/<type>.ndjson, one compact JSON document
+per line, or to <type>.ndjson.gz with --bundle-gzip.
+
+Beside each bundle, <bundle>.idx holds one JSON line per document:
+    path     where the document would have been written, relative to output
+    game-id  the document's game-id, when it has one
+    offset   where its record starts in the bundle file
+    length   the record's size in bytes
+A gzip bundle is a series of gzip members, one per record, so offset and
+length address a member that gzip.decompress reads on its own, while the file
+as a whole is still ordinary gzip for sequential readers. A document written
+under several sources is stored once, with one index line per path.
+
+The run scripts start a process per input file, so every process appends to
+the same bundles. Each append takes an exclusive lock on the bundle and writes
+the record and its index line while holding it. Bundles only grow: a re-parse
+appends a newer record, and the last index line for a document is the current
+one. Documents are told apart by game-id, as the tree's name disambiguation
+does, or by path when they have none. Delete the bundles to start a fresh
+corpus.
+"""
+
+import fcntl
+import gzip
+import json
+import os
+
+
+class Bundle:
+    def __init__(self, filename, compress):
+        self.filename = filename
+        self.compress = compress
+        self._last = None
+
+    def append(self, path, struct):
+        record = json.dumps(struct, sort_keys=True, separators=(",", ":")) + "\n"
+        data = record.encode("ascii")
+        if self.compress:
+            data = gzip.compress(data, mtime=0)
+        fd = os.open(self.filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # Compared by content: an output transform (--license-refs) hands
+            # over a new dict for every write of the same document.
+            if self._last is not None and self._last[0] == record:
+                offset, length = self._last[1:]
+            else:
+                offset, length = os.fstat(fd).st_size, len(data)
+                _write_all(fd, data)
+                self._last = (record, offset, length)
+            entry = {"path": path, "offset": offset, "length": length}
+            if "game-id" in struct:
+                entry["game-id"] = struct["game-id"]
+            _append(self.filename + ".idx", json.dumps(entry, sort_keys=True) + "\n")
+        finally:
+            os.close(fd)
+
+
+def _write_all(fd, data):
+    while data:
+        data = data[os.write(fd, data) :]
+
+
+def _append(filename, text):
+    fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        _write_all(fd, text.encode("ascii"))
+    finally:
+        os.close(fd)
+
+
+def bundle_filename(output, content_type, compress):
+    return os.path.join(output, content_type + (".ndjson.gz" if compress else ".ndjson"))
+
+
+def read_bundle(filename):
+    """Yield the documents in a bundle, in the order they were written."""
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "rt", encoding="ascii") as fp:
+        for line in fp:
+            yield json.loads(line)
+
+
+def read_index(filename):
+    """The current index entries of a bundle, in the order they were written."""
+    entries = {}
+    with open(filename + ".idx") as fp:
+        for line in fp:
+            entry = json.loads(line)
+            key = (entry["path"], entry.get("game-id"))
+            entries.pop(key, None)
+            entries[key] = entry
+    return list(entries.values())
+
+
+def read_record(filename, entry):
+    """The one document an index entry points at."""
+    with open(filename, "rb") as fp:
+        fp.seek(entry["offset"])
+        data = fp.read(entry["length"])
+    if filename.endswith(".gz"):
+        data = gzip.decompress(data)
+    return json.loads(data)
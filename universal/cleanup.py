@@ -0,0 +1,130 @@
+"""Tag rules for the HTML cleanup parse_universal runs before parsing.
+
+A pre-filter used to be a function that walked the whole soup with find_all.
+parse_universal runs several in a row (the parser's own, then href_filter and
+span_formatting_filter), so a large page was scanned once per filter before
+parsing began. A TagRule instead declares the tag name and attributes it acts
+on, and apply_pre_filters finds the matches for a whole run of rules in ONE
+traversal.
+
+Order is preserved, not just the outcome of each rule. Tags are collected by
+name in the single pass, but the actions still run rule by rule, in the order
+the filters were listed, each over its own tags in document order. Attributes
+are tested when the rule's turn comes, against the tree as the earlier rules
+left it. That is what the sequence of find_all calls did, with two differences
+the engine has to cover:
+
+- A tag an earlier rule removed is no longer in the document, so find_all
+  would not have returned it. Tags that have left the tree are skipped.
+- Content an earlier rule inserted WOULD have been found. An action returns
+  the nodes it inserted, and they are matched against the rules after it.
+
+Filters that restructure the page (strip the nav, pull data out of it) stay
+plain functions. They are barriers: rules on either side of one are applied in
+separate traversals, so a rule never sees the page before a filter listed
+ahead of it has run.
+"""
+
+from bs4 import Tag
+
+
+class TagRule:
+    """A cleanup action applied to every tag with `name` matching `attrs`.
+
+    attrs is a dict of attribute name to test: True requires the attribute to
+    be present, a callable is called with the attribute's value, and anything
+    else must equal the value -- or, for multi-valued attributes like class,
+    be one of them, the same way find_all matches {"class": "sidebar"}.
+
+    The action receives the tag. It returns the nodes it inserted into the
+    document, if any, so later rules can see them.
+
+    Calling the rule on a soup applies it alone, so a rule can be used anywhere
+    the filter function it replaced was.
+    """
+
+    def __init__(self, name, action, attrs=None):
+        self.name = name
+        self.action = action
+        self.attrs = attrs or {}
+
+    def __call__(self, soup):
+        apply_rules(soup, [self])
+
+    def __repr__(self):
+        return f"<TagRule {self.name} {self.action.__name__}>"
+
+    def matches(self, tag):
+        if tag.name != self.name:
+            return False
+        for key, want in self.attrs.items():
+            value = tag.get(key)
+            if want is True:
+                if value is None:
+                    return False
+            elif callable(want):
+                if not want(value):
+                    return False
+            elif isinstance(value, list):
+                if want not in value:
+                    return False
+            elif value != want:
+                return False
+        return True
+
+
+def _attached(node, root):
+    """True while node is still inside root.
+
+    decompose() and extract() both cut the parent link, and a node inside a
+    removed subtree keeps its parent but never reaches root.
+    """
+    while node is not None:
+        if node is root:
+            return True
+        node = node.parent
+    return False
+
+
+def _match_into(buckets, rules, nodes):
+    """Append each tag in nodes, and under them, to the bucket of every rule named for it."""
+    names = list({rule.name for rule in rules})
+    for node in nodes:
+        if not isinstance(node, Tag):
+            continue
+        for tag in [node, *node.find_all(names)]:
+            for bucket, rule in zip(buckets, rules, strict=True):
+                if tag.name == rule.name:
+                    bucket.append(tag)
+
+
+def apply_rules(root, rules):
+    """Apply rules to root in order, matching every rule in one traversal."""
+    if not rules:
+        return
+    buckets = [[] for _ in rules]
+    _match_into(buckets, rules, [root])
+    for i, (bucket, rule) in enumerate(zip(buckets, rules, strict=True)):
+        for tag in bucket:
+            if not _attached(tag, root) or not rule.matches(tag):
+                continue
+            inserted = rule.action(tag)
+            if inserted:
+                _match_into(buckets[i + 1 :], rules[i + 1 :], inserted)
+
+
+def apply_pre_filters(soup, pre_filters):
+    """Run pre_filters in order: each run of TagRules as one traversal.
+
+    Anything that is not a TagRule is called with the soup, as every
+    pre-filter was before rules existed.
+    """
+    pending = []
+    for pre_filter in pre_filters:
+        if isinstance(pre_filter, TagRule):
+            pending.append(pre_filter)
+            continue
+        apply_rules(soup, pending)
+        pending = []
+        pre_filter(soup)
+    apply_rules(soup, pending)
@@ -1,10 +1,9 @@
-import json
 import os
 import re
 
 from bs4 import BeautifulSoup
 
-from universal.files import char_replace
+from universal.files import char_replace, write_json
 from universal.universal import (
     extract_modifiers,
     get_links,
@@ -25,9 +24,7 @@ from universal.utils import (
 def write_creature(jsondir, struct, source):
     print("{} ({}): {}".format(struct["game-obj"], source, struct["name"]))
     filename = create_creature_filename(jsondir, struct)
-    fp = open(filename, "w")
-    json.dump(struct, fp, indent=2, sort_keys=True)
-    fp.close()
+    write_json(filename, struct)
 
 
 def create_creature_filename(jsondir, struct):
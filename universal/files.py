@@ -2,7 +2,12 @@ import glob
 import json
 import os
 import re
+import tempfile
+import threading
 import unicodedata
+from json.encoder import c_make_encoder, encode_basestring_ascii
+
+from universal.bundle import Bundle, bundle_filename
 
 
 def char_replace(instr):
@@ -35,6 +40,272 @@ def char_replace(instr):
     return instr
 
 
+# --- Output JSON ---
+#
+# Every output file is json.dump(struct, fp, indent=2, sort_keys=True).
+# json.dump streams through the pure-Python encoder whatever the options, and
+# on older CPythons so does json.dumps once indent is passed. Where the C
+# encoder lays out indentation itself (3.13+), pretty_json is one call into a
+# cached C encoder. Elsewhere it still hands the C encoder every container
+# whose values are all scalars -- most stat block sections -- with ",\n" plus
+# that depth's indent as the item separator, and lays out only the containers
+# above them here. Either way the output is byte-identical to json.dump;
+# test_files checks that against every JSON file in the repository.
+
+_INDENT = "  "
+_leaf_encoders = {}
+
+
+def _not_serializable(o):
+    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+
+def _leaf_encoder(depth):
+    encoder = _leaf_encoders.get(depth)
+    if encoder is None:
+        encoder = c_make_encoder(
+            None,
+            _not_serializable,
+            encode_basestring_ascii,
+            None,
+            ": ",
+            ",\n" + _INDENT * depth,
+            True,
+            False,
+            True,
+        )
+        _leaf_encoders[depth] = encoder
+    return encoder
+
+
+def _json_key(key):
+    # json's own key coercion, so a non-string key prints the same.
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int | float):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _pretty(value, depth, parts):
+    if isinstance(value, dict):
+        items = value.values()
+    elif isinstance(value, list | tuple):
+        items = value
+    elif isinstance(value, str):
+        parts.append(encode_basestring_ascii(value))
+        return
+    else:
+        parts.extend(_leaf_encoder(depth)(value, depth))
+        return
+    if not items:
+        parts.append("{}" if isinstance(value, dict) else "[]")
+        return
+    for item in items:
+        if isinstance(item, dict | list | tuple):
+            break
+    else:
+        # No container inside: the C encoder lays out the whole thing.
+        encoded = "".join(_leaf_encoder(depth + 1)(value, depth + 1))
+        parts.append(encoded[0])
+        parts.append("\n" + _INDENT * (depth + 1))
+        parts.append(encoded[1:-1])
+        parts.append("\n" + _INDENT * depth + encoded[-1])
+        return
+    inner = "\n" + _INDENT * (depth + 1)
+    separator = inner
+    if isinstance(value, dict):
+        parts.append("{")
+        for key, item in sorted(value.items()):
+            parts.append(separator)
+            parts.append(encode_basestring_ascii(_json_key(key)))
+            parts.append(": ")
+            _pretty(item, depth + 1, parts)
+            separator = "," + inner
+        parts.append("\n" + _INDENT * depth + "}")
+    else:
+        parts.append("[")
+        for item in value:
+            parts.append(separator)
+            _pretty(item, depth + 1, parts)
+            separator = "," + inner
+        parts.append("\n" + _INDENT * depth + "]")
+
+
+def _indenting_encoder():
+    """The C encoder with indent=2, or None where it ignores indent."""
+    if c_make_encoder is None:
+        return None
+    encoder = c_make_encoder(
+        None, _not_serializable, encode_basestring_ascii, _INDENT, ": ", ",", True, False, True
+    )
+    if "".join(encoder([0], 0)) != "[\n  0\n]":
+        return None
+    return encoder
+
+
+_c_pretty = _indenting_encoder()
+
+
+def pretty_json(struct):
+    """json.dumps(struct, indent=2, sort_keys=True), mostly in the C encoder."""
+    if _c_pretty is not None:
+        return "".join(_c_pretty(struct, 0))
+    if c_make_encoder is None:
+        return json.dumps(struct, indent=2, sort_keys=True)
+    parts = []
+    _pretty(struct, 0, parts)
+    return "".join(parts)
+
+
+# A re-parse mostly reproduces the files already on disk, so write_json
+# compares the new bytes with the existing file and leaves it -- and its
+# mtime -- alone when they match. A size mismatch settles most real changes
+# without reading the file. Changes go to a temporary file in the same
+# directory that os.replace then moves over the old one, so a killed batch
+# leaves either the old document or the new one, never a truncated one.
+#
+# write_counts() tallies what happened to output files in this process:
+#     written    new or changed content was written
+#     unchanged  the file on disk already matched
+#     removed    an existing file left its path (disambiguated_filename
+#                moving a colliding entry aside under its aonid)
+
+_write_counts = {"written": 0, "unchanged": 0, "removed": 0}
+
+
+def _current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# open(filename, "w") created files 0666 less the umask; mkstemp uses 0600.
+_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def write_counts():
+    return dict(_write_counts)
+
+
+def reset_write_counts():
+    for key in _write_counts:
+        _write_counts[key] = 0
+
+
+def _same_content(filename, data):
+    try:
+        if os.stat(filename).st_size != len(data):
+            return False
+        with open(filename, "rb") as fp:
+            return fp.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def _replace_atomically(filename, data):
+    directory, base = os.path.split(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(prefix=f".{base}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.chmod(tmp, _FILE_MODE)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# With a bundle output set (--bundle), documents go to one NDJSON file per
+# content type under output instead of into the tree, and makedirs creates
+# nothing. See universal/bundle.py.
+
+_bundle_output = None
+_bundle_compress = False
+_bundles = {}
+
+
+def set_bundle_output(output, compress=False):
+    """Bundle everything written under output; None writes the tree again."""
+    global _bundle_output, _bundle_compress
+    _bundle_output = os.path.abspath(output) if output else None
+    _bundle_compress = compress
+    _bundles.clear()
+
+
+def _write_to_bundle(filename, struct):
+    path = os.path.relpath(os.path.abspath(filename), _bundle_output)
+    content_type = path.split(os.sep, 1)[0]
+    bundle = _bundles.get(content_type)
+    if bundle is None:
+        bundle = Bundle(
+            bundle_filename(_bundle_output, content_type, _bundle_compress), _bundle_compress
+        )
+        _bundles[content_type] = bundle
+    bundle.append(path, struct)
+
+
+# A last rewrite of every document on its way out, set by an output mode
+# that changes what is written but not what was validated (--license-refs).
+# It returns the document to write and must not modify the one it is given.
+_output_transform = None
+
+
+def set_output_transform(transform):
+    global _output_transform
+    _output_transform = transform
+
+
+# exec_main's pipeline (universal/pipeline.py) can take the file I/O off the
+# parsing thread. The document is still transformed and serialized here, by
+# the caller, so nothing the parser does afterwards can change what is
+# written; only the bytes are handed over.
+_write_behind = None
+
+
+def set_write_behind(writer):
+    """Send serialized documents to writer.put(filename, data); None writes inline."""
+    global _write_behind
+    _write_behind = writer
+
+
+def write_json(filename, struct):
+    """Write struct to filename as the parsers' pretty JSON.
+
+    Returns False, without touching the file, when it already holds exactly
+    this content, and None when the write was handed to the write-behind
+    thread.
+    """
+    if _output_transform is not None:
+        struct = _output_transform(struct)
+    if _bundle_output is not None:
+        _write_to_bundle(filename, struct)
+        _write_counts["written"] += 1
+        return True
+    # ensure_ascii output: the bytes are the same in any locale encoding.
+    data = pretty_json(struct).encode("ascii")
+    if _write_behind is not None:
+        _write_behind.put(filename, data)
+        return None
+    return write_bytes(filename, data)
+
+
+def write_bytes(filename, data):
+    """Store serialized output: skipped when unchanged, else replaced atomically."""
+    if _same_content(filename, data):
+        _write_counts["unchanged"] += 1
+        return False
+    _replace_atomically(filename, data)
+    _write_counts["written"] += 1
+    return True
+
+
 def makedirs(output, game_obj, source=None):
     if not source:
         game_obj_dir = os.path.abspath(output + "/" + char_replace(game_obj))
@@ -42,7 +313,7 @@ def makedirs(output, game_obj, source=None):
         game_obj_dir = os.path.abspath(
             output + "/" + char_replace(game_obj) + "/" + char_replace(source)
         )
-    if not os.path.exists(game_obj_dir):
+    if _bundle_output is None and not os.path.exists(game_obj_dir):
         os.makedirs(game_obj_dir)
     return game_obj_dir
 
@@ -67,9 +338,18 @@ def disambiguated_filename(jsondir, struct, label):
     would make any parser change fail the next run against its own stale
     output, and CLAUDE.md guarantees the data directory need not be cleared
     between runs.
+    With name allocation on (a multi-file batch), the directory's
+    NameAllocator answers instead; see below.
     """
+    allocator = _allocator_for(jsondir, label)
+    if allocator is not None:
+        return allocator.allocate(struct)
     stem = os.path.abspath(jsondir + "/" + char_replace(struct["name"]))
     base = stem + ".json"
+    if _bundle_output is not None:
+        # The tree is not being written, so there is nothing to collide with
+        # or move; the bundle index tells entries apart by game-id.
+        return base
     suffixed = f"{stem}_{struct['aonid']}.json"
     if not os.path.exists(base):
         # A sibling already claimed a suffix, so this name is known to collide.
@@ -92,4 +372,136 @@ def disambiguated_filename(jsondir, struct, label):
         return base
     # Move the squatter aside under its own aonid, then take a suffix too.
     os.rename(base, f"{stem}_{existing['aonid']}.json")
+    _write_counts["removed"] += 1
     return suffixed
+
+
+# --- Batch name allocation ---
+#
+# disambiguated_filename asks the disk on every call: a glob for suffixed
+# siblings, then a JSON read of the plain file. Across a batch that is a glob
+# and a read per write, and two writers in one directory can both see the
+# plain file free, or both move the same squatter. With name allocation on,
+# each output directory gets one NameAllocator, built from the directory the
+# first time the batch writes there. It answers from memory under a lock and
+# queues squatter moves until commit_names(), which exec_main calls when the
+# batch is done. The answers are the ones disambiguated_filename gives, so a
+# name that collides anywhere in the batch ends with every entry suffixed,
+# whatever order the entries arrived in.
+
+_name_allocation = False
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def set_name_allocation(enabled):
+    global _name_allocation
+    _name_allocation = enabled
+
+
+def _allocator_for(jsondir, label):
+    if not _name_allocation:
+        return None
+    key = os.path.abspath(jsondir)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = NameAllocator(key, label)
+            _allocators[key] = allocator
+        return allocator
+
+
+def commit_names():
+    """Apply every allocator's pending moves and forget the allocators."""
+    with _allocators_lock:
+        allocators = list(_allocators.values())
+        _allocators.clear()
+    for allocator in allocators:
+        allocator.commit()
+
+
+class NameAllocator:
+    """Output filenames for one directory, decided in memory.
+
+    The directory is read once: every file's aonid and game-id, keyed by the
+    stem it occupies. A file is a suffixed sibling when its name is its stem
+    plus "_<its own aonid>", so an unrelated longer name ("glyph_of_warding_
+    trap") is never mistaken for one. Files that cannot be read are recorded
+    and fail the first allocation that would have had to read them, as
+    disambiguated_filename fails.
+    """
+
+    def __init__(self, jsondir, label):
+        self.jsondir = jsondir
+        self.label = label
+        self._plain = {}
+        self._suffixed = {}
+        self._unreadable = {}
+        self._moves = []
+        self._allocated = set()
+        self._lock = threading.Lock()
+        for path in glob.glob(os.path.join(jsondir, "*.json")):
+            self._scan(path)
+
+    def _scan(self, path):
+        stem = path[: -len(".json")]
+        with open(path) as fp:
+            try:
+                existing = json.load(fp)
+            except json.JSONDecodeError:
+                self._unreadable[stem] = ValueError(
+                    f"Existing {self.label} file {path} is not readable JSON"
+                )
+                return
+        aonid = existing.get("aonid") if isinstance(existing, dict) else None
+        if aonid is None:
+            self._unreadable[stem] = AssertionError(
+                f"Existing {self.label} file {path} has no aonid"
+            )
+            return
+        suffix = f"_{aonid}"
+        if stem.endswith(suffix):
+            self._suffixed.setdefault(stem[: -len(suffix)], set()).add(aonid)
+        else:
+            self._plain[stem] = (aonid, existing.get("game-id"))
+
+    def allocate(self, struct):
+        stem = os.path.join(self.jsondir, char_replace(struct["name"]))
+        aonid = struct["aonid"]
+        with self._lock:
+            path = self._allocate(stem, aonid, struct.get("game-id"))
+            self._allocated.add(path)
+            return path
+
+    def _allocate(self, stem, aonid, game_id):
+        suffixed = f"{stem}_{aonid}.json"
+        if stem in self._unreadable:
+            raise self._unreadable[stem]
+        plain = self._plain.get(stem)
+        if plain is None:
+            if self._suffixed.get(stem):
+                self._suffixed[stem].add(aonid)
+                return suffixed
+            self._plain[stem] = (aonid, game_id)
+            return stem + ".json"
+        if plain[0] == aonid or (plain[1] and plain[1] == game_id):
+            self._plain[stem] = (aonid, game_id)
+            return stem + ".json"
+        # Move the squatter aside under its own aonid, then take a suffix too.
+        del self._plain[stem]
+        self._suffixed.setdefault(stem, set()).update((plain[0], aonid))
+        self._moves.append((stem + ".json", f"{stem}_{plain[0]}.json"))
+        return suffixed
+
+    def commit(self):
+        """Move squatters aside. A squatter re-written under its suffix in
+        this batch is already in place, so its stale plain file just goes."""
+        with self._lock:
+            moves, self._moves = self._moves, []
+            allocated, self._allocated = self._allocated, set()
+        for src, dst in moves:
+            if dst in allocated and os.path.exists(dst):
+                os.unlink(src)
+            else:
+                os.rename(src, dst)
+            _write_counts["removed"] += 1
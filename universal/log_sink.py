@@ -0,0 +1,89 @@
+"""Buffered, process-wide sink for the parsers' diagnostic log files.
+
+log_element used to open its file in append mode on every call and never
+close it, and markdown_pass calls it once per converted field, so one
+creature opened dozens of handles for one-line writes. Lines now go to a named
+channel held in memory and reach disk in one write per channel when the sink
+is flushed: exec_main flushes after every document, and the sink flushes
+itself at exit and whenever it holds more than max_buffered lines.
+
+A channel is written to "<channel>.log" in the working directory, the file
+log_element always wrote. The channels with fixed names are
+    markdown    every field markdown_pass converted (bin/pf2_cleanup_creatures.sh
+                summarizes it)
+    warnings    WarningReporting reports
+    enrichment  LLM results rejected by ability_enrichment's grounding check
+    timeouts    inputs that ran past the --timeout budget, and the pass they
+                were in (universal/watchdog.py)
+and log_element(fn) keeps working for ad-hoc files such as speed.log.
+
+Pool workers each have their own sink. A flush appends with a single write
+under an exclusive lock, so lines from different processes never interleave
+mid-line, and a forked worker starts with an empty buffer instead of writing
+its parent's pending lines a second time.
+"""
+
+import atexit
+import fcntl
+import os
+import threading
+
+MARKDOWN = "markdown"
+WARNINGS = "warnings"
+ENRICHMENT = "enrichment"
+TIMEOUTS = "timeouts"
+
+
+class LogSink:
+    def __init__(self, max_buffered=10000):
+        self.max_buffered = max_buffered
+        self._lines = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def write(self, channel, line):
+        with self._lock:
+            self._lines.setdefault(channel, []).append(line)
+            self._count += 1
+            full = self._count >= self.max_buffered
+        if full:
+            self.flush()
+
+    def pending(self, channel):
+        with self._lock:
+            return list(self._lines.get(channel, []))
+
+    def flush(self):
+        with self._lock:
+            lines, self._lines, self._count = self._lines, {}, 0
+        for channel, buffered in lines.items():
+            _append(f"{channel}.log", "".join(f"{line}\n" for line in buffered))
+
+    def discard(self):
+        with self._lock:
+            self._lines, self._count = {}, 0
+
+
+def _append(filename, text):
+    fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        data = text.encode("utf-8")
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+LogSink = LogSink()
+
+atexit.register(LogSink.flush)
+os.register_at_fork(after_in_child=LogSink.discard)
+
+
+def log(channel, line):
+    LogSink.write(channel, line)
+
+
+def flush_logs():
+    LogSink.flush()
@@ -1,7 +1,10 @@
+from functools import lru_cache
+
 from bs4 import BeautifulSoup
 from markdownify import MarkdownConverter
 
-from universal.utils import get_unique_tag_set, log_element
+from universal.log_sink import MARKDOWN, log
+from universal.utils import MARKUP_MEMO_SIZE, get_unique_tag_set
 
 
 class PFSRDConverter(MarkdownConverter):
@@ -30,9 +33,32 @@ class PFSRDConverter(MarkdownConverter):
         return result
 
 
+# The same strings come through over and over in a batch -- the OGL and ORC
+# license sections on every document, common ability texts, UMA descriptions --
+# so conversions are memoized process-wide, as get_unique_tag_set's validation
+# is. Bounded, because a full run sees tens of thousands of distinct strings
+# and only the repeats are worth keeping.
+_converter = None
+
+
+def _default_converter():
+    global _converter
+    if _converter is None:
+        _converter = PFSRDConverter()
+    return _converter
+
+
+@lru_cache(maxsize=MARKUP_MEMO_SIZE)
+def _memoized_md(html):
+    return _default_converter().convert(html)
+
+
 # Create shorthand method for conversion
 def md(html, **options):
-    return PFSRDConverter(**options).convert(html)
+    """Markdown for html. Without options, one shared converter and a memo."""
+    if options:
+        return PFSRDConverter(**options).convert(html)
+    return _memoized_md(html)
 
 
 def markdown_pass(struct, name, path, fxn_valid_tags=None):
@@ -91,4 +117,4 @@ def markdown_pass(struct, name, path, fxn_valid_tags=None):
                     struct[k] = v
             _validate_acceptable_tags(v, fxn_valid_tags)
             struct[k] = md(v).strip()
-            log_element("markdown.log")("{} : {}".format(f"{path}/{k}", name))
+            log(MARKDOWN, "{} : {}".format(f"{path}/{k}", name))
@@ -3,11 +3,24 @@ import os
 import sys
 
 from pfsrd2.ability_enrichment import set_inline_enrich
+from pfsrd2.license import set_license_refs
+from universal.files import (
+    commit_names,
+    set_bundle_output,
+    set_name_allocation,
+    write_counts,
+)
+from universal.log_sink import flush_logs
+from universal.pipeline import Pipeline
+from universal.universal import set_lxml_fast_path
+from universal.watchdog import FileTimeout, record_timeout, watchdog
 
 
 def exec_main(options, args, function, localdir):
     if getattr(options, "no_enrich", False):
         set_inline_enrich(False)
+    if getattr(options, "lxml_fast_path", False):
+        set_lxml_fast_path(True)
     if not options.output and not options.dryrun:
         sys.stderr.write("-o/--output required")
         sys.exit(1)
@@ -18,8 +31,46 @@ def exec_main(options, args, function, localdir):
         if not options.dryrun and not os.path.isdir(options.output):
             sys.stderr.write("-o/--output points to a file, it must point to a directory")
             sys.exit(1)
-        for arg in args:
-            function(arg, options)
+        if getattr(options, "license_refs", False) and not options.dryrun:
+            set_license_refs(options.output)
+        bundle = getattr(options, "bundle", False) or getattr(options, "bundle_gzip", False)
+        if bundle and not options.dryrun:
+            set_bundle_output(options.output, compress=options.bundle_gzip)
+        # One input file is the common case (the run scripts parse per file);
+        # scanning its output directory up front would cost more than it saves.
+        # A bundle has no tree to name files in.
+        set_name_allocation(len(args) > 1 and not bundle)
+        # Overlap reading the next inputs and writing finished documents with
+        # parsing; a single file has nothing to overlap with.
+        pipeline = Pipeline(args).start() if len(args) > 1 else None
+        budget = getattr(options, "timeout", 0)
+        timed_out = 0
+        try:
+            for arg in args:
+                try:
+                    with watchdog(budget):
+                        function(arg, options)
+                except FileTimeout as timeout:
+                    where = record_timeout(arg, timeout)
+                    sys.stderr.write(f"{arg}: timed out after {budget:g}s in {where}\n")
+                    timed_out += 1
+                flush_logs()
+        finally:
+            try:
+                if pipeline:
+                    pipeline.close()
+            finally:
+                commit_names()
+                set_name_allocation(False)
+        counts = write_counts()
+        if any(counts.values()):
+            sys.stderr.write(
+                "output files: {written} written, {unchanged} unchanged, "
+                "{removed} removed\n".format(**counts)
+            )
+        if timed_out:
+            # timeout(1)'s status, so the run scripts log the input as failed.
+            sys.exit(124)
 
 
 def option_parser(usage):
@@ -61,5 +112,42 @@ def option_parser(usage):
         action="store_true",
         help="Skip inline regex enrichment (use for from-scratch rebuilds)",
     )
+    parser.add_argument(
+        "--lxml-fast-path",
+        dest="lxml_fast_path",
+        default=False,
+        action="store_true",
+        help="Find the content element with lxml and skip building the rest of the page",
+    )
+    parser.add_argument(
+        "--timeout",
+        dest="timeout",
+        type=float,
+        default=os.environ.get("PF2_FILE_TIMEOUT", "0"),
+        help="Seconds each input file may take before it is abandoned and logged to "
+        "timeouts.log (default $PF2_FILE_TIMEOUT, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--license-refs",
+        dest="license_refs",
+        default=False,
+        action="store_true",
+        help="Write each distinct license once under licenses/ and point documents at it",
+    )
+    parser.add_argument(
+        "--bundle",
+        dest="bundle",
+        default=False,
+        action="store_true",
+        help="Append to one NDJSON file per content type in the output directory "
+        "instead of writing a file per entry",
+    )
+    parser.add_argument(
+        "--bundle-gzip",
+        dest="bundle_gzip",
+        default=False,
+        action="store_true",
+        help="Like --bundle, gzip-compressed",
+    )
     parser.add_argument("files", nargs="*", help="Input files to process")
     return parser
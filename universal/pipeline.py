@@ -0,0 +1,134 @@
+"""Overlapped reading, parsing and writing for a multi-file batch.
+
+exec_main used to read an input file, parse it and write its output strictly
+in turn, so every millisecond of disk or network latency was added to the
+batch. With a pipeline running, three stages overlap:
+
+    read-ahead   a thread reads the next input files into memory, in order;
+                 parse_universal takes the text from here via read_source
+    parse        the parser, on the main thread as before
+    write        a thread that stores serialized documents through
+                 write_bytes (skip-unchanged, atomic replace)
+
+Both queues are bounded, so at most read_ahead input files and write_behind
+serialized documents are held in memory; a stage that gets ahead blocks
+until the next one catches up. Serialization stays with the parser (see
+write_json), since the document must not change after it is handed over.
+
+The pipeline fails fast. An input that cannot be read is simply not
+prefetched, and parse_universal's own open() raises as it always did. An
+error in the writer is raised once, by whichever comes first: the next
+write_json, or close(), which drains the writer and must run before output
+files are renamed.
+"""
+
+import contextlib
+import queue
+import threading
+
+from universal.files import set_write_behind, write_bytes
+
+_DONE = object()
+
+_pipeline = None
+
+
+def read_source(filename):
+    """The text of an input file: prefetched when a pipeline read it ahead."""
+    if _pipeline is not None:
+        text = _pipeline.take(filename)
+        if text is not None:
+            return text
+    with open(filename) as fp:
+        return fp.read()
+
+
+class Pipeline:
+    def __init__(self, filenames, read_ahead=4, write_behind=32):
+        self._filenames = list(filenames)
+        self._reads = queue.Queue(read_ahead)
+        self._writes = queue.Queue(write_behind)
+        self._expected = set(self._filenames)
+        self._error = None
+        self._failed = False
+        self._stop = threading.Event()
+        self._reader = threading.Thread(target=self._read_ahead, name="read-ahead", daemon=True)
+        self._writer = threading.Thread(target=self._write, name="write-behind", daemon=True)
+
+    def start(self):
+        global _pipeline
+        self._reader.start()
+        self._writer.start()
+        set_write_behind(self)
+        _pipeline = self
+        return self
+
+    def close(self):
+        """Stop reading ahead, finish every queued write, raise a write error not yet raised."""
+        global _pipeline
+        _pipeline = None
+        set_write_behind(None)
+        self._stop.set()
+        # Unblock a reader waiting on a full queue so it sees the stop.
+        while self._reader.is_alive():
+            with contextlib.suppress(queue.Empty):
+                self._reads.get(timeout=0.05)
+        self._writes.put(_DONE)
+        self._writer.join()
+        self._raise_write_error()
+
+    # --- read-ahead ---
+
+    def _read_ahead(self):
+        for filename in self._filenames:
+            if self._stop.is_set():
+                return
+            try:
+                with open(filename) as fp:
+                    text = fp.read()
+            except OSError:
+                text = None
+            self._reads.put((filename, text))
+        self._reads.put((_DONE, None))
+
+    def take(self, filename):
+        """filename's prefetched text, or None when it was not read ahead.
+
+        The inputs arrive in batch order, so anything ahead of filename was
+        skipped by the caller and is dropped. A file outside the batch, or one
+        read a second time, is left to the caller to open.
+        """
+        if filename not in self._expected:
+            return None
+        while True:
+            name, text = self._reads.get()
+            if name is _DONE:
+                self._reads.put((_DONE, None))
+                return None
+            self._expected.discard(name)
+            if name == filename:
+                return text
+
+    # --- write-behind ---
+
+    def put(self, filename, data):
+        self._raise_write_error()
+        self._writes.put((filename, data))
+
+    def _write(self):
+        while True:
+            item = self._writes.get()
+            if item is _DONE:
+                return
+            if self._failed:
+                continue
+            try:
+                write_bytes(*item)
+            except BaseException as e:
+                self._error, self._failed = e, True
+
+    def _raise_write_error(self):
+        # Raised once; the writer stays stopped.
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
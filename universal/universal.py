@@ -5,12 +5,15 @@ from pprint import pprint
 from urllib.parse import parse_qs, urlparse
 
 from bs4 import BeautifulSoup, NavigableString, Tag
+from lxml import etree
 
 from pfsrd2.constants import (
     DEGREE_CONTINUES_PAST_A_PARAGRAPH_BREAK,
     DEGREE_EFFECT_NOT_THE_SUBJECTS,
 )
 from pfsrd2.enrichment.regex_extractor import extract_all
+from universal.cleanup import TagRule, apply_pre_filters
+from universal.pipeline import read_source
 from universal.utils import (
     clear_end_whitespace,
     clear_tags,
@@ -56,35 +59,41 @@ class Heading:
             return f"<Heading {self.level}:{self.name} {self.details}>"
 
 
-def href_filter(soup):
-    for href in soup.findAll("a"):
-        if not href.has_attr("href"):
-            href.decompose()
-            continue
-        if ".aspx?ID=" in href["href"]:
-            o = urlparse(href["href"])
-            for a in list(href.attrs):
-                del href[a]
-            href["game-obj"] = o.path.split(".")[0].lstrip("/")
-            q = parse_qs(o.query)
-            for k, vs in q.items():
-                for v in vs:
-                    href[k.lower() if k != "ID" else "aonid"] = v
-        elif href["href"] == "javascript:void(0);":
-            body = BeautifulSoup(href.renderContents(), "lxml")
-            if len(body.contents) == 1:
-                href.replaceWith(body.contents[0])
-            else:
-                href.replaceWith(body.renderContents())
+def _clean_href(href):
+    if not href.has_attr("href"):
+        href.decompose()
+        return None
+    if ".aspx?ID=" in href["href"]:
+        o = urlparse(href["href"])
+        for a in list(href.attrs):
+            del href[a]
+        href["game-obj"] = o.path.split(".")[0].lstrip("/")
+        q = parse_qs(o.query)
+        for k, vs in q.items():
+            for v in vs:
+                href[k.lower() if k != "ID" else "aonid"] = v
+    elif href["href"] == "javascript:void(0);":
+        body = BeautifulSoup(href.renderContents(), "lxml")
+        if len(body.contents) == 1:
+            replacement = body.contents[0]
+            href.replaceWith(replacement)
+            return [replacement]
+        else:
+            href.replaceWith(body.renderContents())
+    return None
+
 
+href_filter = TagRule("a", _clean_href)
 
-def span_formatting_filter(soup):
-    spans = soup.findAll("span")
-    for span in spans:
-        if span.has_attr("style") and len(list(span.children)) == 1:
-            text = get_text(span)
-            if len(text.strip()) == 0:
-                span.decompose()
+
+def _drop_empty_styled_span(span):
+    if len(list(span.children)) == 1:
+        text = get_text(span)
+        if len(text.strip()) == 0:
+            span.decompose()
+
+
+span_formatting_filter = TagRule("span", _drop_empty_styled_span, {"style": True})
 
 
 def noop_pass(details):
@@ -360,6 +369,41 @@ def parse_body(div, book=False, title=False, subtitle_text=False, max_title=5):
     return newlines
 
 
+# When set, parse_universal finds the content element with lxml and hands
+# only that subtree to BeautifulSoup. Off by default; see set_lxml_fast_path.
+_lxml_fast_path = False
+
+
+def set_lxml_fast_path(enabled):
+    """Enable/disable building the soup from the content element alone."""
+    global _lxml_fast_path
+    _lxml_fast_path = enabled
+
+
+def _content_only_soup(data, cssclass):
+    """A soup holding only the element with id=cssclass, or None without one.
+
+    The page is parsed by lxml into its C tree, where the nav, scripts and
+    footer cost no Python objects, and only the content element is serialized
+    back for BeautifulSoup. bs4's "lxml" builder drives the same libxml2 HTML
+    parser, so the subtree it rebuilds is the one the full soup would hold.
+
+    Every pre-filter looks inside the content element (#main) and nowhere
+    else, which is what makes dropping the rest of the page safe. A filter
+    that reads outside it would find nothing here.
+    """
+    parser = etree.HTMLParser()
+    parser.feed(data)
+    root = parser.close()
+    if root is None:
+        return None
+    found = root.xpath("//*[@id=$id]", id=cssclass)
+    if not found:
+        return None
+    html = etree.tostring(found[0], method="html", encoding="unicode", with_tail=False)
+    return BeautifulSoup(html, "lxml")
+
+
 def parse_universal(
     filename,
     title=False,
@@ -368,19 +412,19 @@ def parse_universal(
     cssclass="ctl00_MainContent_DetailedOutput",
     pre_filters=None,
 ):
-    with open(filename) as fp:
-        data = fp.read().replace("\n", "")
+    data = read_source(filename).replace("\n", "")
+    if _lxml_fast_path:
+        soup = _content_only_soup(data, cssclass)
+        if soup is None:
+            return None
+    else:
         soup = BeautifulSoup(data, "lxml")
-        if pre_filters:
-            for pre_filter in pre_filters:
-                pre_filter(soup)
-        href_filter(soup)
-        span_formatting_filter(soup)
-        content = soup.find(id=cssclass)
-        if content:
-            return parse_body(
-                content, title=title, subtitle_text=subtitle_text, max_title=max_title
-            )
+    # One traversal for every rule after the parser's last structural
+    # filter, href_filter and span_formatting_filter included.
+    apply_pre_filters(soup, [*(pre_filters or []), href_filter, span_formatting_filter])
+    content = soup.find(id=cssclass)
+    if content:
+        return parse_body(content, title=title, subtitle_text=subtitle_text, max_title=max_title)
 
 
 def print_struct(top, level=0):
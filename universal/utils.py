@@ -1,8 +1,12 @@
 import re
 import warnings
+from functools import lru_cache
 
 from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning, NavigableString, Tag
 
+from universal.cleanup import TagRule
+from universal.log_sink import log
+
 warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
 
 
@@ -102,11 +106,11 @@ def recursive_filter_entities(obj):
 
 
 def log_element(fn):
-    fp = open(fn, "a+")
+    """A writer for fn, buffered in universal.log_sink as the channel fn names."""
+    channel = fn.removesuffix(".log")
 
     def log_e(element):
-        fp.write(element)
-        fp.write("\n")
+        log(channel, element)
 
     return log_e
 
@@ -162,8 +166,25 @@ def bs_pop_spaces(children):
 
 
 def get_unique_tag_set(text):
+    """Names of every tag in text.
+
+    Memoized alongside universal.markdown's conversions: markdown validation
+    asks this about the same license and ability strings on every document.
+    Tag-free text never reaches the parser.
+    """
+    if "<" not in text:
+        return set()
+    return set(_unique_tags(text))
+
+
+# Shared with universal.markdown's conversion memo.
+MARKUP_MEMO_SIZE = 4096
+
+
+@lru_cache(maxsize=MARKUP_MEMO_SIZE)
+def _unique_tags(text):
     bs = BeautifulSoup(text, "html.parser")
-    return {tag.name for tag in bs.find_all()}
+    return frozenset(tag.name for tag in bs.find_all())
 
 
 def split_on_tag(text, tag):
@@ -604,10 +625,12 @@ def extract_pfs_note(bs, struct):
     }
 
 
-def sidebar_filter(soup):
+def _unwrap_sidebar(div):
     """Unwrap sidebar-nofloat divs. sidebarlook is handled by handle_alternate_link."""
-    for div in soup.find_all("div", {"class": "sidebar-nofloat"}):
-        div.unwrap()
+    div.unwrap()
+
+
+sidebar_filter = TagRule("div", _unwrap_sidebar, {"class": "sidebar-nofloat"})
 
 
 def plain_text(value):
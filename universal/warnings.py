@@ -1,5 +1,7 @@
 import sys
 
+from universal.log_sink import WARNINGS, log
+
 
 class WarningReporting:
     def __init__(self):
@@ -10,7 +12,9 @@ class WarningReporting:
         return self
 
     def report(self, string):
-        sys.stderr.write(f"{self.book} ({self.context}): {string}\n")
+        line = f"{self.book} ({self.context}): {string}"
+        sys.stderr.write(f"{line}\n")
+        log(WARNINGS, line)
 
 
 WarningReporting = WarningReporting()
@@ -0,0 +1,73 @@
+"""Per-file wall-clock budget for batch runs.
+
+One pathological page can send a regex in change_extractor, equipment or
+universal.creatures backtracking for minutes, and a batch used to wait it
+out. With --timeout (or PF2_FILE_TIMEOUT in the environment), exec_main
+parses each input under a watchdog: when the budget runs out, SIGALRM raises
+FileTimeout in the parser, the file is recorded in timeouts.log with the pass
+it was in, and the batch moves on to the next file.
+
+The regex engine checks for signals while it backtracks, so a runaway match
+is interrupted too. FileTimeout is a BaseException, like KeyboardInterrupt,
+so a parser's `except Exception` cannot swallow it. Only the main thread
+receives SIGALRM; exec_main always parses there.
+"""
+
+import contextlib
+import os
+import signal
+
+from universal.log_sink import TIMEOUTS, log
+
+
+class FileTimeout(BaseException):
+    def __init__(self, seconds):
+        super().__init__(f"exceeded {seconds:g}s")
+        self.seconds = seconds
+
+
+@contextlib.contextmanager
+def watchdog(seconds):
+    """Raise FileTimeout in the body once seconds of wall-clock time pass."""
+    if not seconds:
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise FileTimeout(seconds)
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pass_name(tb):
+    """The pass a traceback was interrupted in.
+
+    Parsers are a sequence of *_pass functions, so the innermost one on the
+    stack names the stage. Failing that, the innermost function in this
+    repository's code, so a helper called outside any pass is still named.
+    """
+    innermost_pass = innermost_repo = None
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        filename = os.path.abspath(code.co_filename)
+        if filename.startswith(_REPO + os.sep) and filename != os.path.abspath(__file__):
+            innermost_repo = code.co_name
+            if code.co_name.endswith("_pass"):
+                innermost_pass = code.co_name
+        tb = tb.tb_next
+    return innermost_pass or innermost_repo or "?"
+
+
+def record_timeout(filename, timeout):
+    where = pass_name(timeout.__traceback__)
+    log(TIMEOUTS, f"{filename}\t{timeout.seconds:g}s\t{where}")
+    return where